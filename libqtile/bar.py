@@ -20,6 +20,7 @@
 from . import command
 from . import confreader
 from . import drawer
+from . import latency
 from . import configurable
 from . import window
 
@@ -166,6 +167,12 @@ class Bar(Gap, configurable.Configurable):
     def _configure(self, qtile, screen):
         Gap._configure(self, qtile, screen)
 
+        for index, widget in enumerate(self.widgets):
+            if widget.configured and widget.bar is not self:
+                # the same widget is in the bar of another screen, show a
+                # copy of it instead of configuring it twice
+                self.widgets[index] = widget.create_mirror()
+
         stretches = 0
         for w in self.widgets:
             # Executing _test_orientation_compatibility later, for example in
@@ -232,6 +239,10 @@ class Bar(Gap, configurable.Configurable):
                 offset += i.length
 
     def handle_Expose(self, e):  # noqa: N802
+        # the window contents were lost, widgets which skip unchanged draws
+        # must draw again
+        for i in self.widgets:
+            i.invalidate()
         self.draw()
 
     def get_widget_in_position(self, e):
@@ -286,6 +297,10 @@ class Bar(Gap, configurable.Configurable):
         self.queued_draws += 1
 
     def _actual_draw(self):
+        with latency.tracer.trace(latency.BAR_DRAWS):
+            self._draw_widgets()
+
+    def _draw_widgets(self):
         self.queued_draws = 0
         self._resize(self.length, self.widgets)
         for i in self.widgets:
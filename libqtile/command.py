@@ -24,6 +24,7 @@ import traceback
 import os
 
 from . import ipc
+from . import latency
 from .utils import get_cache_dir
 from .log_utils import logger
 
@@ -92,7 +93,8 @@ class _Server(ipc.Server):
             return (ERROR, "No such command.")
         logger.debug("Command: %s(%s, %s)", name, args, kwargs)
         try:
-            return (SUCCESS, cmd(*args, **kwargs))
+            with latency.tracer.trace(latency.IPC):
+                return (SUCCESS, cmd(*args, **kwargs))
         except CommandError as v:
             return (ERROR, v.args[0])
         except Exception:
@@ -298,30 +298,31 @@ class Screen(command.CommandObject):
         if new_group is None:
             return
 
-        if new_group.screen:
-            # g1 <-> s1 (self)
-            # g2 (new_group) <-> s2 to
-            # g1 <-> s2
-            # g2 <-> s1
-            g1 = self.group
-            s1 = self
-            g2 = new_group
-            s2 = new_group.screen
-
-            s2.group = g1
-            g1._set_screen(s2)
-            s1.group = g2
-            g2._set_screen(s1)
-        else:
-            old_group = self.group
-            self.group = new_group
+        with self.qtile.group_switch():
+            if new_group.screen:
+                # g1 <-> s1 (self)
+                # g2 (new_group) <-> s2 to
+                # g1 <-> s2
+                # g2 <-> s1
+                g1 = self.group
+                s1 = self
+                g2 = new_group
+                s2 = new_group.screen
+
+                s2.group = g1
+                g1._set_screen(s2)
+                s1.group = g2
+                g2._set_screen(s1)
+            else:
+                old_group = self.group
+                self.group = new_group
 
-            # display clients of the new group and then hide from old group
-            # to remove the screen flickering
-            new_group._set_screen(self)
+                # display clients of the new group and then hide from old group
+                # to remove the screen flickering
+                new_group._set_screen(self)
 
-            if old_group is not None:
-                old_group._set_screen(None)
+                if old_group is not None:
+                    old_group._set_screen(None)
 
         hook.fire("setgroup")
         hook.fire("focus_change")
@@ -558,7 +559,14 @@ class Match:
         self._rules += [('wm_instance_class', w) for w in wm_instance_class]
         self._rules += [('net_wm_pid', w) for w in net_wm_pid]
 
-    def compare(self, client):
+    def compare(self, client, values=None):
+        """Whether the client matches
+
+        ``values`` is a ``MatchValues`` of the client, which keeps the window
+        properties fetched by one Match for the next ones.
+        """
+        if values is None:
+            values = MatchValues(client)
         for _type, rule in self._rules:
             if _type == "net_wm_pid":
                 def match_func(value):
@@ -567,28 +575,18 @@ class Match:
                 match_func = getattr(rule, 'match', None) or \
                     getattr(rule, 'count')
 
-            if _type == 'title':
-                value = client.name
-            elif _type == 'wm_class':
-                value = None
-                _value = client.window.get_wm_class()
-                if _value and len(_value) > 1:
-                    value = _value[1]
-            elif _type == 'wm_instance_class':
-                value = client.window.get_wm_class()
-                if value:
-                    value = value[0]
-            elif _type == 'wm_type':
-                value = client.window.get_wm_type()
-            elif _type == 'net_wm_pid':
-                value = client.window.get_net_wm_pid()
-            else:
-                value = client.window.get_wm_window_role()
-
+            value = values.get(_type)
             if value and match_func(value):
                 return True
         return False
 
+    def net_wm_pids(self):
+        """The pids this Match is limited to, or None if it matches other
+        properties too"""
+        if self._rules and all(_type == 'net_wm_pid' for _type, _ in self._rules):
+            return [pid for _, pid in self._rules]
+        return None
+
     def map(self, callback, clients):
         """Apply callback to each client that matches this Match"""
         for c in clients:
@@ -599,6 +597,40 @@ class Match:
         return '<Match %s>' % self._rules
 
 
+class MatchValues:
+    """The properties of a window which Matches compare against
+
+    Each property is only fetched from the X server the first time a Match
+    asks for it.
+    """
+    def __init__(self, client):
+        self.client = client
+        self._values = {}
+
+    def get(self, _type):
+        try:
+            return self._values[_type]
+        except KeyError:
+            pass
+        window = self.client.window
+        if _type == 'title':
+            value = self.client.name
+        elif _type in ('wm_class', 'wm_instance_class'):
+            wm_class = window.get_wm_class()
+            self._values['wm_instance_class'] = wm_class[0] if wm_class else None
+            self._values['wm_class'] = \
+                wm_class[1] if wm_class and len(wm_class) > 1 else None
+            return self._values[_type]
+        elif _type == 'wm_type':
+            value = window.get_wm_type()
+        elif _type == 'net_wm_pid':
+            value = window.get_net_wm_pid()
+        else:
+            value = window.get_wm_window_role()
+        self._values[_type] = value
+        return value
+
+
 class Rule:
     """How to act on a Match
 
@@ -624,8 +656,8 @@ class Rule:
         self.intrusive = intrusive
         self.break_on_match = break_on_match
 
-    def matches(self, w):
-        return self.match.compare(w)
+    def matches(self, w, values=None):
+        return self.match.compare(w, values)
 
     def __repr__(self):
         actions = utils.describe_attributes(self, ['group', 'float', 'intrusive', 'break_on_match'])
@@ -680,6 +712,21 @@ class DropDown(configurable.Configurable):
             'This has only effect if any of the on_focus_lost_xxx '
             'configurations is True'
         ),
+        (
+            'prespawn',
+            False,
+            'Start the command when qtile starts, and again when the window '
+            'is killed, and keep its window hidden, so that toggling the '
+            'DropDown only has to show or hide the window.'
+        ),
+        (
+            'match',
+            None,
+            'A Match for the window of the command. The window is otherwise '
+            'recognized by its pid or by the startup notification id the '
+            'command is started with, which fails for commands which start '
+            'their window from another process, e.g. through a launcher.'
+        ),
     )
 
     def __init__(self, name, cmd, **config):
@@ -709,4 +756,5 @@ class DropDown(configurable.Configurable):
                     height=self.height,
                     opacity=self.opacity,
                     on_focus_lost_hide=self.on_focus_lost_hide,
-                    warp_pointer=self.warp_pointer,)
+                    warp_pointer=self.warp_pointer,
+                    prespawn=self.prespawn,)
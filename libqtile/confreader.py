@@ -24,7 +24,7 @@
 # SOFTWARE.
 import os
 import sys
-from typing import List  # noqa: F401
+from typing import List, Optional  # noqa: F401
 
 from .core import base
 from . import config
@@ -63,6 +63,8 @@ class Config:
         """
         self.keys = []  # type: List[config.Key]
         self.mouse = []  # type: List[config.Mouse]
+        # the file the config was read from, see from_file()
+        self.file_path = None  # type: Optional[str]
 
         from .resources import default_config
         default = vars(default_config)
@@ -96,7 +98,11 @@ class Config:
         "Create a Config() object from the python file located at path."
         try:
             sys.path.insert(0, os.path.dirname(path))
-            config = __import__(os.path.basename(path)[:-3])  # noqa: F811
+            module_name = os.path.basename(path)[:-3]
+            # Drop any previously imported copy, so that reading the file
+            # again (e.g. on reload_config) picks up its current contents.
+            sys.modules.pop(module_name, None)
+            config = __import__(module_name)  # noqa: F811
         except Exception:
             import traceback
             from .log_utils import logger
@@ -105,6 +111,7 @@ class Config:
             raise ConfigError(tb)
         cnf = cls(**vars(config))
         cnf.validate(kore)
+        cnf.file_path = path
         return cnf
 
     def validate(self, kore: base.Core) -> None:
@@ -0,0 +1,139 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    The EWMH properties of the root window which describe clients and desktops
+"""
+
+import collections
+
+CLIENT_LIST = "_NET_CLIENT_LIST"
+CLIENT_LIST_STACKING = "_NET_CLIENT_LIST_STACKING"
+NUMBER_OF_DESKTOPS = "_NET_NUMBER_OF_DESKTOPS"
+DESKTOP_NAMES = "_NET_DESKTOP_NAMES"
+CURRENT_DESKTOP = "_NET_CURRENT_DESKTOP"
+ACTIVE_WINDOW = "_NET_ACTIVE_WINDOW"
+
+
+class EWMHState:
+    """Keeps the client lists and desktop properties of the root window
+
+    Changes are collected and written by flush(), which is scheduled with
+    ``schedule`` on the first change, so that all the changes made while
+    handling a batch of events result in a single write per property.
+    Clients which are added are appended to the lists, which are only
+    written in full when a client is removed or restacked; the other
+    properties are only written when their value changed.
+    """
+    def __init__(self, root, schedule):
+        self.root = root
+        self.schedule = schedule
+        # window ids, in the order they were managed and from bottom to top
+        self.clients = collections.OrderedDict()
+        self.stacking = collections.OrderedDict()
+        self._appended = {CLIENT_LIST: [], CLIENT_LIST_STACKING: []}
+        # the properties left by a previous instance are replaced
+        self._replace = {CLIENT_LIST, CLIENT_LIST_STACKING}
+        self._values = {}
+        self._written = {}
+        self._scheduled = False
+        # number of property writes, by property name
+        self.writes = collections.Counter()
+
+    def _changed(self):
+        if not self._scheduled:
+            self._scheduled = True
+            self.schedule(self.flush)
+
+    def add_client(self, wid):
+        if wid in self.clients:
+            return
+        self.clients[wid] = None
+        self.stacking[wid] = None
+        for name in self._appended:
+            self._appended[name].append(wid)
+        self._changed()
+
+    def remove_client(self, wid):
+        if wid not in self.clients:
+            return
+        del self.clients[wid]
+        del self.stacking[wid]
+        self._replace.update((CLIENT_LIST, CLIENT_LIST_STACKING))
+        self._changed()
+
+    def raise_client(self, wid):
+        """The client was put above all the other ones"""
+        if wid not in self.stacking or next(reversed(self.stacking)) == wid:
+            return
+        self.stacking.move_to_end(wid)
+        self._replace.add(CLIENT_LIST_STACKING)
+        self._changed()
+
+    def set_clients(self, wids):
+        """Replace the managed clients, keeping the stacking order of the
+        ones which were already known"""
+        wids = list(wids)
+        wanted = set(wids)
+        for wid in list(self.clients):
+            if wid not in wanted:
+                self.remove_client(wid)
+        for wid in wids:
+            self.add_client(wid)
+
+    def set_desktops(self, names, current):
+        self._set(NUMBER_OF_DESKTOPS, len(names))
+        self._set(DESKTOP_NAMES, "\0".join(names))
+        self._set(CURRENT_DESKTOP, current)
+
+    def set_active_window(self, wid):
+        self._set(ACTIVE_WINDOW, wid)
+
+    def _set(self, name, value):
+        self._values[name] = value
+        if self._written.get(name) != value:
+            self._changed()
+
+    def flush(self):
+        """Write the properties which changed since the last flush"""
+        self._scheduled = False
+        for name, wids in ((CLIENT_LIST, self.clients),
+                           (CLIENT_LIST_STACKING, self.stacking)):
+            if name in self._replace:
+                self._write(name, list(wids))
+            elif self._appended[name]:
+                self._write(name, self._appended[name], append=True)
+            self._appended[name] = []
+        self._replace.clear()
+        for name, value in self._values.items():
+            if self._written.get(name) != value:
+                self._write(name, value)
+                self._written[name] = value
+
+    def _write(self, name, value, append=False):
+        self.root.set_property(name, value, append=append)
+        self.writes[name] += 1
+
+    def info(self):
+        return dict(
+            clients=list(self.clients),
+            stacking=list(self.stacking),
+            writes=dict(self.writes),
+        )
@@ -0,0 +1,173 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Window icons from _NET_WM_ICON, decoded on demand into a shared cache
+"""
+
+import array
+import collections
+import collections.abc
+
+NET_WM_ICON = "_NET_WM_ICON"
+
+
+def premultiply(data):
+    """Convert ARGB32 pixels to the premultiplied alpha cairo expects"""
+    arr = array.array("B", data)
+    for i in range(0, len(arr), 4):
+        mult = arr[i + 3] / 255.
+        arr[i + 0] = int(arr[i + 0] * mult)
+        arr[i + 1] = int(arr[i + 1] * mult)
+        arr[i + 2] = int(arr[i + 2] * mult)
+    return arr
+
+
+class IconCache:
+    """The most recently used decoded icons, within a budget of bytes
+
+    Icons larger than the whole budget are not kept. Users keeping an icon,
+    e.g. in a cairo surface, must let go of it when the cache drops it, or
+    it is not counted anymore: the functions in ``callbacks`` are called
+    with the key of each icon which is evicted or discarded.
+    """
+    def __init__(self, budget=4 * 1024 * 1024):
+        self.budget = budget
+        self.size = 0
+        self._entries = collections.OrderedDict()
+        self.callbacks = []
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        icon = self._entries.get(key)
+        if icon is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return icon
+
+    def put(self, key, icon):
+        self.discard(key)
+        if len(icon) > self.budget:
+            return
+        self._entries[key] = icon
+        self.size += len(icon)
+        while self.size > self.budget:
+            old_key, old = self._entries.popitem(last=False)
+            self.size -= len(old)
+            self.evictions += 1
+            self._dropped(old_key)
+
+    def discard(self, key):
+        icon = self._entries.pop(key, None)
+        if icon is not None:
+            self.size -= len(icon)
+            self._dropped(key)
+
+    def _dropped(self, key):
+        for callback in list(self.callbacks):
+            callback(key)
+
+    def stats(self):
+        return dict(
+            entries=len(self._entries),
+            bytes=self.size,
+            budget=self.budget,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+
+# shared by all windows, set cache.budget to change its size
+cache = IconCache()
+
+
+class WindowIcons(collections.abc.Mapping):
+    """The icons of a window, by "WIDTHxHEIGHT"
+
+    Each icon is an array of premultiplied ARGB32 pixels. Nothing is read
+    from the window until the icons are used: the sizes are read once, and an
+    icon is only fetched and decoded when its size is asked for, then kept in
+    the shared cache, from which it may be evicted and decoded again later.
+    """
+    def __init__(self, window, cache=cache):
+        self.window = window
+        self.cache = cache
+        # offset of the pixels of each size, in 32 bit values
+        self._offsets = None
+
+    def _sizes(self):
+        if self._offsets is None:
+            self._offsets = {}
+            reply = self.window.get_property(NET_WM_ICON, "CARDINAL")
+            if reply:
+                self._offsets = self._parse(reply.value.to_atoms())
+        return self._offsets
+
+    @staticmethod
+    def _parse(values):
+        offsets = {}
+        offset = 0
+        while offset + 2 <= len(values):
+            width, height = values[offset], values[offset + 1]
+            offset += 2
+            if not width or not height or \
+                    offset + width * height > len(values):
+                break
+            offsets["%sx%s" % (width, height)] = offset
+            offset += width * height
+        return offsets
+
+    def __getitem__(self, size):
+        offset = self._sizes()[size]
+        key = (self.window.wid, size)
+        icon = self.cache.get(key)
+        if icon is None:
+            width, height = map(int, size.split("x"))
+            reply = self.window.get_property(
+                NET_WM_ICON, "CARDINAL",
+                offset=offset, length=width * height
+            )
+            if not reply or reply.value_len < width * height:
+                # the property changed or the window is gone
+                raise KeyError(size)
+            icon = premultiply(reply.value.buf())
+            self.cache.put(key, icon)
+        return icon
+
+    def __iter__(self):
+        return iter(self._sizes())
+
+    def __len__(self):
+        return len(self._sizes())
+
+    def invalidate(self):
+        """Forget the icons, which are read again when next used"""
+        if self._offsets:
+            for size in self._offsets:
+                self.cache.discard((self.window.wid, size))
+        self._offsets = None
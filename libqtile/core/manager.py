@@ -21,7 +21,7 @@
 from libqtile.dgroups import DGroups
 from xcffib.xproto import EventMask, WindowError, AccessError, DrawableError
 import asyncio
-import functools
+import contextlib
 import io
 import logging
 import os
@@ -30,6 +30,7 @@ import shlex
 import signal
 import sys
 import traceback
+import types
 import xcffib
 import xcffib.xinerama
 import xcffib.xproto
@@ -41,15 +42,20 @@ from ..config import ScratchPad as ScratchPadConfig
 from ..group import _Group
 from ..scratchpad import ScratchPad
 from ..log_utils import logger
+from ..process import ProcessManager
 from ..state import QtileState
 from ..utils import QtileError, get_cache_dir
 from ..widget.base import _Widget
 from ..extension.base import _Extension
 from .. import command
+from .. import confreader
 from .. import hook
+from .. import latency
 from .. import utils
 from .. import window
+from . import icons
 from . import xcbq
+from .ewmh import EWMHState
 
 
 def _import_module(module_name, dir_path):
@@ -64,6 +70,74 @@ def _import_module(module_name, dir_path):
     return module
 
 
+GAP_POSITIONS = ("top", "bottom", "left", "right")
+
+
+def _describe(value):
+    """Return a comparable description of a config value
+
+    Unlike repr(), it is the same for equal values read from two imports of
+    the config file, such as lazy calls and functions, whose repr contains
+    their address.
+    """
+    if isinstance(value, command._Call):
+        return (
+            "call", _describe(value.selectors), value.name,
+            _describe(value.args), _describe(value.kwargs),
+            value.layout, getattr(value, "when_floating", True),
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_describe(i) for i in value)
+    if isinstance(value, dict):
+        return tuple(sorted((repr(k), _describe(v)) for k, v in value.items()))
+    if hasattr(value, "_variable_defaults"):
+        return _signature(value)
+    if isinstance(value, types.CodeType):
+        return ("code", value.co_code, _describe(value.co_consts))
+    if hasattr(value, "__code__"):
+        # functions and methods defined in the config
+        return ("function", value.__module__, value.__qualname__,
+                _describe(value.__code__))
+    if type(value).__repr__ is object.__repr__ and hasattr(value, "__dict__"):
+        return (type(value).__module__, type(value).__qualname__,
+                _describe(vars(value)))
+    return repr(value)
+
+
+def _signature(obj):
+    """Return a comparable description of a not yet configured config object
+
+    Used by ``reload_config`` to find out which parts of the configuration
+    changed between two reads of the config file.
+    """
+    if obj is None:
+        return None
+    defaults = getattr(obj, "_variable_defaults", {})
+    attrs = []
+    for name, value in sorted(vars(obj).items()):
+        if name == "_variable_defaults" or name in defaults:
+            continue
+        attrs.append((name, _describe(value)))
+    cls = obj.__class__
+    return (cls.__module__, cls.__qualname__, tuple(attrs))
+
+
+def _snapshot_config(config):
+    """Signatures of the parts of a config which can be reloaded in place"""
+    screens = getattr(config, "fake_screens", None) or config.screens
+    widget_defaults = getattr(config, "widget_defaults", None) or {}
+    return dict(
+        layouts=[_signature(i) for i in config.layouts],
+        floating_layout=_signature(config.floating_layout),
+        mouse=[_signature(i) for i in config.mouse],
+        widget_defaults=_describe(widget_defaults),
+        screens=[
+            tuple(_signature(getattr(s, pos)) for pos in GAP_POSITIONS)
+            for s in screens
+        ],
+    )
+
+
 class Qtile(command.CommandObject):
     """This object is the `root` of the command graph"""
     def __init__(
@@ -77,9 +151,13 @@ class Qtile(command.CommandObject):
     ):
         self._restart = False
         self.no_spawn = no_spawn
+        self.kore = kore
+        # seconds spent in the phases of startup, see qtile --profile-startup
+        self.startup_timings = {}
 
         self._eventloop = None
         self._finalize = False
+        self._profile = None
 
         if not display_name:
             display_name = os.environ.get("DISPLAY")
@@ -96,6 +174,7 @@ class Qtile(command.CommandObject):
 
         self.conn = xcbq.Connection(display_name)
         self.config = config
+        self._config_snapshot = _snapshot_config(config)
         self.fname = fname
         hook.init(self)
 
@@ -104,6 +183,8 @@ class Qtile(command.CommandObject):
         self.groups_map = {}
         self.groups = []
         self.keys_map = {}
+        # requests and time taken by the last group switch, see switch_stats
+        self.last_switch = None
 
         # Find the modifier mask for the numlock key, if there is one:
         nc = self.conn.keysym_to_keycode(xcbq.keysyms["Num_Lock"])
@@ -114,6 +195,7 @@ class Qtile(command.CommandObject):
         # we can assume that the first
         # screen's root is _the_ root.
         self.root = self.conn.default_screen.root
+        self.ewmh = EWMHState(self.root, self._schedule_ewmh)
         self.root.set_attribute(
             eventmask=(
                 EventMask.StructureNotify |
@@ -124,6 +206,7 @@ class Qtile(command.CommandObject):
             )
         )
 
+        self.conn.atoms.preload(window.ATOMS)
         self.root.set_property(
             '_NET_SUPPORTED',
             [self.conn.atoms[x] for x in xcbq.SUPPORTED_ATOMS]
@@ -155,15 +238,8 @@ class Qtile(command.CommandObject):
                 key_binder = self.config.dgroups_key_binder
             self.dgroups = DGroups(self, self.config.groups, key_binder)
 
-        if hasattr(config, "widget_defaults") and config.widget_defaults:
-            _Widget.global_defaults = config.widget_defaults
-        else:
-            _Widget.global_defaults = {}
-
-        if hasattr(config, "extension_defaults") and config.extension_defaults:
-            _Extension.global_defaults = config.extension_defaults
-        else:
-            _Extension.global_defaults = {}
+        self._set_global_defaults()
+        self._resolve_colors()
 
         for installed_extension in _Extension.installed_extensions:
             installed_extension._configure(self)
@@ -184,7 +260,8 @@ class Qtile(command.CommandObject):
 
         self.current_screen = None
         self.screens = []
-        self._process_screens()
+        with utils.timed(self.startup_timings, "screens and bars"):
+            self._process_screens()
         self.current_screen = self.screens[0]
         self._drag = None
 
@@ -208,17 +285,7 @@ class Qtile(command.CommandObject):
         for key in self.config.keys:
             self.map_key(key)
 
-        # It fixes problems with focus when clicking windows of some specific clients like xterm
-        def noop(qtile):
-            pass
-        self.config.mouse += (Click([], "Button1", command.lazy.function(noop), focus="after"),)
-
-        self.mouse_map = {}
-        for i in self.config.mouse:
-            if self.mouse_map.get(i.button_code) is None:
-                self.mouse_map[i.button_code] = []
-            self.mouse_map[i.button_code].append(i)
-
+        self._setup_mouse()
         self.grab_mouse()
 
         # no_spawn is set when we are restarting; we only want to run the
@@ -234,9 +301,14 @@ class Qtile(command.CommandObject):
             except:  # noqa: E722
                 logger.exception("failed restoring state")
 
-        self.scan()
+        with utils.timed(self.startup_timings, "scan"):
+            self.scan()
+        for group in self.groups:
+            if isinstance(group, ScratchPad):
+                group.prespawn()
         self.update_net_desktops()
         hook.subscribe.setgroup(self.update_net_desktops)
+        self.ewmh.flush()
 
         self.selection = {
             "PRIMARY": {"owner": None, "selection": ""},
@@ -245,6 +317,33 @@ class Qtile(command.CommandObject):
         self.setup_selection()
         hook.fire("startup_complete")
 
+    def _set_global_defaults(self):
+        if getattr(self.config, "widget_defaults", None):
+            _Widget.global_defaults = self.config.widget_defaults
+        else:
+            _Widget.global_defaults = {}
+
+        if getattr(self.config, "extension_defaults", None):
+            _Extension.global_defaults = self.config.extension_defaults
+        else:
+            _Extension.global_defaults = {}
+
+    def _setup_mouse(self):
+        # It fixes problems with focus when clicking windows of some specific clients like xterm
+        def noop(qtile):
+            pass
+        # a new list, so that reloading a config using the default mouse
+        # bindings doesn't add the click to them again
+        self.config.mouse = list(self.config.mouse) + [
+            Click([], "Button1", command.lazy.function(noop), focus="after")
+        ]
+
+        self.mouse_map = {}
+        for i in self.config.mouse:
+            if self.mouse_map.get(i.button_code) is None:
+                self.mouse_map[i.button_code] = []
+            self.mouse_map[i.button_code].append(i)
+
     def setup_selection(self):
         primary = self.conn.atoms["PRIMARY"]
         clipboard = self.conn.atoms["CLIPBOARD"]
@@ -267,6 +366,7 @@ class Qtile(command.CommandObject):
 
     def setup_eventloop(self):
         self._eventloop = asyncio.new_event_loop()
+        self.process = ProcessManager(self._eventloop)
         self._eventloop.add_signal_handler(signal.SIGINT, self.stop)
         self._eventloop.add_signal_handler(signal.SIGTERM, self.stop)
         self._eventloop.set_exception_handler(
@@ -337,6 +437,7 @@ class Qtile(command.CommandObject):
             self._eventloop.remove_reader(fd)
             self.conn.finalize()
             self.server.close()
+            self.process.finalize()
         except:  # noqa: E722
             logger.exception('exception during finalize')
         finally:
@@ -421,12 +522,16 @@ class Qtile(command.CommandObject):
             yield self.numlock_mask
             yield self.numlock_mask | xcbq.ModMasks["lock"]
 
-    def map_key(self, key):
+    def _key_index(self, key):
         try:
             keysym = xcbq.get_keysym(key.key)
             modmask = xcbq.translate_masks(key.modifiers)
         except xcbq.XCBQError as e:
             raise utils.QtileError(e)
+        return keysym, modmask
+
+    def map_key(self, key):
+        keysym, modmask = self._key_index(key)
         self.keys_map[(keysym, modmask & self.valid_mask)] = key
         code = self.conn.keysym_to_keycode(keysym)
         for amask in self._auto_modmasks():
@@ -439,11 +544,7 @@ class Qtile(command.CommandObject):
             )
 
     def unmap_key(self, key):
-        try:
-            keysym = xcbq.get_keysym(key.key)
-            modmask = xcbq.translate_masks(key.modifiers)
-        except xcbq.XCBQError as e:
-            raise utils.QtileError(e)
+        keysym, modmask = self._key_index(key)
         key_index = (keysym, modmask & self.valid_mask)
         if key_index not in self.keys_map:
             return
@@ -463,11 +564,14 @@ class Qtile(command.CommandObject):
         except (ValueError, AttributeError):
             index = 0
 
-        self.root.set_property("_NET_NUMBER_OF_DESKTOPS", len(self.groups))
-        self.root.set_property(
-            "_NET_DESKTOP_NAMES", "\0".join([i.name for i in self.groups])
-        )
-        self.root.set_property("_NET_CURRENT_DESKTOP", index)
+        self.ewmh.set_desktops([i.name for i in self.groups], index)
+
+    def _schedule_ewmh(self, flush):
+        """Write the EWMH properties once the current events are handled"""
+        if self._eventloop is None:
+            flush()
+        else:
+            self.call_soon(flush)
 
     def add_group(self, name, layout=None, layouts=None, label=None):
         if name not in self.groups_map.keys():
@@ -525,9 +629,30 @@ class Qtile(command.CommandObject):
                 return
             self.widgets_map[w.name] = w
 
-    @functools.lru_cache()
     def color_pixel(self, name):
-        return self.conn.screens[0].default_colormap.alloc_color(name).pixel
+        return self.conn.screens[0].default_colormap.pixel(name)
+
+    def _resolve_colors(self):
+        """Resolve the border colours of all the configured layouts
+
+        Done when the config is loaded, so that laying out windows doesn't
+        wait on the X server for a colour.
+        """
+        layouts = list(self.config.layouts) + [self.config.floating_layout]
+        for group in self.config.groups:
+            layouts.extend(getattr(group, "layouts", None) or [])
+        for layout in layouts:
+            names = set(layout._variable_defaults) | set(layout._user_config)
+            for name in names:
+                if not name.startswith("border_"):
+                    continue
+                value = getattr(layout, name)
+                if isinstance(value, str):
+                    try:
+                        self.color_pixel(value)
+                    except (IndexError, ValueError):
+                        logger.warning("Invalid colour %s=%r of layout %s",
+                                       name, value, layout.name)
 
     @property
     def current_layout(self):
@@ -564,7 +689,8 @@ class Qtile(command.CommandObject):
             if getattr(c, "group", None):
                 c.group.remove(c)
             del self.windows_map[win]
-            self.update_client_list()
+            self.ewmh.remove_client(win)
+            c.icons.invalidate()
 
     def reset_gaps(self, c):
         if c.strut:
@@ -630,7 +756,7 @@ class Qtile(command.CommandObject):
                 # Window may have been bound to a group in the hook.
                 if not c.group:
                     self.current_screen.group.add(c, focus=c.can_steal_focus())
-                self.update_client_list()
+                self.ewmh.add_client(w.wid)
                 hook.fire("client_managed", c)
             return c
         else:
@@ -643,9 +769,7 @@ class Qtile(command.CommandObject):
         chrome
         """
         windows = [wid for wid, c in self.windows_map.items() if c.group]
-        self.root.set_property("_NET_CLIENT_LIST", windows)
-        # TODO: check stack order
-        self.root.set_property("_NET_CLIENT_LIST_STACKING", windows)
+        self.ewmh.set_clients(windows)
 
     def grab_mouse(self):
         self.root.ungrab_button(None, None)
@@ -728,13 +852,15 @@ class Qtile(command.CommandObject):
 
                 if ename.endswith("Event"):
                     ename = ename[:-5]
-                if e.__class__ not in self.ignored_events:
+                if e.__class__ not in self.ignored_events and \
+                        not self.conn.ignored.match(e):
                     logger.debug(ename)
-                    for h in self.get_target_chain(ename, e):
-                        logger.debug("Handling: %s" % ename)
-                        r = h(e)
-                        if not r:
-                            break
+                    with latency.tracer.trace(latency.X_EVENTS):
+                        for h in self.get_target_chain(ename, e):
+                            logger.debug("Handling: %s" % ename)
+                            r = h(e)
+                            if not r:
+                                break
             # Catch some bad X exceptions. Since X is event based, race
             # conditions can occur almost anywhere in the code. For
             # example, if a window is created and then immediately
@@ -973,6 +1099,7 @@ class Qtile(command.CommandObject):
                 xcffib.xproto.ConfigWindow.StackMode,
                 [xcffib.xproto.StackMode.Above]
             )
+            self.ewmh.raise_client(wnd)
 
         window = self.windows_map.get(wnd)
         if window and not window.window.get_property('QTILE_INTERNAL'):
@@ -1438,11 +1565,190 @@ class Qtile(command.CommandObject):
         self._restart = (sys.executable, argv)
         self.stop()
 
+    def cmd_reload_config(self, path=None):
+        """Reload the configuration file without restarting qtile
+
+        Key bindings, mouse bindings, groups, layouts and bars are updated in
+        place; windows, their groups and their positions are kept. Only the
+        parts of the config which changed are rebuilt. Groups which are not in
+        the new config are not deleted and ``main()`` is not run again. If the
+        new config fails to load, the running config is kept.
+
+        Returns the list of reloaded config sections.
+
+        Parameters
+        ==========
+        path :
+            Config file to read instead of the currently loaded one.
+        """
+        if path is None:
+            path = getattr(self.config, "file_path", None)
+        if path is None:
+            raise command.CommandError("Config was not loaded from a file")
+        path = os.path.expanduser(path)
+
+        # hooks subscribed by the old config module, which will be replaced by
+        # the ones of the new module
+        module_name = os.path.basename(path)[:-3]
+        stale = [
+            func
+            for subscribers in hook.subscriptions.values()
+            for func in subscribers
+            if getattr(func, "__module__", None) == module_name
+        ]
+
+        try:
+            config = confreader.Config.from_file(self.kore, path)
+        except confreader.ConfigError as e:
+            logger.exception("Error reloading config")
+            raise command.CommandError("Error reloading config: %s" % e)
+
+        hook.remove_subscribers(lambda func: any(func is i for i in stale))
+
+        old_config = self.config
+        old_snapshot = self._config_snapshot
+        snapshot = _snapshot_config(config)
+        self.config = config
+        self._config_snapshot = snapshot
+        self._set_global_defaults()
+        # release the colours of the old config
+        self.conn.screens[0].default_colormap.free()
+        self._resolve_colors()
+
+        updated = []
+        if self._reload_keys(old_config.keys, config.keys):
+            updated.append("keys")
+
+        if snapshot["mouse"] != old_snapshot["mouse"]:
+            self._setup_mouse()
+            self.grab_mouse()
+            updated.append("mouse")
+        else:
+            config.mouse = old_config.mouse
+
+        if snapshot["floating_layout"] != old_snapshot["floating_layout"]:
+            self._reload_floating_layout(old_config.floating_layout,
+                                         config.floating_layout)
+            updated.append("floating_layout")
+        else:
+            config.floating_layout = old_config.floating_layout
+
+        if self._reload_groups(config.groups):
+            updated.append("groups")
+
+        if snapshot["layouts"] != old_snapshot["layouts"]:
+            group_configs = {g.name: g for g in config.groups}
+            for group in self.groups:
+                group_config = group_configs.get(group.name)
+                if isinstance(group, ScratchPad) or \
+                        (group_config is not None and group_config.layouts):
+                    continue
+                group.set_layouts(config.layouts)
+            updated.append("layouts")
+
+        if self._reload_screens(config, old_snapshot, snapshot):
+            updated.append("screens")
+
+        self.update_net_desktops()
+        self.conn.flush()
+        logger.info("Reloaded config %s, updated: %s", path, updated)
+        return updated
+
+    def _reload_keys(self, old_keys, new_keys):
+        def index(key):
+            keysym, modmask = self._key_index(key)
+            return keysym, modmask & self.valid_mask
+
+        old = {index(k): k for k in old_keys}
+        new = {index(k): k for k in new_keys}
+        changed = False
+        for idx, key in old.items():
+            if idx not in new:
+                self.unmap_key(key)
+                changed = True
+        for idx, key in new.items():
+            if idx in old:
+                # same binding, only swap the commands it runs
+                self.keys_map[idx] = key
+                if _describe(key.commands) != _describe(old[idx].commands):
+                    changed = True
+            else:
+                self.map_key(key)
+                changed = True
+        return changed
+
+    def _reload_groups(self, groups):
+        changed = False
+        for grp in groups:
+            if grp.name in self.groups_map:
+                group = self.groups_map[grp.name]
+                if grp.label is not None and group.label != grp.label:
+                    group.label = grp.label
+                    changed = True
+                continue
+            if isinstance(grp, ScratchPadConfig):
+                sp = ScratchPad(grp.name, grp.dropdowns, grp.label)
+                sp._configure([self.config.floating_layout],
+                              self.config.floating_layout, self)
+                self.groups.append(sp)
+                self.groups_map[sp.name] = sp
+                sp.prespawn()
+            elif self.dgroups is not None:
+                self.dgroups.groups.append(grp)
+                self.dgroups.add_dgroup(grp, grp.init)
+            else:
+                self.add_group(grp.name, grp.layout, grp.layouts, grp.label)
+            changed = True
+        if changed:
+            hook.fire("changegroup")
+        return changed
+
+    def _reload_floating_layout(self, old, new):
+        # the floating layout is shared by all groups
+        new.clients = old.clients
+        new.focused = old.focused
+        for group in self.groups:
+            group.floating_layout = new
+        hook.remove_subscribers(hook.owned_by(old))
+        old.finalize()
+
+    def _reload_screens(self, config, old_snapshot, snapshot):
+        screens = getattr(config, "fake_screens", None) or config.screens
+        rebuild_all = snapshot["widget_defaults"] != old_snapshot["widget_defaults"]
+        changed = False
+        for i, screen in enumerate(self.screens):
+            if i >= len(screens):
+                break
+            old_gaps = old_snapshot["screens"][i] if i < len(old_snapshot["screens"]) else None
+            if not rebuild_all and snapshot["screens"][i] == old_gaps:
+                continue
+            for gap in screen.gaps:
+                self._remove_gap(gap)
+            for pos in GAP_POSITIONS:
+                setattr(screen, pos, getattr(screens[i], pos))
+            for gap in screen.gaps:
+                gap._configure(self, screen)
+            screen.group.layout_all()
+            changed = True
+        return changed
+
+    def _remove_gap(self, gap):
+        for widget in getattr(gap, "widgets", []):
+            hook.remove_subscribers(hook.owned_by(widget))
+            if self.widgets_map.get(widget.name) is widget:
+                del self.widgets_map[widget.name]
+            widget.finalize()
+        gap.finalize()
+        bar_window = getattr(gap, "window", None)
+        if bar_window is not None:
+            bar_window.kill()
+
     def cmd_spawn(self, cmd):
         """Run cmd in a shell.
 
         cmd may be a string, which is parsed by shlex.split, or a list (similar
-        to subprocess.Popen).
+        to subprocess.Popen). Returns the pid of the process, or None if it
+        could not be started.
 
         Examples
         ========
@@ -1455,71 +1761,7 @@ class Qtile(command.CommandObject):
             args = shlex.split(cmd)
         else:
             args = list(cmd)
-
-        r, w = os.pipe()
-        pid = os.fork()
-        if pid < 0:
-            os.close(r)
-            os.close(w)
-            return pid
-
-        if pid == 0:
-            os.close(r)
-
-            # close qtile's stdin, stdout, stderr so the called process doesn't
-            # pollute our xsession-errors.
-            os.close(0)
-            os.close(1)
-            os.close(2)
-
-            pid2 = os.fork()
-            if pid2 == 0:
-                os.close(w)
-
-                # Open /dev/null as stdin, stdout, stderr
-                try:
-                    fd = os.open(os.devnull, os.O_RDWR)
-                except OSError:
-                    # This shouldn't happen, catch it just in case
-                    pass
-                else:
-                    # For Python >=3.4, need to set file descriptor to inheritable
-                    try:
-                        os.set_inheritable(fd, True)
-                    except AttributeError:
-                        pass
-
-                    # Again, this shouldn't happen, but we should just check
-                    if fd > 0:
-                        os.dup2(fd, 0)
-
-                    os.dup2(fd, 1)
-                    os.dup2(fd, 2)
-
-                try:
-                    os.execvp(args[0], args)
-                except OSError as e:
-                    logger.error("failed spawn: \"{0}\"\n{1}".format(cmd, e))
-
-                os._exit(1)
-            else:
-                # Here it doesn't matter if fork failed or not, we just write
-                # its return code and exit.
-                os.write(w, str(pid2).encode())
-                os.close(w)
-
-                # sys.exit raises SystemExit, which will then be caught by our
-                # top level catchall and we'll end up with two qtiles; os._exit
-                # actually calls exit.
-                os._exit(0)
-        else:
-            os.close(w)
-            os.waitpid(pid, 0)
-
-            # 1024 bytes should be enough for any pid. :)
-            pid = os.read(r, 1024)
-            os.close(r)
-            return int(pid)
+        return self.process.spawn(args)
 
     def cmd_status(self):
         """Return "OK" if Qtile is running"""
@@ -1573,6 +1815,27 @@ class Qtile(command.CommandObject):
         """Quit Qtile"""
         self.stop()
 
+    @contextlib.contextmanager
+    def group_switch(self):
+        """Send the X requests of a group switch as a single batch
+
+        The server is grabbed while the windows are unmapped, mapped and
+        placed, so that the switch appears at once. Hooks fired in the block,
+        e.g. client_focus, are held until the server is released. The requests
+        made are counted in last_switch when counting was started with the
+        x_requests command.
+        """
+        counter = self.conn.request_counter
+        before = counter.requests if counter is not None else None
+        start = time.monotonic()
+        with hook.held():
+            with self.conn.grabbed():
+                yield
+            self.last_switch = dict(
+                requests=counter.requests - before if counter is not None else None,
+                seconds=time.monotonic() - start,
+            )
+
     def cmd_switch_groups(self, groupa, groupb):
         """Switch position of groupa to groupb"""
         if groupa not in self.groups_map or groupb not in self.groups_map:
@@ -1581,14 +1844,15 @@ class Qtile(command.CommandObject):
         indexa = self.groups.index(self.groups_map[groupa])
         indexb = self.groups.index(self.groups_map[groupb])
 
-        self.groups[indexa], self.groups[indexb] = \
-            self.groups[indexb], self.groups[indexa]
-        hook.fire("setgroup")
+        with self.group_switch():
+            self.groups[indexa], self.groups[indexb] = \
+                self.groups[indexb], self.groups[indexa]
 
-        # update window _NET_WM_DESKTOP
-        for group in (self.groups[indexa], self.groups[indexb]):
-            for w in group.windows:
-                w.group = group
+            # update window _NET_WM_DESKTOP
+            for group in (self.groups[indexa], self.groups[indexb]):
+                for w in group.windows:
+                    w.group = group
+        hook.fire("setgroup")
 
     def find_window(self, wid):
         window = self.windows_map.get(wid)
@@ -1871,6 +2135,132 @@ class Qtile(command.CommandObject):
         tracemalloc.take_snapshot().dump(malloc_dump)
         return [True, malloc_dump]
 
+    def cmd_hook_stats(self, reset=False):
+        """Return call counts and time spent in hooks
+
+        The result maps each fired event to the number of times it was fired,
+        the total time spent in its subscribers and a per subscriber breakdown
+        of ``[calls, seconds]``. For coroutine subscribers only the time until
+        their first suspension is counted. Used by ``qtile-top --hooks``.
+
+        Parameters
+        ==========
+        reset :
+            Clear the statistics after returning them.
+        """
+        stats = hook.get_stats()
+        if reset:
+            hook.stats.clear()
+        return stats
+
+    def cmd_profile_start(self):
+        """Start profiling qtile with cProfile
+
+        Profiles the main thread until ``profile_stop`` is called. Returns
+        False if a profile is already running.
+        """
+        import cProfile
+
+        if self._profile is not None:
+            return False
+        self._profile = cProfile.Profile()
+        self._profile.enable()
+        return True
+
+    def cmd_profile_stop(self):
+        """Stop profiling, dump the stats and return where they were written"""
+        if self._profile is None:
+            return [False, "Profile not started"]
+        self._profile.disable()
+        path = self.cmd_profile_dump()
+        self._profile = None
+        return path
+
+    def cmd_profile_dump(self):
+        """Dump the stats of the running profile
+
+        The file can be read with the ``pstats`` module or tools like
+        snakeviz.
+        """
+        if self._profile is None:
+            return [False, "Profile not started"]
+        profile_dump = os.path.join(get_cache_dir(), "qtile_cprofile.dump")
+        self._profile.dump_stats(profile_dump)
+        return [True, profile_dump]
+
+    def cmd_latency_stats(self, reset=False):
+        """Return rolling latency statistics
+
+        For each category (X events, IPC commands, hooks, bar draws and widget
+        polls) returns the number of samples and the p50, p99 and maximum
+        duration in seconds of the most recent samples. Used by ``qtile-top
+        --latency``.
+
+        Parameters
+        ==========
+        reset :
+            Clear the samples after returning the statistics.
+        """
+        stats = latency.tracer.stats()
+        if reset:
+            latency.tracer.reset()
+        return stats
+
+    def cmd_x_requests(self, reset=False):
+        """Return the number of X requests and round trips made
+
+        Counting starts on the first call, so the first call always returns
+        zeros. Round trips are the requests qtile waited on for a reply or an
+        error. Used by the end-to-end benchmark in ``test/bench_wm.py``.
+
+        Parameters
+        ==========
+        reset :
+            Restart counting after returning the counts.
+        """
+        counter = self.conn.count_requests()
+        stats = counter.stats()
+        if reset:
+            counter.reset()
+        return stats
+
+    def cmd_ewmh_stats(self):
+        """Return the client lists published on the root window
+
+        Returns the managed window ids in the order of _NET_CLIENT_LIST and
+        of _NET_CLIENT_LIST_STACKING (bottom to top), and the number of
+        writes of each EWMH root property since startup.
+        """
+        return self.ewmh.info()
+
+    def cmd_icon_stats(self):
+        """Return the memory used by the decoded window icons
+
+        Icons are decoded when a widget uses them and kept in a cache shared
+        by all windows, which drops the least recently used ones beyond its
+        budget. Returns the number of icons and bytes cached, the budget in
+        bytes and the hits, misses and evictions of the cache.
+        """
+        return icons.cache.stats()
+
+    def cmd_switch_stats(self):
+        """Return the requests sent and the time taken by the last group switch
+
+        ``requests`` is None unless request counting was started with the
+        x_requests command. Returns None before the first switch.
+        """
+        return self.last_switch
+
+    def cmd_process_stats(self):
+        """Return the processes started by qtile
+
+        Returns the pids of the live children spawned by qtile, the number of
+        processes whose output is being read, the number of processes
+        launched, and the count, p50, p99 and maximum of the time in seconds
+        it took to launch the most recent ones.
+        """
+        return self.process.stats()
+
     def cmd_get_test_data(self):
         """
         Returns any content arbitrarily set in the self.test_data attribute.
@@ -1890,5 +2280,16 @@ class Qtile(command.CommandObject):
         return self.cmd_run_extension(extension)
 
     def cmd_run_extension(self, extension):
-        """Run extensions"""
-        extension.run()
+        """Run extensions
+
+        Extensions whose run() is a coroutine, e.g. the ones waiting for the
+        choice of the user in dmenu, run as a task of the event loop.
+        """
+        result = extension.run()
+        if asyncio.iscoroutine(result):
+            task = self._eventloop.create_task(result)
+            task.add_done_callback(self._extension_done)
+
+    def _extension_done(self, task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Extension failed", exc_info=task.exception())
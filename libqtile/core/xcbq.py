@@ -34,7 +34,8 @@
     A minimal EWMH-aware OO layer over xpyb. This is NOT intended to be
     complete - it only implements the subset of functionalty needed by qtile.
 """
-from collections import OrderedDict
+from collections import Counter, OrderedDict, deque
+import contextlib
 from itertools import repeat, chain
 import operator
 import functools
@@ -48,6 +49,7 @@ import xcffib.randr
 import xcffib.xinerama
 import xcffib.xproto
 
+from .. import utils
 from .. import xkeysyms
 from ..log_utils import logger
 from .xcursors import Cursors
@@ -263,14 +265,24 @@ class AtomCache:
         self.atoms = {}
         self.reverse = {}
 
-        # We can change the pre-loads not to wait for a return
-        for name in WindowTypes.keys():
-            self.insert(name=name)
-
         for i in dir(xcffib.xproto.Atom):
             if not i.startswith("_"):
                 self.insert(name=i, atom=getattr(xcffib.xproto.Atom, i))
 
+    def preload(self, names):
+        """Intern the given atoms in a single round trip
+
+        All InternAtom requests are sent before the first reply is waited for,
+        rather than paying a round trip for each atom on first lookup.
+        """
+        cookies = [
+            (name, self.conn.conn.core.InternAtom(False, len(name), name))
+            for name in dict.fromkeys(names)
+            if name not in self.atoms
+        ]
+        for name, cookie in cookies:
+            self.insert(name=name, atom=cookie.reply().atom)
+
     def insert(self, name=None, atom=None):
         assert name or atom
         if atom is None:
@@ -307,9 +319,18 @@ class Screen(_Wrapper):
     """
     def __init__(self, conn, screen):
         _Wrapper.__init__(self, screen)
-        self.default_colormap = Colormap(conn, screen.default_colormap)
+        self.default_colormap = Colormap(
+            conn, screen.default_colormap, self.get_visual(screen.root_visual)
+        )
         self.root = Window(conn, self.root)
 
+    def get_visual(self, visual_id):
+        for depth in self.allowed_depths:
+            for visual in depth.visuals:
+                if visual.visual_id == visual_id:
+                    return visual
+        return None
+
 
 class PseudoScreen:
     """
@@ -324,10 +345,30 @@ class PseudoScreen:
         self.height = height
 
 
+def _channel(mask):
+    """Shift and maximum value of a colour channel of a TrueColor visual"""
+    shift = 0
+    while mask and not mask & 1:
+        mask >>= 1
+        shift += 1
+    return shift, mask
+
+
 class Colormap:
-    def __init__(self, conn, cid):
+    def __init__(self, conn, cid, visual=None):
         self.conn = conn
         self.cid = cid
+        # colour -> pixel, see pixel()
+        self.pixels = {}  # type: typing.Dict[typing.Any, int]
+        # pixels allocated by the server, to be freed by free()
+        self.allocated = set()  # type: typing.Set[int]
+        self.channels = None
+        if visual is not None and \
+                visual._class == xcffib.xproto.VisualClass.TrueColor:
+            self.channels = [
+                _channel(mask)
+                for mask in (visual.red_mask, visual.green_mask, visual.blue_mask)
+            ]
 
     def alloc_color(self, color):
         """
@@ -346,6 +387,47 @@ class Colormap:
             b = x8to16(int(color[-2] + color[-1], 16))
             return self.conn.conn.core.AllocColor(self.cid, r, g, b).reply()
 
+    def pixel(self, color):
+        """
+            The pixel value of a color, allocated once per color. For RGB
+            colors on TrueColor visuals the pixel is computed without asking
+            the X server.
+        """
+        try:
+            return self.pixels[color]
+        except KeyError:
+            pass
+        pixel = self._true_color(color)
+        if pixel is None:
+            pixel = self.alloc_color(color).pixel
+            self.allocated.add(pixel)
+        self.pixels[color] = pixel
+        return pixel
+
+    def _true_color(self, color):
+        if self.channels is None:
+            return None
+        try:
+            rgba = utils.rgb(color)
+        except ValueError:
+            # e.g. a color name, which only the server knows
+            return None
+        pixel = 0
+        for value, (shift, maximum) in zip(rgba, self.channels):
+            pixel |= int(round(value * maximum)) << shift
+        return pixel
+
+    def free(self):
+        """
+            Forget the cached pixels and free those allocated by the server.
+        """
+        if self.allocated:
+            self.conn.conn.core.FreeColors(
+                self.cid, 0, len(self.allocated), list(self.allocated)
+            )
+        self.pixels = {}
+        self.allocated = set()
+
 
 class Xinerama:
     def __init__(self, conn):
@@ -366,8 +448,10 @@ class RandR:
 
     def query_crtcs(self, root):
         crtc_list = []
-        for crtc in self.ext.GetScreenResources(root).reply().crtcs:
-            crtc_info = self.ext.GetCrtcInfo(crtc, xcffib.CurrentTime).reply()
+        crtcs = self.ext.GetScreenResources(root).reply().crtcs
+        cookies = [self.ext.GetCrtcInfo(crtc, xcffib.CurrentTime) for crtc in crtcs]
+        for cookie in cookies:
+            crtc_info = cookie.reply()
             crtc_dict = {
                 "x": crtc_info.x,
                 "y": crtc_info.y,
@@ -613,6 +697,12 @@ class Window:
         if r:
             return r[0]
 
+    def get_net_startup_id(self):
+        """The startup notification id the client was started with"""
+        r = self.get_property("_NET_STARTUP_ID", "UTF8_STRING")
+        if r:
+            return self._property_utf8(r)
+
     def configure(self, **kwargs):
         """
         Arguments can be: x, y, width, height, border, sibling, stackmode
@@ -637,13 +727,14 @@ class Window:
             self.wid, mask, values
         )
 
-    def set_property(self, name, value, type=None, format=None):
+    def set_property(self, name, value, type=None, format=None, append=False):
         """
         Parameters
         ==========
         name : String Atom name
         type : String Atom name
         format : 8, 16, 32
+        append : add value at the end of the current value of the property
         """
         if name in PropertyMap:
             if type or format:
@@ -674,7 +765,8 @@ class Window:
 
         try:
             self.conn.conn.core.ChangePropertyChecked(
-                xcffib.xproto.PropMode.Replace,
+                xcffib.xproto.PropMode.Append if append
+                else xcffib.xproto.PropMode.Replace,
                 self.wid,
                 self.conn.atoms[name],
                 self.conn.atoms[type],
@@ -687,11 +779,14 @@ class Window:
                 'X error in SetProperty (wid=%r, prop=%r), ignoring',
                 self.wid, name)
 
-    def get_property(self, prop, type=None, unpack=None):
+    def get_property(self, prop, type=None, unpack=None,
+                     offset=0, length=(2 ** 32) - 1):
         """Return the contents of a property as a GetPropertyReply
 
         If unpack is specified, a tuple of values is returned.  The type to
-        unpack, either `str` or `int` must be specified.
+        unpack, either `str` or `int` must be specified. Only part of the
+        property is returned when offset or length, both in 32 bit units, are
+        given.
         """
         if type is None:
             if prop not in PropertyMap:
@@ -710,7 +805,7 @@ class Window:
                 self.conn.atoms[type]
                 if isinstance(type, str)
                 else type,
-                0, (2 ** 32) - 1
+                offset, length
             ).reply()
         except (xcffib.xproto.WindowError, xcffib.xproto.AccessError):
             logger.warning(
@@ -829,6 +924,130 @@ class Font:
         return x
 
 
+class RequestCounter:
+    """Counts the requests sent on an xcffib connection
+
+    Wraps the connection so that every request sent and every round trip, i.e.
+    waiting for a reply or checking a request for errors, is counted. Events
+    and flushes are not counted. Core requests are also counted by opcode.
+    """
+    def __init__(self, conn):
+        self.requests = 0
+        self.round_trips = 0
+        self.core = Counter()
+
+        send_request = conn.send_request
+        wait_for_reply = conn.wait_for_reply
+        request_check = conn.request_check
+
+        def counted_send_request(flags, xcb_parts, xcb_req):
+            self.requests += 1
+            if xcb_req.ext == xcffib.ffi.NULL:
+                self.core[xcb_req.opcode] += 1
+            return send_request(flags, xcb_parts, xcb_req)
+
+        def counted_wait_for_reply(sequence):
+            self.round_trips += 1
+            return wait_for_reply(sequence)
+
+        def counted_request_check(sequence):
+            self.round_trips += 1
+            return request_check(sequence)
+
+        conn.send_request = counted_send_request
+        conn.wait_for_reply = counted_wait_for_reply
+        conn.request_check = counted_request_check
+
+    def reset(self):
+        self.requests = 0
+        self.round_trips = 0
+        self.core.clear()
+
+    def stats(self):
+        return dict(
+            requests=self.requests,
+            round_trips=self.round_trips,
+            core=dict(self.core),
+        )
+
+
+class IgnoredEvents:
+    """Drops the events caused by our own requests
+
+    Rather than removing a mask from the event mask of each window before a
+    request and restoring it after, which costs two requests per window, the
+    sequence numbers of the requests are recorded and the events they cause
+    are dropped when they are read. The server gives each event the sequence
+    number of the last request it processed, truncated to 16 bits.
+    """
+    def __init__(self, conn):
+        # the sequence number of the last request sent
+        self.sequence = 0
+        # (first, last) sequence ranges whose EnterNotify events are dropped,
+        # disjoint and in order
+        self._enter = deque()
+        # (sequence, wid) of the unmaps whose UnmapNotify events are dropped
+        self._unmap = deque()
+        self.dropped = 0
+
+        send_request = conn.send_request
+
+        def tracked_send_request(*args):
+            self.sequence = send_request(*args)
+            return self.sequence
+
+        conn.send_request = tracked_send_request
+
+    @contextlib.contextmanager
+    def enter(self):
+        """Drop the EnterNotify events caused by the requests of the block,
+        e.g. windows moving under the pointer"""
+        first = self.sequence + 1
+        yield
+        last = self.sequence
+        if last < first:
+            return
+        if self._enter and first <= self._enter[-1][1] + 1:
+            first = min(first, self._enter.pop()[0])
+        self._enter.append((first, last))
+
+    def unmap(self, wid):
+        """Drop the UnmapNotify events of the last request, an unmap of wid"""
+        self._unmap.append((self.sequence, wid))
+
+    def _full_sequence(self, sequence):
+        delta = (sequence - self.sequence) & 0xffff
+        if delta < 0x8000:
+            return self.sequence + delta
+        return self.sequence + delta - 0x10000
+
+    def match(self, e):
+        """Whether the event was caused by a request it was ignored for
+
+        Events are read in order, so the requests older than the event are
+        forgotten.
+        """
+        if e.sequence is None:
+            return False
+        sequence = self._full_sequence(e.sequence)
+        while self._enter and self._enter[0][1] < sequence:
+            self._enter.popleft()
+        while self._unmap and self._unmap[0][0] < sequence:
+            self._unmap.popleft()
+
+        if isinstance(e, xcffib.xproto.EnterNotifyEvent):
+            ignored = self._enter and self._enter[0][0] <= sequence
+        elif isinstance(e, xcffib.xproto.UnmapNotifyEvent):
+            ignored = any(
+                i == sequence and wid == e.window for i, wid in self._unmap
+            )
+        else:
+            return False
+        if ignored:
+            self.dropped += 1
+        return bool(ignored)
+
+
 class Connection:
     _extmap = {
         "xinerama": Xinerama,
@@ -839,9 +1058,24 @@ class Connection:
     def __init__(self, display):
         self.conn = xcffib.connect(display=display)
         self._connected = True
+        self.request_counter = None
+        self.ignored = IgnoredEvents(self.conn)
+        self._grabs = 0
         self.cursors = Cursors(self)
         self.setup = self.conn.get_setup()
-        extensions = self.extensions()
+
+        # Send all the requests needed during setup before waiting for any
+        # reply, so that setup takes a couple of round trips instead of one
+        # per request.
+        extensions_cookie = self.conn.core.ListExtensions()
+        first = self.setup.min_keycode
+        count = self.setup.max_keycode - self.setup.min_keycode + 1
+        keymap_cookie = self.conn.core.GetKeyboardMapping(first, count)
+        modmap_cookie = self.conn.core.GetModifierMapping()
+        self.atoms = AtomCache(self)
+        self.atoms.preload(chain(SUPPORTED_ATOMS, PropertyMap))
+
+        extensions = self._extensions(extensions_cookie)
         self.screens = [Screen(self, i) for i in self.setup.roots]
         self.default_screen = self.screens[self.conn.pref_screen]
         for i in extensions:
@@ -870,14 +1104,12 @@ class Connection:
                 )
                 self.pseudoscreens.append(scr)
 
-        self.atoms = AtomCache(self)
-
         self.code_to_syms = {}
         self.first_sym_to_code = None
-        self.refresh_keymap()
+        self._update_keymap(first, keymap_cookie.reply())
 
         self.modmap = None
-        self.refresh_modmap()
+        self._update_modmap(modmap_cookie.reply())
 
     def finalize(self):
         self.cursors.finalize()
@@ -888,7 +1120,9 @@ class Connection:
             first = self.setup.min_keycode
             count = self.setup.max_keycode - self.setup.min_keycode + 1
         q = self.conn.core.GetKeyboardMapping(first, count).reply()
+        self._update_keymap(first, q)
 
+    def _update_keymap(self, first, q):
         assert len(q.keysyms) % q.keysyms_per_keycode == 0
         for i in range(len(q.keysyms) // q.keysyms_per_keycode):
             self.code_to_syms[first + i] = \
@@ -902,7 +1136,9 @@ class Connection:
         self.first_sym_to_code = first_sym_to_code
 
     def refresh_modmap(self):
-        reply = self.conn.core.GetModifierMapping().reply()
+        self._update_modmap(self.conn.core.GetModifierMapping().reply())
+
+    def _update_modmap(self, reply):
         modmap = {}
         names = (repeat(name, reply.keycodes_per_modifier) for name in ModMasks)
         for name, keycode in zip(chain.from_iterable(names), reply.keycodes):
@@ -943,6 +1179,15 @@ class Connection:
         )
         return Window(self, wid)
 
+    def count_requests(self):
+        """Start counting the requests made on this connection
+
+        Returns the RequestCounter, which is only installed once.
+        """
+        if self.request_counter is None:
+            self.request_counter = RequestCounter(self.conn)
+        return self.request_counter
+
     def disconnect(self):
         self.conn.disconnect()
         self._connected = False
@@ -960,6 +1205,26 @@ class Connection:
     def grab_server(self):
         return self.conn.core.GrabServer()
 
+    @contextlib.contextmanager
+    def grabbed(self):
+        """Grab the server while the requests of the block are sent
+
+        Other clients, e.g. a compositor, then see the changes made in the
+        block at once rather than one request at a time. Blocks can be nested;
+        the server is released and the requests are flushed at the end of the
+        outermost one.
+        """
+        self._grabs += 1
+        if self._grabs == 1:
+            self.conn.core.GrabServer()
+        try:
+            yield
+        finally:
+            self._grabs -= 1
+            if self._grabs == 0:
+                self.conn.core.UngrabServer()
+                self.conn.flush()
+
     def get_setup(self):
         return self.conn.get_setup()
 
@@ -969,9 +1234,12 @@ class Connection:
         return Font(self, fid)
 
     def extensions(self):
+        return self._extensions(self.conn.core.ListExtensions())
+
+    def _extensions(self, cookie):
         return set(
             i.name.to_string().lower()
-            for i in self.conn.core.ListExtensions().reply().names
+            for i in cookie.reply().names
         )
 
 
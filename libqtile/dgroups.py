@@ -26,6 +26,9 @@
 # SOFTWARE.
 
 import collections
+import heapq
+import sys
+import time
 
 import libqtile.hook
 from libqtile.config import Key
@@ -33,6 +36,7 @@ from libqtile.command import lazy
 from libqtile.config import Group
 from libqtile.config import Rule
 from libqtile.config import Match
+from libqtile.config import MatchValues
 from libqtile.log_utils import logger
 
 
@@ -82,6 +86,14 @@ class DGroups:
         self.rules_map = {}
         self.last_rule_id = 0
 
+        # rules in evaluation order, as (order, rule) pairs. Rules which only
+        # match pids (e.g. the ones of Group.spawn) are looked up by the pid
+        # of new windows instead of being compared to every window.
+        self._pid_rules = {}
+        self._other_rules = []
+        self._first_order = 0
+        self._last_order = 0
+
         for rule in getattr(qtile.config, 'dgroups_app_rules', []):
             self.add_rule(rule)
 
@@ -94,7 +106,10 @@ class DGroups:
 
         self.delay = delay
 
+        # group name -> time when the group is deleted if it is still empty,
+        # a single timer is scheduled for the earliest one
         self.timeout = {}
+        self._timer = None
 
     def add_rule(self, rule, last=True):
         rule_id = self.last_rule_id
@@ -103,6 +118,7 @@ class DGroups:
             self.rules.append(rule)
         else:
             self.rules.insert(0, rule)
+        self._index_rule(rule, last)
         self.last_rule_id += 1
         return rule_id
 
@@ -110,14 +126,56 @@ class DGroups:
         rule = self.rules_map.get(rule_id)
         if rule:
             self.rules.remove(rule)
+            self._unindex_rule(rule)
             del self.rules_map[rule_id]
         else:
             logger.warn('Rule "%s" not found', rule_id)
 
+    @staticmethod
+    def _rule_pids(rule):
+        net_wm_pids = getattr(rule.match, 'net_wm_pids', None)
+        return net_wm_pids() if net_wm_pids is not None else None
+
+    def _index_rule(self, rule, last=True):
+        if last:
+            entry = (self._last_order, rule)
+            self._last_order += 1
+        else:
+            self._first_order -= 1
+            entry = (self._first_order, rule)
+        pids = self._rule_pids(rule)
+        indexes = [self._pid_rules.setdefault(pid, []) for pid in pids] \
+            if pids else [self._other_rules]
+        for index in indexes:
+            if last:
+                index.append(entry)
+            else:
+                index.insert(0, entry)
+
+    def _unindex_rule(self, rule):
+        pids = self._rule_pids(rule)
+        for key in pids or [None]:
+            index = self._pid_rules[key] if key is not None else self._other_rules
+            index[:] = [entry for entry in index if entry[1] is not rule]
+            if key is not None and not index:
+                del self._pid_rules[key]
+
+    def _candidate_rules(self, values):
+        """The rules which can match a window, in order"""
+        pid_rules = None
+        if self._pid_rules:
+            pid_rules = self._pid_rules.get(values.get('net_wm_pid'))
+        if not pid_rules:
+            return [rule for _, rule in self._other_rules]
+        entries = heapq.merge(self._other_rules, pid_rules, key=lambda e: e[0])
+        return [rule for _, rule in entries]
+
     def add_dgroup(self, group, start=False):
         self.groups_map[group.name] = group
         rules = [Rule(m, group=group.name) for m in group.matches]
         self.rules.extend(rules)
+        for rule in rules:
+            self._index_rule(rule)
         if start:
             self.qtile.add_group(group.name, group.layout, group.layouts, group.label)
 
@@ -149,12 +207,35 @@ class DGroups:
     def _addgroup(self, qtile, group_name):
         if group_name not in self.groups_map:
             self.add_dgroup(Group(group_name, persist=False))
+        self._insert_group(group_name)
+
+    def _position(self, group):
+        dgroup = self.groups_map.get(group.name)
+        return dgroup.position if dgroup is not None else sys.maxsize
+
+    def _insert_group(self, group_name):
+        """Move a group which was just added to its position
+
+        The other groups are already in order, so the new one is placed by
+        bisection, after the groups with the same position. This happens
+        before the changegroup hook of the new group is fired.
+        """
+        groups = self.qtile.groups
+        group = self.qtile.groups_map.get(group_name)
+        if group is None or not groups or groups[-1] is not group:
+            return
+        position = self._position(group)
+        lo, hi = 0, len(groups) - 1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if position < self._position(groups[mid]):
+                hi = mid
+            else:
+                lo = mid + 1
+        if lo < len(groups) - 1:
+            groups.insert(lo, groups.pop())
 
     def _add(self, client):
-        if client in self.timeout:
-            logger.info('Remove dgroup source')
-            self.timeout.pop(client).cancel()
-
         # ignore static windows
         if client.defunct:
             return
@@ -166,10 +247,11 @@ class DGroups:
 
         group_set = False
         intrusive = False
+        values = MatchValues(client)
 
-        for rule in self.rules:
+        for rule in self._candidate_rules(values):
             # Matching Rules
-            if rule.matches(client):
+            if rule.matches(client, values):
                 if rule.group:
                     if rule.group in self.groups_map:
                         layout = self.groups_map[rule.group].layout
@@ -226,29 +308,41 @@ class DGroups:
 
                 self.add_dgroup(Group(group_name, persist=False), start=True)
                 client.togroup(group_name)
-        self.sort_groups()
 
     def sort_groups(self):
         grps = self.qtile.groups
-        sorted_grps = sorted(grps, key=lambda g: self.groups_map[g.name].position)
+        sorted_grps = sorted(grps, key=self._position)
         if grps != sorted_grps:
             self.qtile.groups = sorted_grps
             libqtile.hook.fire("changegroup")
 
     def _del(self, client):
         group = client.group
+        if group is None or group.name not in self.groups_map or \
+                self.groups_map[group.name].persist:
+            return
 
-        def delete_client():
-            # Delete group if empty and don't persist
-            if group and group.name in self.groups_map and \
-                    not self.groups_map[group.name].persist and \
-                    len(group.windows) <= 0:
-                self.qtile.delete_group(group.name)
-                self.sort_groups()
-            del self.timeout[client]
-
-        # Wait the delay until really delete the group
-        logger.info('Add dgroup timer')
-        self.timeout[client] = self.qtile.call_later(
-            self.delay, delete_client
-        )
+        # Wait the delay until really deleting the group, from the last window
+        # killed in it
+        self.timeout[group.name] = time.monotonic() + self.delay
+        if self._timer is None:
+            self._timer = self.qtile.call_later(self.delay, self._delete_groups)
+
+    def _delete_groups(self):
+        """Delete the groups which are due and still empty"""
+        self._timer = None
+        now = time.monotonic()
+        for name, deadline in list(self.timeout.items()):
+            if deadline > now:
+                continue
+            del self.timeout[name]
+            group = self.qtile.groups_map.get(name)
+            if group is not None and not group.windows:
+                try:
+                    self.qtile.delete_group(name)
+                except ValueError as e:
+                    logger.warning('Could not delete group %s: %s', name, e)
+        if self.timeout:
+            self._timer = self.qtile.call_later(
+                max(0, min(self.timeout.values()) - now), self._delete_groups
+            )
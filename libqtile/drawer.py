@@ -29,6 +29,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import collections
+import functools
 import math
 import cairocffi
 import xcffib.xproto
@@ -37,6 +38,22 @@ from . import pangocffi
 from . import utils
 
 
+@functools.lru_cache(maxsize=64)
+def _gradient(colours, height):
+    """A vertical gradient through colours, shared by all drawers
+
+    Patterns don't depend on a surface, so the drawers of all the bars and
+    widgets of the same height use the same one.
+    """
+    linear = cairocffi.LinearGradient(0.0, 0.0, 0.0, height)
+    step_size = 1.0 / (len(colours) - 1)
+    step = 0.0
+    for c in colours:
+        linear.add_color_stop_rgba(step, *utils.rgb(c))
+        step += step_size
+    return linear
+
+
 class TextLayout:
     def __init__(self, drawer, text, colour, font_family, font_size,
                  font_shadow, wrap=True, markup=False):
@@ -242,6 +259,8 @@ class Drawer:
         )
         self.ctx = self.new_ctx()
         self.clear((0, 0, 1))
+        # called after each copy to the window, see widget.base.Mirror
+        self.on_draw = None
 
     def finalize(self):
         self.qtile.conn.conn.core.FreeGC(self.gc)
@@ -302,14 +321,29 @@ class Drawer:
         height :
             the Y portion of the canvas to draw at the starting point.
         """
+        self.copy_to(
+            self.wid,
+            offsetx, offsety,
+            self.width if width is None else width,
+            self.height if height is None else height
+        )
+        if self.on_draw is not None:
+            self.on_draw()
+
+    def copy_to(self, wid, offsetx, offsety, width, height):
+        """Copy the top left of the pixmap to another window
+
+        The copy is done by the X server, the window must be on the same
+        screen as the window of this drawer.
+        """
         self.qtile.conn.conn.core.CopyArea(
             self.pixmap,
-            self.wid,
+            wid,
             self.gc,
             0, 0,  # srcx, srcy
             offsetx, offsety,  # dstx, dsty
-            self.width if width is None else width,
-            self.height if height is None else height
+            width,
+            height
         )
 
     def find_root_visual(self):
@@ -325,20 +359,14 @@ class Drawer:
         if type(colour) == list:
             if len(colour) == 0:
                 # defaults to black
-                self.ctx.set_source_rgba(*utils.rgb("#000000"))
+                self.ctx.set_source_rgba(0, 0, 0, 1)
             elif len(colour) == 1:
                 self.ctx.set_source_rgba(*utils.rgb(colour[0]))
             else:
-                linear = cairocffi.LinearGradient(0.0, 0.0, 0.0, self.height)
-                step_size = 1.0 / (len(colour) - 1)
-                step = 0.0
-                for c in colour:
-                    rgb_col = utils.rgb(c)
-                    if len(rgb_col) < 4:
-                        rgb_col[3] = 1
-                    linear.add_color_stop_rgba(step, *rgb_col)
-                    step += step_size
-                self.ctx.set_source(linear)
+                colours = tuple(
+                    tuple(c) if isinstance(c, list) else c for c in colour
+                )
+                self.ctx.set_source(_gradient(colours, self.height))
         else:
             self.ctx.set_source_rgba(*utils.rgb(colour))
 
@@ -19,7 +19,6 @@
 # SOFTWARE.
 
 import shlex
-from subprocess import Popen, PIPE
 from .. import configurable
 
 from typing import Any, List, Tuple  # noqa: F401
@@ -81,8 +80,8 @@ class RunCommand(_Extension):
 
     def run(self):
         """
-        An extension can inherit this class, define configured_command and use
-        the process object by overriding this method and using super():
+        An extension can inherit this class, define configured_command and
+        launch it by overriding this method and using super():
 
         .. code-block:: python
 
@@ -91,7 +90,10 @@ class RunCommand(_Extension):
                 self.configured_command = "foo --bar"
 
             def run(self):
-                process = super(Subclass, self).run()
+                pid = super(Subclass, self).run()
+
+        The process is spawned and reaped by qtile.process; use
+        qtile.process.run() from a coroutine to read its output instead.
         """
         if self.configured_command:
             if isinstance(self.configured_command, str):
@@ -99,4 +101,4 @@ class RunCommand(_Extension):
             # Else assume that self.configured_command is already a sequence
         else:
             self.configured_command = self.command
-        return Popen(self.configured_command, stdout=PIPE, stdin=PIPE)
+        return self.qtile.process.spawn(self.configured_command)
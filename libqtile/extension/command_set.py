@@ -18,7 +18,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from os import system
 from .dmenu import Dmenu
 
 
@@ -57,25 +56,18 @@ class CommandSet(Dmenu):
     def _configure(self, qtile):
         Dmenu._configure(self, qtile)
 
-    def run(self):
+    async def run(self):
         if not self.commands:
             return
 
         if self.pre_commands:
             for cmd in self.pre_commands:
-                system(cmd)
+                await self.qtile.process.run(cmd, shell=True)
 
-        out = super(CommandSet, self).run(items=self.commands.keys())
-
-        try:
-            sout = out.rstrip('\n')
-        except AttributeError:
-            # out is not a string (for example it's a Popen object returned
-            # by super(WindowList, self).run() when there are no menu items to
-            # list
-            return
+        out = await self.select(list(self.commands))
+        sout = out.rstrip('\n')
 
         if sout not in self.commands:
             return
 
-        system(self.commands[sout])
+        await self.qtile.process.run(self.commands[sout], shell=True)
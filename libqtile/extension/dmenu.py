@@ -87,18 +87,27 @@ class Dmenu(base.RunCommand):
         if self.dmenu_height:
             self.configured_command.extend(("-h", str(self.dmenu_height)))
 
-    def run(self, items=None):
-        if items and self.dmenu_lines:
-            lines = min(len(items), self.dmenu_lines)
-            self.configured_command.extend(("-l", str(lines)))
-
-        proc = super().run()
+    async def run(self, items=None):
+        """Show dmenu, and return the line chosen among items if given
 
+        Without items, dmenu is only launched, e.g. dmenu_run which runs the
+        command typed itself, and the pid of the process is returned.
+        """
         if items:
-            input_str = "\n".join([i for i in items]) + "\n"
-            return proc.communicate(str.encode(input_str))[0].decode('utf-8')
+            return await self.select(items)
+        return super().run()
 
-        return proc
+    async def select(self, items):
+        """Return the line of dmenu's output for items
+
+        Unlike run(), qtile keeps handling events while dmenu is open.
+        """
+        command = list(self.configured_command)
+        if items and self.dmenu_lines:
+            command.extend(("-l", str(min(len(items), int(self.dmenu_lines)))))
+        input_str = "\n".join(items) + "\n"
+        _, out = await self.qtile.process.run(command, input=input_str)
+        return out
 
 
 class DmenuRun(Dmenu):
@@ -55,17 +55,12 @@ class WindowList(Dmenu):
                 self.item_to_win[item] = win
                 id += 1
 
-    def run(self):
+    async def run(self):
         self.list_windows()
-        out = super().run(items=self.item_to_win.keys())
-
-        try:
-            sout = out.rstrip('\n')
-        except AttributeError:
-            # out is not a string (for example it's a Popen object returned
-            # by super(WindowList, self).run() when there are no menu items to
-            # list
+        if not self.item_to_win:
             return
+        out = await self.select(list(self.item_to_win))
+        sout = out.rstrip('\n')
 
         try:
             win = self.item_to_win[sout]
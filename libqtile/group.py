@@ -26,7 +26,6 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-import contextlib
 import xcffib
 import xcffib.xproto
 
@@ -126,6 +125,34 @@ class _Group(command.CommandObject):
                 return
         raise ValueError("No such layout: %s" % layout)
 
+    def set_layouts(self, layouts):
+        """Replace the layouts of this group
+
+        Windows are re-added to fresh clones of the given layouts. If a layout
+        with the name of the current one is still present, it stays current.
+        """
+        current = self.layout.name
+        self.layout.hide()
+        for layout in self.layouts:
+            hook.remove_subscribers(hook.owned_by(layout))
+            layout.finalize()
+
+        self.layouts = [i.clone(self) for i in layouts]
+        names = [i.name for i in self.layouts]
+        self.current_layout = names.index(current) if current in names else 0
+
+        for win in self.windows:
+            if not win.floating:
+                for i in self.layouts:
+                    i.add(win)
+        if self.current_window and not self.current_window.floating:
+            for i in self.layouts:
+                i.focus(self.current_window)
+
+        if self.screen:
+            self.layout.show(self.screen.get_rect())
+            self.layout_all()
+
     def use_layout(self, index):
         assert 0 <= index < len(self.layouts), "layout index out of bounds"
         self.layout.hide()
@@ -148,7 +175,8 @@ class _Group(command.CommandObject):
         to it.
         """
         if self.screen and len(self.windows):
-            with self.disable_mask(xcffib.xproto.EventMask.EnterWindow):
+            # windows moved under the pointer must not take the focus
+            with self.qtile.conn.ignored.enter():
                 normal = [x for x in self.windows if not x.floating]
                 floating = [
                     x for x in self.windows
@@ -184,20 +212,12 @@ class _Group(command.CommandObject):
 
     def hide(self):
         self.screen = None
-        with self.disable_mask(xcffib.xproto.EventMask.EnterWindow |
-                               xcffib.xproto.EventMask.FocusChange |
-                               xcffib.xproto.EventMask.LeaveWindow):
+        # windows which are already unmapped are left alone
+        with self.qtile.conn.ignored.enter():
             for i in self.windows:
-                i.hide()
-            self.layout.hide()
-
-    @contextlib.contextmanager
-    def disable_mask(self, mask):
-        for i in self.windows:
-            i._disable_mask(mask)
-        yield
-        for i in self.windows:
-            i._reset_mask()
+                if not i.hidden:
+                    i.hide()
+        self.layout.hide()
 
     def focus(self, win, warp=True, force=False):
         """Focus the given window
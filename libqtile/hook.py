@@ -30,16 +30,62 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import asyncio
+import contextlib
+import logging
+import time
+
 from .log_utils import logger
+from . import latency
 from . import utils
 
-from typing import Dict, Set  # noqa: F401
+from typing import Dict, List, Optional, Set  # noqa: F401
 
 
 subscriptions = {}  # type: Dict
 SKIPLOG = set()  # type: Set
 qtile = None
 
+# subscribers which are run after the current event batch instead of inline
+deferred = set()  # type: Set
+# events which carry no arguments, fired again and again while handling a
+# batch of X events; they are delivered once, after the batch
+COALESCED = {"focus_change", "window_name_change"}
+_pending = set()  # type: Set
+# events fired while hooks are held, see held()
+_held = None  # type: Optional[List]
+
+# event name -> HookStats
+stats = {}  # type: Dict
+
+
+class HookStats:
+    """Call counts and cumulative time of an event and its subscribers"""
+    def __init__(self):
+        self.fires = 0
+        self.time = 0.0
+        # subscriber name -> [calls, seconds]
+        self.subscribers = {}  # type: Dict
+
+    def record(self, func, elapsed):
+        self.time += elapsed
+        entry = self.subscribers.setdefault(_describe(func), [0, 0.0])
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def info(self):
+        return dict(
+            fires=self.fires,
+            time=self.time,
+            subscribers=self.subscribers,
+        )
+
+
+def _describe(func):
+    name = getattr(func, "__qualname__", None) or repr(func)
+    module = getattr(func, "__module__", None)
+    return "%s.%s" % (module, name) if module else name
+
 
 def init(q):
     global qtile
@@ -48,6 +94,9 @@ def init(q):
 
 def clear():
     subscriptions.clear()
+    deferred.clear()
+    _pending.clear()
+    stats.clear()
 
 
 class Subscribe:
@@ -356,21 +405,143 @@ class Unsubscribe(Subscribe):
                 "Tried to unsubscribe a hook that was not"
                 " currently subscribed"
             )
+        deferred.discard(func)
 
 
 unsubscribe = Unsubscribe()
 
 
+class SubscribeDeferred(Subscribe):
+    """
+    This class mirrors subscribe, but subscribers are run after the X events
+    currently being handled, through the event loop, instead of inline. Use it
+    for slow hooks which shouldn't hold up window management.
+    """
+    def _subscribe(self, event, func):
+        deferred.add(func)
+        return Subscribe._subscribe(self, event, func)
+
+
+subscribe_deferred = SubscribeDeferred()
+
+
+def owned_by(owner):
+    """Return a predicate matching subscribers bound to owner
+
+    A subscriber is owned by an object if it is a bound method of that object
+    or a closure referencing it, as used by widgets and layouts which register
+    hooks for themselves.
+    """
+    def predicate(func):
+        if getattr(func, "__self__", None) is owner:
+            return True
+        for cell in getattr(func, "__closure__", None) or ():
+            try:
+                if cell.cell_contents is owner:
+                    return True
+            except ValueError:
+                # empty cell
+                pass
+        return False
+    return predicate
+
+
+def remove_subscribers(predicate):
+    """Unsubscribe every subscriber for which predicate(func) is true"""
+    for lst in subscriptions.values():
+        lst[:] = [func for func in lst if not predicate(func)]
+    for func in [func for func in deferred if predicate(func)]:
+        deferred.discard(func)
+
+
+def _call_soon(func, *args):
+    """Schedule func on the event loop, or return False if there is none"""
+    call_soon = getattr(qtile, "call_soon", None)
+    if call_soon is None or getattr(qtile, "_eventloop", None) is None:
+        return False
+    call_soon(func, *args)
+    return True
+
+
+def _run(event, func, args, kwargs):
+    start = time.monotonic()
+    try:
+        result = func(*args, **kwargs)
+        if asyncio.iscoroutine(result):
+            task = qtile._eventloop.create_task(result)
+            task.add_done_callback(lambda t: _check_task(event, t))
+    except:  # noqa: E722
+        logger.exception("Error in hook %s", event)
+    elapsed = time.monotonic() - start
+    # the stats may have been reset since the event was fired
+    stats.setdefault(event, HookStats()).record(func, elapsed)
+    latency.tracer.record(latency.HOOKS, elapsed)
+
+
+def _check_task(event, task):
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Error in hook %s", event, exc_info=task.exception())
+
+
+def _deliver(event, args, kwargs):
+    _pending.discard(event)
+    for i in list(subscriptions.get(event, [])):
+        if i in deferred and _call_soon(_run, event, i, args, kwargs):
+            continue
+        _run(event, i, args, kwargs)
+
+
+@contextlib.contextmanager
+def held():
+    """Queue the events fired in the block, and fire them after it
+
+    Used while the X server is grabbed: a hook running an X client would
+    otherwise wait on the server forever. Coalesced events are queued once.
+    Blocks can be nested, the events are fired at the end of the outermost
+    one.
+    """
+    global _held
+    if _held is not None:
+        yield
+        return
+    _held = []
+    try:
+        yield
+    finally:
+        queued, _held = _held, None
+        for event, args, kwargs in queued:
+            _dispatch(event, args, kwargs)
+
+
 def fire(event, *args, **kwargs):
     if event not in subscribe.hooks:
         raise utils.QtileError("Unknown event: %s" % event)
-    if event not in SKIPLOG:
+    if event not in SKIPLOG and logger.isEnabledFor(logging.DEBUG):
         logger.debug("Internal event: %s(%s, %s)", event, args, kwargs)
-    for i in subscriptions.get(event, []):
-        try:
-            i(*args, **kwargs)
-        except:  # noqa: E722
-            logger.exception("Error in hook %s", event)
+    if event not in stats:
+        stats[event] = HookStats()
+    stats[event].fires += 1
+    if _held is not None:
+        if event not in COALESCED or \
+                not any(e == event for e, _, _ in _held):
+            _held.append((event, args, kwargs))
+        return
+    _dispatch(event, args, kwargs)
+
+
+def _dispatch(event, args, kwargs):
+    if event in COALESCED:
+        if event in _pending:
+            return
+        if _call_soon(_deliver, event, args, kwargs):
+            _pending.add(event)
+            return
+    _deliver(event, args, kwargs)
+
+
+def get_stats():
+    """Hook statistics, as returned by the hook_stats command"""
+    return {event: s.info() for event, s in stats.items()}
 
 
 @subscribe.client_name_updated
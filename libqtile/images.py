@@ -17,11 +17,17 @@
 # SOFTWARE.
 import cairocffi
 import cairocffi.pixbuf
+import functools
 import io
+import json
 import os
 import re
+import threading
+import typing  # noqa: F401
 from collections import namedtuple, defaultdict, OrderedDict
 
+from . import utils
+
 
 class LoadingError(Exception):
     pass
@@ -58,6 +64,12 @@ def get_cairo_surface(bytes_img, width=None, height=None):
     raise LoadingError("Couldn't load image!")
 
 
+@functools.lru_cache(maxsize=128)
+def _get_file_surface(path, mtime, width, height):
+    with open(path, 'rb') as fobj:
+        return get_cairo_surface(fobj.read(), width, height)
+
+
 def get_cairo_pattern(surface, width=None, height=None, theta=0.0):
     """Return a SurfacePattern from an ImageSurface.
 
@@ -160,10 +172,12 @@ class Img:
     - theta :: rotation of pattern counter clockwise in degrees
     Pattern is first stretched, then rotated.
     """
-    def __init__(self, bytes_img, name='', path=''):
+    def __init__(self, bytes_img, name='', path='', mtime=None):
         self.bytes_img = bytes_img
         self.name = name
         self.path = path
+        # modification time of the file at path which bytes_img was read from
+        self.mtime = mtime
 
     def _reset(self):
         attrs = ('surface', 'pattern')
@@ -177,10 +191,11 @@ class Img:
     def from_path(cls, image_path):
         "Create an Img instance from image_path"
         with open(image_path, 'rb') as fobj:
+            mtime = os.fstat(fobj.fileno()).st_mtime
             bytes_img = fobj.read()
         name = os.path.basename(image_path)
         name, file_type = os.path.splitext(name)
-        return cls(bytes_img, name=name, path=image_path)
+        return cls(bytes_img, name=name, path=image_path, mtime=mtime)
 
     @property
     def default_surface(self):
@@ -257,7 +272,14 @@ class Img:
         try:
             return self._surface
         except AttributeError:
-            surf, fmt = get_cairo_surface(self.bytes_img, self.width, self.height)
+            if self.mtime is not None:
+                # images loaded from files are decoded once per size and
+                # shared, e.g. by the same icon in several bars
+                surf, fmt = _get_file_surface(
+                    self.path, self.mtime, self.width, self.height
+                )
+            else:
+                surf, fmt = get_cairo_surface(self.bytes_img, self.width, self.height)
             self._surface = surf
             return surf
 
@@ -302,37 +324,164 @@ class Img:
         return s0 == s1
 
 
-def get_matching_files(dirpath='.', explicit_filetype=False, *names):
+class IconIndex:
+    """Index of the files in icon directories
+
+    Walking an icon theme takes a long time, so the listing of every directory
+    is kept in a cache file along with its modification time, and only the
+    directories which changed are listed again. Indexing can be started in a
+    thread ahead of time with prefetch(), e.g. when a widget is created, so
+    that it is done by the time the widget loads its images. A lookup checks
+    the modification times of the directories before using the files found
+    by a previous one.
+    """
+    def __init__(self, path=None):
+        # the cache file, in the qtile cache directory by default
+        self.path = path
+        self._lock = threading.Lock()
+        self._cache = None
+        # directory -> ({lowercase name: [path]}, {lowercase stem: [path]})
+        self._tables = {}
+        # directory -> {path of it or a subdirectory: mtime} of the tables
+        self._mtimes = {}  # type: typing.Dict[str, typing.Dict[str, int]]
+        self._threads = {}  # type: typing.Dict[str, threading.Thread]
+
+    def prefetch(self, *directories):
+        """Index the directories in a background thread"""
+        for directory in directories:
+            with self._lock:
+                if directory in self._tables or directory in self._threads:
+                    continue
+                thread = threading.Thread(
+                    target=self.lookup, args=(directory,), daemon=True
+                )
+                self._threads[directory] = thread
+            thread.start()
+
+    def lookup(self, directory):
+        """Files below directory by lowercase name and by lowercase stem
+
+        The paths of each name are in the order os.walk would find them.
+        """
+        thread = self._threads.get(directory)
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+        with self._lock:
+            if directory in self._tables and self._unchanged(directory):
+                return self._tables[directory]
+            by_name = defaultdict(list)
+            by_stem = defaultdict(list)
+            mtimes = {}
+            for dirpath, mtime, filenames in self._walk(directory):
+                mtimes[dirpath] = mtime
+                for filename in filenames:
+                    path = os.path.join(dirpath, filename)
+                    by_name[filename.lower()].append(path)
+                    stem, dot, suffix = filename.rpartition('.')
+                    if dot and _SUFFIX.match(suffix):
+                        by_stem[stem.lower()].append(path)
+            table = (dict(by_name), dict(by_stem))
+            self._tables[directory] = table
+            self._mtimes[directory] = mtimes
+            self._threads.pop(directory, None)
+            return table
+
+    def _unchanged(self, directory):
+        for dirpath, mtime in self._mtimes[directory].items():
+            try:
+                if os.stat(dirpath).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _walk(self, directory):
+        cache = self._load()
+        old = cache.get(directory, {})
+        new = {}
+        walk = []
+
+        def visit(relpath):
+            dirpath = os.path.join(directory, relpath)
+            try:
+                mtime = os.stat(dirpath).st_mtime_ns
+            except OSError:
+                return
+            entry = old.get(relpath)
+            if entry is None or entry[0] != mtime:
+                files, dirs = [], []
+                try:
+                    with os.scandir(dirpath) as entries:
+                        for e in entries:
+                            if not e.is_dir():
+                                files.append(e.name)
+                            elif not e.is_symlink():
+                                # like os.walk, don't follow links
+                                dirs.append(e.name)
+                except OSError:
+                    return
+                entry = [mtime, files, dirs]
+            new[relpath] = entry
+            walk.append((dirpath if relpath else directory, mtime, entry[1]))
+            for name in entry[2]:
+                visit(os.path.join(relpath, name))
+
+        visit('')
+        if new != old:
+            cache[directory] = new
+            self._save()
+        return walk
+
+    def _cache_path(self):
+        if self.path is None:
+            self.path = os.path.join(utils.get_cache_dir(), 'icon_index.json')
+        return self.path
+
+    def _load(self):
+        if self._cache is None:
+            try:
+                with open(self._cache_path()) as f:
+                    self._cache = json.load(f)
+            except (OSError, ValueError):
+                self._cache = {}
+        return self._cache
+
+    def _save(self):
+        path = self._cache_path()
+        try:
+            with open(path + '.tmp', 'w') as f:
+                json.dump(self._cache, f)
+            os.replace(path + '.tmp', path)
+        except OSError:
+            from .log_utils import logger
+            logger.warning("Couldn't write the icon index to %s", path)
+
+
+_SUFFIX = re.compile(r'\w+$')
+
+icon_index = IconIndex()
+
+
+def get_matching_files(dirpath='.', explicit_filetype=False, *names, index=None):
     """Search dirpath recursively for files matching the names
 
     Return a dict with keys equal to entries in names
-    and values a list of matching paths.
+    and values a list of matching paths. Names are matched ignoring case,
+    the keys are spelled as in the matching file names. The directory is
+    looked up in index, icon_index by default.
     """
-    def match_files_in_dir(dirpath, regex_pattern):
-        for dpath, dnames, fnames in os.walk(dirpath):
-            matches = (regex_pattern.match(x) for x in fnames)
-            for match in (x for x in matches if x):
-                d = match.groupdict()
-                d['directory'] = dpath
-                yield d
-
-    pat_str = '(?P<name>' + '|'.join(map(re.escape, names)) + ')'
-    if explicit_filetype:
-        pat_str += '$'
-    else:
-        pat_str += r'\.(?P<suffix>\w+)$'
-    regex_pattern = re.compile(pat_str, flags=re.IGNORECASE)
+    if index is None:
+        index = icon_index
+    by_name, by_stem = index.lookup(dirpath)
+    table = by_name if explicit_filetype else by_stem
 
     d_total = defaultdict(list)
-    join_path = os.path.join
-    for d_match in match_files_in_dir(dirpath, regex_pattern):
-        name, directory = d_match['name'], d_match['directory']
-        try:
-            suffix = d_match['suffix']
-            filename = '.'.join((name, suffix))
-        except KeyError:
-            filename = name
-        d_total[name].append(join_path(directory, filename))
+    for name in set(n.lower() for n in names):
+        for path in table.get(name, ()):
+            filename = os.path.basename(path)
+            if not explicit_filetype:
+                filename = filename.rpartition('.')[0]
+            d_total[filename].append(path)
     return d_total
 
 
@@ -342,9 +491,13 @@ class Loader:
     load icons with Loader e.g.,
     >>> ldr = Loader('/usr/share/icons/Adwaita/24x24', '/usr/share/icons/Adwaita')
     >>> d_loaded_images = ldr.icons('audio-volume-muted', 'audio-volume-low')
+
+    The directories are looked up in icon_index, or in the IconIndex given as
+    the index keyword argument.
     """
     def __init__(self, *directories, **kwargs):
         self.explicit_filetype = False
+        self.index = None
         for k, v in kwargs.items():
             setattr(self, k, v)
         self.directories = list(directories)
@@ -361,7 +514,8 @@ class Loader:
         matching = get_matching_files
         from_path = Img.from_path
         for directory in self.directories:
-            d_matches = matching(directory, explicit, *(set_names - seen))
+            d_matches = matching(directory, explicit, *(set_names - seen),
+                                 index=self.index)
             for name, paths in d_matches.items():
                 yield (name, from_path(paths[0]))
                 seen.add(name)
@@ -0,0 +1,90 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Rolling latency statistics of the work done by the window manager
+"""
+
+import collections
+import contextlib
+import time
+
+from typing import Deque, Dict  # noqa: F401
+
+X_EVENTS = "x_events"
+IPC = "ipc"
+HOOKS = "hooks"
+BAR_DRAWS = "bar_draws"
+WIDGET_POLLS = "widget_polls"
+
+CATEGORIES = (X_EVENTS, IPC, HOOKS, BAR_DRAWS, WIDGET_POLLS)
+
+
+def percentile(ordered, fraction):
+    """Nearest rank percentile of an already sorted list"""
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class LatencyTracer:
+    """Keeps the durations of the last ``size`` samples of each category
+
+    Samples may be recorded from other threads, e.g. by widgets polling in the
+    executor; appending to a deque is thread safe.
+    """
+    def __init__(self, size=1000):
+        self.size = size
+        self.samples = {}  # type: Dict[str, Deque[float]]
+        self.reset()
+
+    def reset(self):
+        self.samples = {
+            category: collections.deque(maxlen=self.size)
+            for category in CATEGORIES
+        }
+
+    def record(self, category, seconds):
+        self.samples[category].append(seconds)
+
+    @contextlib.contextmanager
+    def trace(self, category):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.samples[category].append(time.monotonic() - start)
+
+    def stats(self):
+        """Count, p50, p99 and max, in seconds, per category"""
+        result = {}
+        for category, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[category] = dict(
+                count=len(ordered),
+                p50=percentile(ordered, 0.5),
+                p99=percentile(ordered, 0.99),
+                max=ordered[-1] if ordered else 0.0,
+            )
+        return result
+
+
+tracer = LatencyTracer()
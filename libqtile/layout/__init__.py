@@ -24,16 +24,50 @@
 # is annoying, so we ignore libqtile/layout/__init__.py completely
 # flake8: noqa
 
-from .bsp import Bsp
-from .columns import Columns
-from .floating import Floating
-from .matrix import Matrix
-from .max import Max
-from .ratiotile import RatioTile
-from .slice import Slice
-from .stack import Stack
-from .tile import Tile
-from .tree import TreeTab
-from .verticaltile import VerticalTile
-from .xmonad import MonadTall, MonadWide
-from .zoomy import Zoomy
+import importlib
+import sys
+
+# Layouts are imported on first access. Maps class name to its module.
+layouts = {
+    "Bsp": "bsp",
+    "Columns": "columns",
+    "Floating": "floating",
+    "Matrix": "matrix",
+    "Max": "max",
+    "MonadTall": "xmonad",
+    "MonadWide": "xmonad",
+    "RatioTile": "ratiotile",
+    "Slice": "slice",
+    "Stack": "stack",
+    "Tile": "tile",
+    "TreeTab": "tree",
+    "VerticalTile": "verticaltile",
+    "Zoomy": "zoomy",
+}
+
+__all__ = sorted(layouts)
+
+
+def __getattr__(name):
+    if name in layouts:
+        module = importlib.import_module("." + layouts[name], __name__)
+        globals()[name] = getattr(module, name)
+        return globals()[name]
+    if not name.startswith("__"):
+        # submodules, e.g. libqtile.layout.base
+        try:
+            return importlib.import_module("." + name, __name__)
+        except ModuleNotFoundError as e:
+            if e.name != __name__ + "." + name:
+                raise
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(layouts))
+
+
+if sys.version_info < (3, 7):
+    # no module level __getattr__ (PEP 562), import everything up front
+    for name in __all__:
+        __getattr__(name)
@@ -27,6 +27,46 @@ from .. import command, configurable
 from typing import Any, List, Tuple  # noqa: F401
 
 
+class Placement:
+    """Where a layout puts a client, one entry of the list returned by plan()
+
+    The geometry and border arguments are those of the client's ``place()``
+    method. Clients which are not visible are hidden and their geometry
+    ignored.
+    """
+    __slots__ = ("client", "x", "y", "width", "height", "borderwidth",
+                 "bordercolor", "margin", "visible")
+
+    def __init__(self, client, x=0, y=0, width=0, height=0, borderwidth=0,
+                 bordercolor=None, margin=None, visible=True):
+        self.client = client
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.borderwidth = borderwidth
+        self.bordercolor = bordercolor
+        self.margin = margin
+        self.visible = visible
+
+    def __repr__(self):
+        if not self.visible:
+            return "Placement(%r, hidden)" % self.client
+        return "Placement(%r, %d, %d, %d, %d)" % (
+            self.client, self.x, self.y, self.width, self.height)
+
+
+def apply_plan(plan):
+    """Place and show or hide the clients according to a plan"""
+    for p in plan:
+        if p.visible:
+            p.client.place(p.x, p.y, p.width, p.height, p.borderwidth,
+                           p.bordercolor, margin=p.margin)
+            p.client.unhide()
+        else:
+            p.client.hide()
+
+
 class Layout(command.CommandObject, configurable.Configurable, metaclass=ABCMeta):
     """This class defines the API that should be exposed by all layouts"""
     @classmethod
@@ -53,8 +93,27 @@ class Layout(command.CommandObject, configurable.Configurable, metaclass=ABCMeta
 
     def layout(self, windows, screen):
         assert windows, "let's eliminate unnecessary calls"
-        for i in windows:
-            self.configure(i, screen)
+        plan = self.plan(windows, screen)
+        if plan is None:
+            for i in windows:
+                self.configure(i, screen)
+        else:
+            apply_plan(plan)
+
+    def plan(self, windows, screen):
+        """Compute the placement of all windows in one pass
+
+        Layouts which can compute the geometry of all their windows at once
+        should return a list of ``Placement``, one for each of the windows.
+        This lets them derive shared state (e.g. the index of each client) once
+        per layout pass instead of once per window. The default returns None,
+        in which case ``configure()`` is called for each window instead.
+        """
+        return None
+
+    def _configure_from_plan(self, client, screen):
+        """configure() for layouts implementing plan()"""
+        apply_plan(p for p in self.plan([client], screen) if p.client is client)
 
     def finalize(self):
         pass
@@ -363,11 +422,25 @@ class _ClientList:
     whereas 'current_client' property can be used with clients directly.
 
     The collection implements focus_xxx methods as desired for Group.
+
+    The position of each client is indexed, so that membership tests and
+    lookups don't scan the list. The index is rebuilt on the first lookup
+    after the order changed, so 'clients' must only be changed through the
+    methods of the collection.
     """
 
     def __init__(self):
         self._current_idx = 0
         self.clients = []
+        self._positions = {}
+
+    def _changed(self):
+        self._positions = None
+
+    def _index(self):
+        if self._positions is None:
+            self._positions = {c: i for i, c in enumerate(self.clients)}
+        return self._positions
 
     @property
     def current_index(self):
@@ -389,7 +462,7 @@ class _ClientList:
 
     @current_client.setter
     def current_client(self, client):
-        self._current_idx = self.clients.index(client)
+        self._current_idx = self.index(client)
 
     def focus(self, client):
         """
@@ -442,30 +515,39 @@ class _ClientList:
         pos = max(0, self._current_idx + offset_to_current)
         if pos < len(self.clients):
             self.clients.insert(pos, client)
+            self._changed()
         else:
-            self.clients.append(client)
-        self.current_client = client
+            self.append(client)
+            pos = len(self.clients) - 1
+        self._current_idx = pos
 
     def append_head(self, client):
         """
         Append the given client in front of list.
         """
         self.clients.insert(0, client)
+        self._changed()
 
     def append(self, client):
         """
         Append the given client to the end of the collection.
         """
         self.clients.append(client)
+        if self._positions is not None:
+            self._positions[client] = len(self.clients) - 1
 
     def remove(self, client):
         """
         Remove the given client from collection.
         """
-        if client not in self.clients:
+        if client not in self:
             return
-        idx = self.clients.index(client)
+        idx = self.index(client)
         del self.clients[idx]
+        if idx == len(self.clients):
+            del self._positions[client]
+        else:
+            self._changed()
         if len(self) == 0:
             self._current_idx = 0
         elif idx <= self._current_idx:
@@ -479,6 +561,7 @@ class _ClientList:
         """
         if len(self.clients) > 1:
             self.clients.append(self.clients.pop(0))
+            self._changed()
             if maintain_index:
                 self.current_index -= 1
 
@@ -490,6 +573,7 @@ class _ClientList:
         """
         if len(self.clients) > 1:
             self.clients.insert(0, self.clients.pop())
+            self._changed()
             if maintain_index:
                 self.current_index += 1
 
@@ -500,9 +584,9 @@ class _ClientList:
         In case of 1, the first client c1 is focused, in case of 2 the c2 and
         the current_index is not changed otherwise.
         """
-        i1 = self.clients.index(c1)
-        i2 = self.clients.index(c2)
-        self.clients[i1], self.clients[i2] = self.clients[i2], self.clients[i1]
+        i1 = self.index(c1)
+        i2 = self.index(c2)
+        self[i1], self[i2] = self.clients[i2], self.clients[i1]
         if focus == 1:
             self.current_index = i1
         elif focus == 2:
@@ -516,7 +600,7 @@ class _ClientList:
         """
         idx = self._current_idx
         if idx > 0:
-            self.clients[idx], self.clients[idx - 1] = self[idx - 1], self[idx]
+            self[idx], self[idx - 1] = self[idx - 1], self[idx]
             if maintain_index:
                 self.current_index -= 1
 
@@ -528,7 +612,7 @@ class _ClientList:
         """
         idx = self._current_idx
         if idx + 1 < len(self.clients):
-            self.clients[idx], self.clients[idx + 1] = self[idx + 1], self[idx]
+            self[idx], self[idx + 1] = self[idx + 1], self[idx]
             if maintain_index:
                 self.current_index += 1
 
@@ -543,9 +627,13 @@ class _ClientList:
                             self.clients[pos::])
         else:
             self.clients.extend(other.clients)
+        self._changed()
 
     def index(self, client):
-        return self.clients.index(client)
+        try:
+            return self._index()[client]
+        except KeyError:
+            raise ValueError("%r is not in the collection" % client) from None
 
     def __len__(self):
         return len(self.clients)
@@ -556,11 +644,16 @@ class _ClientList:
         except IndexError:
             return None
 
+    def __setitem__(self, i, client):
+        self.clients[i] = client
+        if self._positions is not None:
+            self._positions[client] = i % len(self.clients)
+
     def __iter__(self):
         return self.clients.__iter__()
 
     def __contains__(self, client):
-        return client in self.clients
+        return client in self._index()
 
     def __str__(self):
         curr = self.current_client
@@ -15,7 +15,7 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-from .base import Layout
+from .base import Layout, Placement
 
 
 class _BspNode():
@@ -28,6 +28,10 @@ class _BspNode():
         self.x = self.y = 0
         self.w = 16
         self.h = 9
+        # distance to the nearest leaf below this node
+        self.shortest = 0
+        # whether the geometry of this subtree has to be computed again
+        self.dirty = True
 
     def __iter__(self):
         yield self
@@ -43,16 +47,42 @@ class _BspNode():
                 for c in child.clients():
                     yield c
 
-    def _shortest(self, l):
-        if len(self.children) == 0:
-            return self, l
-        else:
-            c0, l0 = self.children[0]._shortest(l + 1)
-            c1, l1 = self.children[1]._shortest(l + 1)
-            return (c1, l1) if l1 < l0 else (c0, l0)
-
     def get_shortest(self):
-        return self._shortest(0)[0]
+        node = self
+        while node.children:
+            c0, c1 = node.children
+            node = c1 if c1.shortest < c0.shortest else c0
+        return node
+
+    def edge_leaf(self, last=False):
+        """The first or last leaf of this subtree"""
+        node = self
+        while node.children:
+            node = node.children[-1 if last else 0]
+        return node
+
+    def neighbor_leaf(self, after=True):
+        """The leaf after or before this one, in the order of clients()"""
+        child = self
+        parent = self.parent
+        while parent is not None:
+            if parent.children[0 if after else 1] is child:
+                return parent.children[1 if after else 0].edge_leaf(last=not after)
+            child = parent
+            parent = child.parent
+        return None
+
+    def invalidate(self):
+        """Update the cached distance to the nearest leaf of this node and its
+        ancestors, and compute their geometry again on the next layout"""
+        node = self
+        while node is not None:
+            if node.children:
+                node.shortest = min(c.shortest for c in node.children) + 1
+            else:
+                node.shortest = 0
+            node.dirty = True
+            node = node.parent
 
     def insert(self, client, idx, ratio):
         if self.client is None:
@@ -63,6 +93,7 @@ class _BspNode():
         self.children[idx].client = client
         self.client = None
         self.split_horizontal = True if self.w > self.h * ratio else False
+        self.invalidate()
         return self.children[idx]
 
     def remove(self, child):
@@ -73,6 +104,7 @@ class _BspNode():
         self.split_horizontal = keep.split_horizontal
         self.split_ratio = keep.split_ratio
         self.client = keep.client
+        self.invalidate()
         return self
 
     def distribute(self):
@@ -91,6 +123,10 @@ class _BspNode():
         return h, v
 
     def calc_geom(self, x, y, w, h):
+        # only the subtrees which changed or moved are computed again
+        if not self.dirty and (x, y, w, h) == (self.x, self.y, self.w, self.h):
+            return
+        self.dirty = False
         self.x = x
         self.y = y
         self.w = w
@@ -160,11 +196,13 @@ class Bsp(Layout):
         self.add_defaults(Bsp.defaults)
         self.root = _BspNode()
         self.current = self.root
+        self._nodes = {}
 
     def clone(self, group):
         c = Layout.clone(self, group)
         c.root = _BspNode()
         c.current = c.root
+        c._nodes = {}
         return c
 
     def info(self):
@@ -173,9 +211,7 @@ class Bsp(Layout):
             clients=[c.name for c in self.root.clients()])
 
     def get_node(self, client):
-        for node in self.root:
-            if client is node.client:
-                return node
+        return self._nodes.get(client)
 
     def focus(self, client):
         self.current = self.get_node(client)
@@ -183,12 +219,17 @@ class Bsp(Layout):
     def add(self, client):
         node = self.root.get_shortest() if self.fair else self.current
         self.current = node.insert(client, int(self.lower_right), self.ratio)
+        for leaf in [node] + node.children:
+            if leaf.client is not None:
+                self._nodes[leaf.client] = leaf
 
     def remove(self, client):
-        node = self.get_node(client)
+        node = self._nodes.pop(client, None)
         if node:
             if node.parent:
                 node = node.parent.remove(node)
+                if node.client is not None:
+                    self._nodes[node.client] = node
                 newclient = next(node.clients(), None)
                 if newclient is None:
                     self.current = self.root
@@ -198,56 +239,66 @@ class Bsp(Layout):
             node.client = None
             self.current = self.root
 
-    def configure(self, client, screen):
+    def plan(self, windows, screen):
         self.root.calc_geom(screen.x, screen.y, screen.width,
                             screen.height)
-        node = self.get_node(client)
-        color = self.group.qtile.color_pixel(
-            self.border_focus if client.has_focus else self.border_normal)
-        border = 0 if node is self.root else self.border_width
-        client.place(
-            node.x,
-            node.y,
-            node.w - 2 * border,
-            node.h - 2 * border,
-            border,
-            color,
-            margin=self.margin)
-        client.unhide()
+        focus = self.group.qtile.color_pixel(self.border_focus)
+        normal = self.group.qtile.color_pixel(self.border_normal)
+        plan = []
+        for client in windows:
+            node = self._nodes.get(client)
+            if node is None:
+                plan.append(Placement(client, visible=False))
+                continue
+            border = 0 if node is self.root else self.border_width
+            plan.append(Placement(
+                client,
+                node.x,
+                node.y,
+                node.w - 2 * border,
+                node.h - 2 * border,
+                border,
+                focus if client.has_focus else normal,
+                margin=self.margin,
+            ))
+        return plan
+
+    def configure(self, client, screen):
+        self._configure_from_plan(client, screen)
 
     def cmd_toggle_split(self):
         if self.current.parent:
             self.current.parent.split_horizontal = not self.current.parent.split_horizontal
+            self.current.parent.invalidate()
         self.group.layout_all()
 
     def focus_first(self):
-        return next(self.root.clients(), None)
+        return self.root.edge_leaf().client
 
     def focus_last(self):
-        clients = list(self.root.clients())
-        return clients[-1] if len(clients) else None
+        return self.root.edge_leaf(last=True).client
 
     def focus_next(self, client):
-        clients = list(self.root.clients())
-        if client in clients:
-            idx = clients.index(client)
-            if idx + 1 < len(clients):
-                return clients[idx + 1]
+        node = self._nodes.get(client)
+        if node:
+            node = node.neighbor_leaf()
+            if node:
+                return node.client
 
     def focus_previous(self, client):
-        clients = list(self.root.clients())
-        if client in clients:
-            idx = clients.index(client)
-            if idx > 0:
-                return clients[idx - 1]
+        node = self._nodes.get(client)
+        if node:
+            node = node.neighbor_leaf(after=False)
+            if node:
+                return node.client
 
     def cmd_next(self):
-        client = self.focus_next(self.current)
+        client = self.focus_next(self.current.client)
         if client:
             self.group.focus(client, True)
 
     def cmd_previous(self):
-        client = self.focus_previous(self.current)
+        client = self.focus_previous(self.current.client)
         if client:
             self.group.focus(client, True)
 
@@ -335,77 +386,58 @@ class Bsp(Layout):
         if node:
             self.group.focus(node.client, True)
 
+    def _swap(self, node):
+        """Exchange the clients of the current node and node"""
+        node.client, self.current.client = self.current.client, node.client
+        self._nodes[node.client] = node
+        self._nodes[self.current.client] = self.current
+        self.current = node
+        self.group.layout_all()
+
+    def _move_to_edge(self, split_horizontal, first):
+        """Split the whole screen between the current client and all the
+        others, the current client taking the first or second part"""
+        node = self.current
+        client = node.client
+        self.remove(client)
+        newroot = _BspNode()
+        newroot.split_horizontal = split_horizontal
+        newroot.children = [node, self.root] if first else [self.root, node]
+        self.root.parent = newroot
+        node.parent = newroot
+        self.root = newroot
+        newroot.invalidate()
+        self._nodes[client] = node
+        self.current = node
+        self.group.layout_all()
+
     def cmd_shuffle_left(self):
         node = self.find_left()
         if node:
-            node.client, self.current.client = self.current.client, node.client
-            self.current = node
-            self.group.layout_all()
+            self._swap(node)
         elif self.current is not self.root:
-            node = self.current
-            self.remove(node.client)
-            newroot = _BspNode()
-            newroot.split_horizontal = True
-            newroot.children = [node, self.root]
-            self.root.parent = newroot
-            node.parent = newroot
-            self.root = newroot
-            self.current = node
-            self.group.layout_all()
+            self._move_to_edge(True, True)
 
     def cmd_shuffle_right(self):
         node = self.find_right()
         if node:
-            node.client, self.current.client = self.current.client, node.client
-            self.current = node
-            self.group.layout_all()
+            self._swap(node)
         elif self.current is not self.root:
-            node = self.current
-            self.remove(node.client)
-            newroot = _BspNode()
-            newroot.split_horizontal = True
-            newroot.children = [self.root, node]
-            self.root.parent = newroot
-            node.parent = newroot
-            self.root = newroot
-            self.current = node
-            self.group.layout_all()
+            self._move_to_edge(True, False)
 
     def cmd_shuffle_up(self):
         node = self.find_up()
         if node:
-            node.client, self.current.client = self.current.client, node.client
-            self.current = node
-            self.group.layout_all()
+            self._swap(node)
         elif self.current is not self.root:
-            node = self.current
-            self.remove(node.client)
-            newroot = _BspNode()
-            newroot.split_horizontal = False
-            newroot.children = [node, self.root]
-            self.root.parent = newroot
-            node.parent = newroot
-            self.root = newroot
-            self.current = node
-            self.group.layout_all()
+            self._move_to_edge(False, True)
 
     def cmd_shuffle_down(self):
         node = self.find_down()
         if node:
-            node.client, self.current.client = self.current.client, node.client
-            self.current = node
-            self.group.layout_all()
+            self._swap(node)
         elif self.current is not self.root:
-            node = self.current
-            self.remove(node.client)
-            newroot = _BspNode()
-            newroot.split_horizontal = False
-            newroot.children = [self.root, node]
-            self.root.parent = newroot
-            node.parent = newroot
-            self.root = newroot
-            self.current = node
-            self.group.layout_all()
+            self._move_to_edge(False, False)
 
     def cmd_grow_left(self):
         child = self.current
@@ -414,6 +446,7 @@ class Bsp(Layout):
             if parent.split_horizontal and child is parent.children[1]:
                 parent.split_ratio = max(5,
                                          parent.split_ratio - self.grow_amount)
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -426,6 +459,7 @@ class Bsp(Layout):
             if parent.split_horizontal and child is parent.children[0]:
                 parent.split_ratio = min(95,
                                          parent.split_ratio + self.grow_amount)
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -438,6 +472,7 @@ class Bsp(Layout):
             if not parent.split_horizontal and child is parent.children[1]:
                 parent.split_ratio = max(5,
                                          parent.split_ratio - self.grow_amount)
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -450,6 +485,7 @@ class Bsp(Layout):
             if not parent.split_horizontal and child is parent.children[0]:
                 parent.split_ratio = min(95,
                                          parent.split_ratio + self.grow_amount)
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -461,6 +497,7 @@ class Bsp(Layout):
         while parent:
             if parent.split_horizontal and child is parent.children[1]:
                 parent.children = parent.children[::-1]
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -472,6 +509,7 @@ class Bsp(Layout):
         while parent:
             if parent.split_horizontal and child is parent.children[0]:
                 parent.children = parent.children[::-1]
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -483,6 +521,7 @@ class Bsp(Layout):
         while parent:
             if not parent.split_horizontal and child is parent.children[1]:
                 parent.children = parent.children[::-1]
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -494,6 +533,7 @@ class Bsp(Layout):
         while parent:
             if not parent.split_horizontal and child is parent.children[0]:
                 parent.children = parent.children[::-1]
+                parent.invalidate()
                 self.group.layout_all()
                 break
             child = parent
@@ -502,6 +542,7 @@ class Bsp(Layout):
     def cmd_normalize(self):
         distribute = True
         for node in self.root:
+            node.dirty = True
             if node.split_ratio != 50:
                 node.split_ratio = 50
                 distribute = False
@@ -15,7 +15,7 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-from .base import Layout, _ClientList
+from .base import Layout, Placement, _ClientList
 
 
 class _Column(_ClientList):
@@ -128,10 +128,13 @@ class Columns(Layout):
         self.add_defaults(Columns.defaults)
         self.columns = [_Column(self.split, self.insert_position)]
         self.current = 0
+        # the column of each client
+        self._client_column = {}
 
     def clone(self, group):
         c = Layout.clone(self, group)
         c.columns = [_Column(self.split, self.insert_position)]
+        c._client_column = {}
         return c
 
     def info(self):
@@ -146,11 +149,10 @@ class Columns(Layout):
         return d
 
     def focus(self, client):
-        for i, c in enumerate(self.columns):
-            if client in c:
-                c.focus(client)
-                self.current = i
-                break
+        col = self._client_column.get(client)
+        if col is not None:
+            col.focus(client)
+            self.current = self.columns.index(col)
 
     @property
     def cc(self):
@@ -188,70 +190,67 @@ class Columns(Layout):
                 c = least
         self.current = self.columns.index(c)
         c.add(client)
+        self._client_column[client] = c
 
     def remove(self, client):
-        remove = None
-        for c in self.columns:
-            if client in c:
-                c.remove(client)
-                if len(c) == 0 and len(self.columns) > 1:
-                    remove = c
-                break
-        if remove is not None:
-            self.remove_column(c)
+        c = self._client_column.pop(client, None)
+        if c is not None:
+            c.remove(client)
+            if len(c) == 0 and len(self.columns) > 1:
+                self.remove_column(c)
         return self.columns[self.current].cw
 
-    def configure(self, client, screen):
+    def plan(self, windows, screen):
+        # the geometry of every shown client, computed column by column
+        shown = {}
+        ncols = len(self.columns)
         pos = 0
         for col in self.columns:
-            if client in col:
-                break
+            if ncols == 1 and (len(col) == 1 or not col.split):
+                border = 0
+            else:
+                border = self.border_width
+            width = int(0.5 + col.width * screen.width * 0.01 / ncols)
+            x = screen.x + int(0.5 + pos * screen.width * 0.01 / ncols)
             pos += col.width
-        else:
-            client.hide()
-            return
-        if client.has_focus:
-            color = self.group.qtile.color_pixel(self.border_focus if col.split
-                                                 else self.border_focus_stack)
-        else:
-            color = self.group.qtile.color_pixel(self.border_normal if col.split
-                                                 else self.border_normal_stack)
-        if len(self.columns) == 1 and (len(col) == 1 or not col.split):
-            border = 0
-        else:
-            border = self.border_width
-        width = int(0.5 + col.width * screen.width * 0.01 / len(self.columns))
-        x = screen.x + int(0.5 + pos * screen.width * 0.01 / len(self.columns))
-        if col.split:
-            pos = 0
-            for c in col:
-                if client == c:
-                    break
-                pos += col.heights[c]
-            height = int(
-                0.5 + col.heights[client] * screen.height * 0.01 / len(col))
-            y = screen.y + int(0.5 + pos * screen.height * 0.01 / len(col))
-            client.place(
+            if col.split:
+                ypos = 0
+                for c in col:
+                    height = int(
+                        0.5 + col.heights[c] * screen.height * 0.01 / len(col))
+                    y = screen.y + int(0.5 + ypos * screen.height * 0.01 / len(col))
+                    ypos += col.heights[c]
+                    shown[c] = (col, x, y, width, height, border)
+            elif col.cw is not None:
+                shown[col.cw] = (col, x, screen.y, width, screen.height, border)
+
+        color_pixel = self.group.qtile.color_pixel
+        plan = []
+        for client in windows:
+            if client not in shown:
+                plan.append(Placement(client, visible=False))
+                continue
+            col, x, y, width, height, border = shown[client]
+            if client.has_focus:
+                color = color_pixel(self.border_focus if col.split
+                                    else self.border_focus_stack)
+            else:
+                color = color_pixel(self.border_normal if col.split
+                                    else self.border_normal_stack)
+            plan.append(Placement(
+                client,
                 x,
                 y,
                 width - 2 * border,
                 height - 2 * border,
                 border,
                 color,
-                margin=self.margin)
-            client.unhide()
-        elif client == col.cw:
-            client.place(
-                x,
-                screen.y,
-                width - 2 * border,
-                screen.height - 2 * border,
-                border,
-                color,
-                margin=self.margin)
-            client.unhide()
-        else:
-            client.hide()
+                margin=self.margin,
+            ))
+        return plan
+
+    def configure(self, client, screen):
+        self._configure_from_plan(client, screen)
 
     def focus_first(self):
         """Returns first client in first column of layout"""
@@ -266,30 +265,30 @@ class Columns(Layout):
     def focus_next(self, win):
         """Returns the next client after 'win' in layout,
            or None if there is no such client"""
+        col = self._client_column.get(win)
+        if col is None:
+            return None
         # First: try to get next window in column of win
-        for idx, col in enumerate(self.columns):
-            if win in col:
-                nxt = col.focus_next(win)
-                if nxt:
-                    return nxt
-                else:
-                    break
+        nxt = col.focus_next(win)
+        if nxt:
+            return nxt
         # if there was no next, get first client from next column
+        idx = self.columns.index(col)
         if idx + 1 < len(self.columns):
             return self.columns[idx + 1].focus_first()
 
     def focus_previous(self, win):
         """Returns the client previous to 'win' in layout.
            or None if there is no such client"""
+        col = self._client_column.get(win)
+        if col is None:
+            return None
         # First: try to focus previous client in column
-        for idx, col in enumerate(self.columns):
-            if win in col:
-                prev = col.focus_previous(win)
-                if prev:
-                    return prev
-                else:
-                    break
+        prev = col.focus_previous(win)
+        if prev:
+            return prev
         # If there was no previous, get last from previous column
+        idx = self.columns.index(col)
         if idx > 0:
             return self.columns[idx - 1].focus_last()
 
@@ -347,12 +346,14 @@ class Columns(Layout):
             new = self.cc
             new.add(client, cur.heights[client])
             cur.remove(client)
+            self._client_column[client] = new
             if len(cur) == 0:
                 self.remove_column(cur)
         elif len(cur) > 1:
             new = self.add_column(True)
             new.add(client, cur.heights[client])
             cur.remove(client)
+            self._client_column[client] = new
             self.current = 0
         else:
             return
@@ -368,12 +369,14 @@ class Columns(Layout):
             new = self.cc
             new.add(client, cur.heights[client])
             cur.remove(client)
+            self._client_column[client] = new
             if len(cur) == 0:
                 self.remove_column(cur)
         elif len(cur) > 1:
             new = self.add_column()
             new.add(client, cur.heights[client])
             cur.remove(client)
+            self._client_column[client] = new
             self.current = len(self.columns) - 1
         else:
             return
@@ -29,7 +29,7 @@
 
 import math
 
-from .base import _SimpleLayoutBase
+from .base import Placement, _SimpleLayoutBase
 
 
 ROWCOL = 1  # do rows at a time left to right top down
@@ -237,7 +237,7 @@ class RatioTile(_SimpleLayoutBase):
         self.dirty = True
         return _SimpleLayoutBase.remove(self, w)
 
-    def configure(self, win, screen):
+    def _update_layout_info(self, screen):
         # force recalc
         if not self.last_screen or self.last_screen != screen:
             self.last_screen = screen
@@ -267,26 +267,33 @@ class RatioTile(_SimpleLayoutBase):
             )
 
             self.dirty = False
-        try:
-            idx = self.clients.index(win)
-        except ValueError:
-            win.hide()
-            return
-        x, y, w, h = self.layout_info[idx]
-        if win.has_focus:
-            bc = self.group.qtile.color_pixel(self.border_focus)
-        else:
-            bc = self.group.qtile.color_pixel(self.border_normal)
-        win.place(
-            x,
-            y,
-            w - self.border_width * 2,
-            h - self.border_width * 2,
-            self.border_width,
-            bc,
-            margin=self.margin,
-        )
-        win.unhide()
+
+    def configure(self, win, screen):
+        self._configure_from_plan(win, screen)
+
+    def plan(self, windows, screen):
+        self._update_layout_info(screen)
+        wanted = set(windows)
+        plan = []
+        focus = self.group.qtile.color_pixel(self.border_focus)
+        normal = self.group.qtile.color_pixel(self.border_normal)
+        for idx, win in enumerate(self.clients):
+            if win not in wanted:
+                continue
+            wanted.discard(win)
+            x, y, w, h = self.layout_info[idx]
+            plan.append(Placement(
+                win,
+                x,
+                y,
+                w - self.border_width * 2,
+                h - self.border_width * 2,
+                self.border_width,
+                focus if win.has_focus else normal,
+                margin=self.margin,
+            ))
+        plan.extend(Placement(c, visible=False) for c in wanted)
+        return plan
 
     def info(self):
         d = _SimpleLayoutBase.info(self)
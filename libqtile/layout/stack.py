@@ -70,6 +70,8 @@ class Stack(Layout):
         self.add_defaults(Stack.defaults)
         self.stacks = [_WinStack(autosplit=self.autosplit)
                        for i in range(self.num_stacks)]
+        # the stack of each client
+        self._client_stack = {}
 
     @property
     def current_stack(self):
@@ -77,10 +79,10 @@ class Stack(Layout):
 
     @property
     def current_stack_offset(self):
-        for i, s in enumerate(self.stacks):
-            if self.group.current_window in s:
-                return i
-        return 0
+        stack = self._client_stack.get(self.group.current_window)
+        if stack is None:
+            return 0
+        return self.stacks.index(stack)
 
     @property
     def clients(self):
@@ -93,6 +95,7 @@ class Stack(Layout):
         c = Layout.clone(self, group)
         # These are mutable
         c.stacks = [_WinStack(autosplit=self.autosplit) for i in self.stacks]
+        c._client_stack = {}
         return c
 
     def _find_next(self, lst, offset):
@@ -111,6 +114,8 @@ class Stack(Layout):
             self.stacks.remove(s)
             off = min(off, len(self.stacks) - 1)
             self.stacks[off].join(s, 1)
+            for client in s:
+                self._client_stack[client] = self.stacks[off]
             if self.stacks[off]:
                 self.group.focus(
                     self.stacks[off].cw,
@@ -134,9 +139,9 @@ class Stack(Layout):
             self.group.focus(n.cw, True)
 
     def focus(self, client):
-        for i in self.stacks:
-            if client in i:
-                i.focus(client)
+        stack = self._client_stack.get(client)
+        if stack is not None:
+            stack.focus(client)
 
     def focus_first(self):
         for i in self.stacks:
@@ -149,52 +154,47 @@ class Stack(Layout):
                 return i.focus_last()
 
     def focus_next(self, client):
-        iterator = iter(self.stacks)
-        for i in iterator:
-            if client in i:
-                next = i.focus_next(client)
-                if next:
-                    return next
-                break
-        else:
+        stack = self._client_stack.get(client)
+        if stack is None:
             return
+        next = stack.focus_next(client)
+        if next:
+            return next
 
-        for i in iterator:
+        for i in self.stacks[self.stacks.index(stack) + 1:]:
             if i:
                 return i.focus_first()
 
     def focus_previous(self, client):
-        iterator = iter(reversed(self.stacks))
-        for i in iterator:
-            if client in i:
-                next = i.focus_previous(client)
-                if next:
-                    return next
-                break
-        else:
+        stack = self._client_stack.get(client)
+        if stack is None:
             return
+        next = stack.focus_previous(client)
+        if next:
+            return next
 
-        for i in iterator:
+        for i in reversed(self.stacks[:self.stacks.index(stack)]):
             if i:
                 return i.focus_last()
 
     def add(self, client):
         for i in self.stacks:
             if not i:
-                i.add(client)
-                return
-        if self.fair:
-            target = min(self.stacks, key=len)
-            target.add(client)
+                target = i
+                break
         else:
-            self.current_stack.add(client)
+            if self.fair:
+                target = min(self.stacks, key=len)
+            else:
+                target = self.current_stack
+        target.add(client)
+        self._client_stack[client] = target
 
     def remove(self, client):
         current_offset = self.current_stack_offset
-        for i in self.stacks:
-            if client in i:
-                i.remove(client)
-                break
+        stack = self._client_stack.pop(client, None)
+        if stack is not None:
+            stack.remove(client)
         if self.stacks[current_offset].cw:
             return self.stacks[current_offset].cw
         else:
@@ -206,12 +206,11 @@ class Stack(Layout):
                 return n.cw
 
     def configure(self, client, screen):
-        for i, s in enumerate(self.stacks):
-            if client in s:
-                break
-        else:
+        s = self._client_stack.get(client)
+        if s is None:
             client.hide()
             return
+        i = self.stacks.index(s)
 
         if client.has_focus:
             px = self.group.qtile.color_pixel(self.border_focus)
@@ -328,6 +327,7 @@ class Stack(Layout):
         self.current_stack.remove(win)
         self.stacks[next].add(win)
         self.stacks[next].focus(win)
+        self._client_stack[win] = self.stacks[next]
         self.group.layout_all()
 
     def cmd_info(self):
@@ -30,7 +30,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .base import _SimpleLayoutBase
+from .base import Placement, _SimpleLayoutBase
 
 
 class Tile(_SimpleLayoutBase):
@@ -109,39 +109,43 @@ class Tile(_SimpleLayoutBase):
         self.reset_master()
 
     def configure(self, client, screen):
-        screen_width = screen.width
-        screen_height = screen.height
+        self._configure_from_plan(client, screen)
+
+    def plan(self, windows, screen):
+        wanted = set(windows)
+        plan = []
         border_width = self.border_width
-        if self.clients and client in self.clients:
-            pos = self.clients.index(client)
-            if client in self.master_windows:
-                w = int(screen_width * self.ratio) \
-                    if len(self.slave_windows) or not self.expand \
-                    else screen_width
-                h = screen_height // self.master
+        focus = self.group.qtile.color_pixel(self.border_focus)
+        normal = self.group.qtile.color_pixel(self.border_normal)
+        nmaster = min(self.master, len(self.clients))
+        nslave = len(self.clients) - nmaster
+        ratio_width = int(screen.width * self.ratio)
+        for pos, client in enumerate(self.clients):
+            if client not in wanted:
+                continue
+            wanted.discard(client)
+            if pos < nmaster:
+                w = ratio_width if nslave or not self.expand else screen.width
+                h = screen.height // self.master
                 x = screen.x
                 y = screen.y + pos * h
             else:
-                w = screen_width - int(screen_width * self.ratio)
-                h = screen_height // (len(self.slave_windows))
-                x = screen.x + int(screen_width * self.ratio)
-                y = screen.y + self.clients[self.master:].index(client) * h
-            if client.has_focus:
-                bc = self.group.qtile.color_pixel(self.border_focus)
-            else:
-                bc = self.group.qtile.color_pixel(self.border_normal)
-            client.place(
+                w = screen.width - ratio_width
+                h = screen.height // nslave
+                x = screen.x + ratio_width
+                y = screen.y + (pos - nmaster) * h
+            plan.append(Placement(
+                client,
                 x,
                 y,
                 w - border_width * 2,
                 h - border_width * 2,
                 border_width,
-                bc,
+                focus if client.has_focus else normal,
                 margin=self.margin,
-            )
-            client.unhide()
-        else:
-            client.hide()
+            ))
+        plan.extend(Placement(c, visible=False) for c in wanted)
+        return plan
 
     def info(self):
         d = _SimpleLayoutBase.info(self)
@@ -254,29 +254,9 @@ class Window(TreeNode):
     def draw(self, layout, top, level=0):
         self._title_top = top
 
-        # setup parameters for drawing self
         left = layout.padding_left + level * layout.level_shift
-        layout._layout.font_size = layout.fontsize
-        layout._layout.text = self.add_superscript(self.window.name)
-        if self.window is layout._focused:
-            fg = layout.active_fg
-            bg = layout.active_bg
-        else:
-            fg = layout.inactive_fg
-            bg = layout.inactive_bg
-        layout._layout.colour = fg
-        layout._layout.width = layout.panel_width - left
-        # get a text frame from the above
-        framed = layout._layout.framed(
-            layout.border_width,
-            bg,
-            layout.padding_x,
-            layout.padding_y
-        )
-        # draw the text frame at the given point
-        framed.draw_fill(left, top)
-
-        top += framed.height + layout.vspace + layout.border_width
+        top += layout._draw_row(self, left, top) + layout.vspace + \
+            layout.border_width
 
         # run the TreeNode draw to draw children (if expanded)
         return super().draw(layout, top, level + 1)
@@ -352,12 +332,27 @@ class TreeTab(Layout):
         self._layout = None
         self._tree = Root(self.sections)
         self._nodes = {}
+        # node -> (text layout, title) of each Window node, kept while the
+        # drawer lives
+        self._row_layouts = {}
+        # node -> (title, focused, left, height) of the rows last drawn
+        self._rows = {}
+        self._panel_rect = None
+        # whether the tree changed since the panel was drawn
+        self._dirty = False
 
     def clone(self, group):
         c = Layout.clone(self, group)
         c._focused = None
         c._panel = None
+        c._drawer = None
+        c._layout = None
         c._tree = Root(self.sections)
+        c._nodes = {}
+        c._row_layouts = {}
+        c._rows = {}
+        c._panel_rect = None
+        c._dirty = False
         return c
 
     def _get_window(self):
@@ -398,6 +393,7 @@ class TreeTab(Layout):
         else:
             node = self._tree.add(win)
         self._nodes[win] = node
+        self._dirty = True
 
     def remove(self, win):
         if win not in self._nodes:
@@ -411,8 +407,11 @@ class TreeTab(Layout):
         if self._focused is win:
             self._focused = None
 
-        self._nodes[win].remove()
-        del self._nodes[win]
+        node = self._nodes.pop(win)
+        node.remove()
+        cached = self._row_layouts.pop(node, None)
+        if cached is not None:
+            cached[0].finalize()
         self.draw_panel()
 
     def _create_panel(self):
@@ -423,23 +422,96 @@ class TreeTab(Layout):
             self.panel_width,
             100
         )
-        self._create_drawer()
         self._panel.handle_Expose = self._handle_Expose
         self._panel.handle_ButtonPress = self._handle_ButtonPress
         self.group.qtile.windows_map[self._panel.window.wid] = self._panel
-        hook.subscribe.client_name_updated(self.draw_panel)
-        hook.subscribe.focus_change(self.draw_panel)
+        hook.subscribe.client_name_updated(self._handle_name_updated)
+        hook.subscribe.focus_change(self._update_panel)
 
     def _handle_Expose(self, e):  # noqa: N802
-        self.draw_panel()
+        # the last of a series of expose events
+        if e.count == 0:
+            self.draw_panel()
+
+    def _handle_name_updated(self, win):
+        if win in self._nodes:
+            self._update_panel()
+
+    def _panel_shown(self):
+        return self._drawer is not None and self.group.screen is not None and \
+            self.group.layout is self
 
     def draw_panel(self, *args):
-        if not self._panel:
+        if self._drawer is None:
             return
+        self._dirty = False
+        self._rows = {}
         self._drawer.clear(self.bg_color)
         self._tree.draw(self, 0)
         self._drawer.draw(offsetx=0, width=self.panel_width)
 
+    def _update_panel(self, *args):
+        """Repaint the rows whose title or focus changed
+
+        Events for panels which are not shown are ignored, the panel is
+        redrawn when it is exposed again.
+        """
+        if not self._panel_shown():
+            return
+        changed = False
+        for node, (title, focused, left, height) in list(self._rows.items()):
+            if title == node.add_superscript(node.window.name) and \
+                    focused == (node.window is self._focused):
+                continue
+            top = node._title_top
+            self._drawer.set_source_rgb(self.bg_color)
+            self._drawer.fillrect(0, top, self.panel_width, height, 0)
+            if self._draw_row(node, left, top) != height:
+                # the rows below moved
+                self.draw_panel()
+                return
+            changed = True
+        if changed:
+            self._drawer.draw(offsetx=0, width=self.panel_width)
+
+    def _draw_row(self, node, left, top):
+        """Draw the title of a Window node, returns the height of the row"""
+        title = node.add_superscript(node.window.name)
+        focused = node.window is self._focused
+        cached = self._row_layouts.get(node)
+        if cached is None:
+            layout = self._drawer.textlayout(
+                title,
+                "ffffff",
+                self.font,
+                self.fontsize,
+                self.fontshadow,
+                wrap=False
+            )
+            self._row_layouts[node] = (layout, title)
+        else:
+            layout = cached[0]
+            if title != cached[1]:
+                layout.text = title
+                self._row_layouts[node] = (layout, title)
+        if focused:
+            fg = self.active_fg
+            bg = self.active_bg
+        else:
+            fg = self.inactive_fg
+            bg = self.inactive_bg
+        layout.colour = fg
+        layout.width = self.panel_width - left
+        framed = layout.framed(
+            self.border_width,
+            bg,
+            self.padding_x,
+            self.padding_y
+        )
+        framed.draw_fill(left, top)
+        self._rows[node] = (title, focused, left, framed.height)
+        return framed.height
+
     def _handle_ButtonPress(self, event):  # noqa: N802
         node = self._tree.button_press(event.event_x, event.event_y)
         if node:
@@ -459,8 +531,7 @@ class TreeTab(Layout):
 
     def finalize(self):
         Layout.finalize(self)
-        if self._drawer is not None:
-            self._drawer.finalize()
+        self._finalize_drawer()
 
     def info(self):
         d = Layout.info(self)
@@ -637,15 +708,15 @@ class TreeTab(Layout):
         self.panel_width -= 10
         self.group.layout_all()
 
-    def _create_drawer(self):
-        if self._drawer is None:
-            self._drawer = drawer.Drawer(
-                self.group.qtile,
-                self._panel.window.wid,
-                self.panel_width,
-                self.group.screen.dheight
-            )
+    def _create_drawer(self, width, height):
+        self._drawer = drawer.Drawer(
+            self.group.qtile,
+            self._panel.window.wid,
+            width,
+            height
+        )
         self._drawer.clear(self.bg_color)
+        # shared by the section titles
         self._layout = self._drawer.textlayout(
             "",
             "ffffff",
@@ -655,18 +726,35 @@ class TreeTab(Layout):
             wrap=False
         )
 
+    def _finalize_drawer(self):
+        for layout, _ in self._row_layouts.values():
+            layout.finalize()
+        self._row_layouts = {}
+        self._rows = {}
+        if self._layout is not None:
+            self._layout.finalize()
+            self._layout = None
+        if self._drawer is not None:
+            self._drawer.finalize()
+            self._drawer = None
+
     def layout(self, windows, screen):
         panel, body = screen.hsplit(self.panel_width)
         self._resize_panel(panel)
         Layout.layout(self, windows, body)
 
     def _resize_panel(self, rect):
-        if self._panel:
-            self._panel.place(
-                rect.x, rect.y,
-                rect.width, rect.height,
-                0,
-                None
-            )
-            self._create_drawer()
+        """Move the panel to rect, only redrawing it when needed"""
+        if not self._panel:
+            return
+        rect = (rect.x, rect.y, rect.width, rect.height)
+        if rect != self._panel_rect:
+            self._panel.place(*rect, 0, None)
+            old = self._panel_rect
+            self._panel_rect = rect
+            if old is None or old[2:] != rect[2:]:
+                self._finalize_drawer()
+                self._create_drawer(rect[2], rect[3])
+            self.draw_panel()
+        elif self._dirty:
             self.draw_panel()
@@ -33,7 +33,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .base import _SimpleLayoutBase
+from .base import Placement, _SimpleLayoutBase
 import math
 
 
@@ -266,40 +266,55 @@ class MonadTall(_SimpleLayoutBase):
 
     def configure(self, client, screen):
         "Position client based on order and sizes"
+        self._configure_from_plan(client, screen)
+
+    def plan(self, windows, screen):
+        "Position clients based on order and sizes"
         # if no sizes or normalize flag is set, normalize
         if not self.relative_sizes or self.do_normalize:
             self.cmd_normalize(False)
 
-        # if client not in this layout
-        if not self.clients or client not in self.clients:
-            client.hide()
-            return
-
-        # determine focus border-color
-        if client.has_focus:
-            px = self.group.qtile.color_pixel(self.border_focus)
-        else:
-            px = self.group.qtile.color_pixel(self.border_normal)
+        wanted = set(windows)
+        plan = []
+        focus = self.group.qtile.color_pixel(self.border_focus)
+        normal = self.group.qtile.color_pixel(self.border_normal)
 
         # single client - fullscreen
         if len(self.clients) == 1:
-            client.place(
-                self.group.screen.dx,
-                self.group.screen.dy,
-                self.group.screen.dwidth - 2 * self.single_border_width,
-                self.group.screen.dheight - 2 * self.single_border_width,
-                self.single_border_width,
-                px,
-                margin=self.single_margin,
-            )
-            client.unhide()
-            return
-        cidx = self.clients.index(client)
-        self._configure_specific(client, screen, px, cidx)
-        client.unhide()
-
-    def _configure_specific(self, client, screen, px, cidx):
-        """Specific configuration for xmonad tall."""
+            client = self.clients[0]
+            if client in wanted:
+                wanted.discard(client)
+                plan.append(Placement(
+                    client,
+                    self.group.screen.dx,
+                    self.group.screen.dy,
+                    self.group.screen.dwidth - 2 * self.single_border_width,
+                    self.group.screen.dheight - 2 * self.single_border_width,
+                    self.single_border_width,
+                    focus if client.has_focus else normal,
+                    margin=self.single_margin,
+                ))
+        elif self.clients:
+            # running sum of the relative sizes of the secondary clients
+            offset = 0
+            for cidx, client in enumerate(self.clients):
+                if client in wanted:
+                    wanted.discard(client)
+                    px = focus if client.has_focus else normal
+                    plan.append(self._plan_specific(client, px, cidx, offset))
+                if cidx > 0:
+                    offset += self.relative_sizes[cidx - 1]
+
+        # clients not in this layout
+        plan.extend(Placement(c, visible=False) for c in wanted)
+        return plan
+
+    def _plan_specific(self, client, px, cidx, offset):
+        """Specific configuration for xmonad tall.
+
+        offset is the sum of the relative sizes of the secondary clients
+        above this one.
+        """
         # calculate main/secondary pane size
         width_main = int(self.group.screen.dwidth * self.ratio)
         width_shared = self.group.screen.dwidth - width_main
@@ -326,9 +341,7 @@ class MonadTall(_SimpleLayoutBase):
             width = width_shared - 2 * self.border_width
             # ypos is the sum of all clients above it
             ypos = self.group.screen.dy + \
-                self._get_absolute_size_from_relative(
-                    sum(self.relative_sizes[:cidx - 1])
-                )
+                self._get_absolute_size_from_relative(offset)
             # get height from precalculated height list
             height = self._get_absolute_size_from_relative(
                 self.relative_sizes[cidx - 1]
@@ -338,7 +351,8 @@ class MonadTall(_SimpleLayoutBase):
                 ypos -= self.margin
                 height += self.margin
             # place client based on calculated dimensions
-            client.place(
+            return Placement(
+                client,
                 xpos,
                 ypos,
                 width,
@@ -350,7 +364,8 @@ class MonadTall(_SimpleLayoutBase):
         else:
             # main client
             width = width_main - 2 * self.border_width
-            client.place(
+            return Placement(
+                client,
                 xpos + self.margin,
                 self.group.screen.dy + self.margin,
                 width - self.margin,
@@ -855,8 +870,12 @@ class MonadWide(MonadTall):
         else:
             self._grow_secondary(maxed_size)
 
-    def _configure_specific(self, client, screen, px, cidx):
-        """Specific configuration for xmonad wide."""
+    def _plan_specific(self, client, px, cidx, offset):
+        """Specific configuration for xmonad wide.
+
+        offset is the sum of the relative sizes of the secondary clients left
+        of this one.
+        """
         # calculate main/secondary column widths
         height_main = int(self.group.screen.dheight * self.ratio)
         height_shared = self.group.screen.dheight - height_main
@@ -883,9 +902,7 @@ class MonadWide(MonadTall):
             height = height_shared - 2 * self.border_width
             # xpos is the sum of all clients left of it
             xpos = self.group.screen.dx + \
-                self._get_absolute_size_from_relative(
-                    sum(self.relative_sizes[:cidx - 1])
-                )
+                self._get_absolute_size_from_relative(offset)
             # get width from precalculated witdh list
             width = self._get_absolute_size_from_relative(
                 self.relative_sizes[cidx - 1]
@@ -895,7 +912,8 @@ class MonadWide(MonadTall):
                 xpos -= self.margin
                 width += self.margin
             # place client based on calculated dimensions
-            client.place(
+            return Placement(
+                client,
                 xpos,
                 ypos,
                 width - 2 * self.border_width,
@@ -907,7 +925,8 @@ class MonadWide(MonadTall):
         else:
             # main client
             height = height_main - 2 * self.border_width
-            client.place(
+            return Placement(
+                client,
                 self.group.screen.dx + self.margin,
                 ypos + self.margin,
                 (self.group.screen.dwidth -
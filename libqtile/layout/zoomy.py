@@ -27,7 +27,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from .base import _SimpleLayoutBase
+from .base import Placement, _SimpleLayoutBase
 
 
 class Zoomy(_SimpleLayoutBase):
@@ -49,46 +49,51 @@ class Zoomy(_SimpleLayoutBase):
         self.clients.append_head(client)
 
     def configure(self, client, screen):
+        self._configure_from_plan(client, screen)
+
+    def plan(self, windows, screen):
         left, right = screen.hsplit(screen.width - self.columnwidth)
-        if client is self.clients.current_client:
-            client.place(
-                left.x,
-                left.y,
-                left.width,
-                left.height,
-                0,
-                None,
-                margin=self.margin,
-            )
+        wanted = set(windows)
+        plan = []
+        current = self.clients.current_client
+        focused_index = self.clients.current_index
+        count = len(self.clients)
+        h = right.width * left.height // left.width
+        if h * (count - 1) < right.height:
+            step = h
         else:
-            h = right.width * left.height // left.width
-            client_index = self.clients.index(client)
-            focused_index = self.clients.current_index
-            offset = client_index - focused_index - 1
-            if offset < 0:
-                offset += len(self.clients)
-            if h * (len(self.clients) - 1) < right.height:
-                client.place(
-                    right.x,
-                    right.y + h * offset,
-                    right.width,
-                    h,
-                    0,
-                    None,
-                    margin=self.margin,
-                )
-            else:
-                hh = (right.height - h) // (len(self.clients) - 1)
-                client.place(
-                    right.x,
-                    right.y + hh * offset,
-                    right.width,
-                    h,
+            step = (right.height - h) // (count - 1)
+        for client_index, client in enumerate(self.clients):
+            if client not in wanted:
+                continue
+            wanted.discard(client)
+            if client is current:
+                plan.append(Placement(
+                    client,
+                    left.x,
+                    left.y,
+                    left.width,
+                    left.height,
                     0,
                     None,
                     margin=self.margin,
-                )
-        client.unhide()
+                ))
+                continue
+            offset = client_index - focused_index - 1
+            if offset < 0:
+                offset += count
+            plan.append(Placement(
+                client,
+                right.x,
+                right.y + step * offset,
+                right.width,
+                h,
+                0,
+                None,
+                margin=self.margin,
+            ))
+        plan.extend(Placement(c, visible=False) for c in wanted)
+        return plan
 
     def focus(self, win):
         if (self.clients.current_client and
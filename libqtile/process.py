@@ -0,0 +1,175 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Launching processes from the event loop
+"""
+
+import asyncio
+import collections
+import os
+import subprocess
+import sys
+import time
+
+from typing import Deque, Dict, Optional  # noqa: F401
+
+from .latency import percentile
+from .log_utils import logger
+
+
+class ProcessManager:
+    """Launches processes and reaps them when they exit
+
+    Spawned processes are children of qtile, in a new session, and are reaped
+    without blocking: through a pidfd watched by the event loop where the
+    kernel supports it, otherwise through the asyncio child watcher. The pids
+    of running children are kept across restarts by QtileState.
+    """
+    def __init__(self, loop, size=100):
+        self.loop = loop
+        # pid -> Popen, or None for children adopted after a restart
+        self.children = {}  # type: Dict[int, Optional[subprocess.Popen]]
+        # seconds spent launching each of the last size processes
+        self.latency = collections.deque(maxlen=size)  # type: Deque[float]
+        self.spawned = 0
+        self.running = 0
+        self._pidfds = {}  # type: Dict[int, int]
+        if sys.version_info < (3, 8):
+            # the default watcher must be attached to a loop; qtile's loop is
+            # not the current loop of the thread
+            asyncio.get_child_watcher().attach_loop(loop)
+
+    def spawn(self, args, shell=False, env=None):
+        """Start a process and return its pid, or None if it can't be run
+
+        The process does not inherit qtile's stdin, stdout and stderr. env, if
+        given, replaces the environment of the process.
+        """
+        start = time.monotonic()
+        try:
+            proc = subprocess.Popen(
+                args,
+                shell=shell,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except (OSError, ValueError) as e:
+            logger.error("failed spawn: \"{0}\"\n{1}".format(args, e))
+            return None
+        self.latency.append(time.monotonic() - start)
+        self.spawned += 1
+        self.children[proc.pid] = proc
+        self._watch(proc.pid)
+        return proc.pid
+
+    def adopt(self, pid):
+        """Reap a child which was spawned before qtile restarted"""
+        if pid not in self.children:
+            self.children[pid] = None
+            self._watch(pid)
+
+    async def run(self, args, input=None, shell=False):
+        """Run a process to completion and return (returncode, stdout)
+
+        stdout is decoded. input, if given, is a string written to the stdin
+        of the process. Other processes and events are handled while it runs.
+        """
+        self.running += 1
+        start = time.monotonic()
+        try:
+            if shell:
+                proc = await asyncio.create_subprocess_shell(
+                    args,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            else:
+                proc = await asyncio.create_subprocess_exec(
+                    *args,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                )
+            self.latency.append(time.monotonic() - start)
+            self.spawned += 1
+            stdout, _ = await proc.communicate(
+                None if input is None else input.encode())
+            return proc.returncode, stdout.decode()
+        finally:
+            self.running -= 1
+
+    def _watch(self, pid):
+        try:
+            pidfd = os.pidfd_open(pid)
+        except (AttributeError, OSError):
+            # call_soon, as the watcher may need the loop to be running
+            self.loop.call_soon(self._add_child_handler, pid)
+        else:
+            self._pidfds[pid] = pidfd
+            self.loop.add_reader(pidfd, self._reap, pid)
+
+    def _add_child_handler(self, pid):
+        asyncio.get_child_watcher().add_child_handler(pid, self._exited)
+
+    def _reap(self, pid):
+        proc = self.children.get(pid)
+        if proc is not None:
+            if proc.poll() is None:
+                return
+        else:
+            try:
+                if os.waitpid(pid, os.WNOHANG)[0] == 0:
+                    return
+            except ChildProcessError:
+                pass
+        pidfd = self._pidfds.pop(pid)
+        self.loop.remove_reader(pidfd)
+        os.close(pidfd)
+        self.children.pop(pid, None)
+
+    def _exited(self, pid, returncode):
+        proc = self.children.pop(pid, None)
+        if proc is not None:
+            # the watcher reaped it, so Popen must not wait for it
+            proc.returncode = returncode
+
+    def stats(self):
+        """Live children and launch latencies, in seconds"""
+        ordered = sorted(self.latency)
+        return dict(
+            children=sorted(self.children),
+            running=self.running,
+            spawned=self.spawned,
+            latency=dict(
+                count=len(ordered),
+                p50=percentile(ordered, 0.5),
+                p99=percentile(ordered, 0.99),
+                max=ordered[-1] if ordered else 0.0,
+            ),
+        )
+
+    def finalize(self):
+        for pidfd in self._pidfds.values():
+            self.loop.remove_reader(pidfd)
+            os.close(pidfd)
+        self._pidfds = {}
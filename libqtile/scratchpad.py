@@ -18,6 +18,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import itertools
+import os
+import shlex
+
 from . import group
 from . import hook, window, utils
 
@@ -35,7 +39,8 @@ class WindowVisibilityToggler:
     By default, the window is also hidden if it looses focus.
     """
 
-    def __init__(self, scratchpad_name, window, on_focus_lost_hide, warp_pointer):
+    def __init__(self, scratchpad_name, window, on_focus_lost_hide, warp_pointer,
+                 show=True):
         """
         Initiliaze the  WindowVisibilityToggler.
 
@@ -50,6 +55,9 @@ class WindowVisibilityToggler:
         warp_pointer : bool
             if True the mouse pointer is warped to center of associated window
             if shown. Only used if on_focus_lost_hide is True
+        show : bool
+            if False the window is sent to the scratchpad, hidden, instead of
+            being shown
         """
         self.scratchpad_name = scratchpad_name
         self.window = window
@@ -57,7 +65,10 @@ class WindowVisibilityToggler:
         self.warp_pointer = warp_pointer
         # determine current status based on visibility
         self.shown = False
-        self.show()
+        if show:
+            self.show()
+        else:
+            self.stash()
 
     def info(self):
         return dict(window=self.window.info(),
@@ -115,6 +126,14 @@ class WindowVisibilityToggler:
                 hook.subscribe.client_focus(self.on_focus_change)
                 hook.subscribe.setgroup(self.on_focus_change)
 
+    def stash(self):
+        """
+        Send the associated window, which was never shown, to the scratchpad
+        group, floating as it will be when shown.
+        """
+        self.window._float_state = window.TOP
+        self.window.togroup(self.scratchpad_name)
+
     def hide(self):
         """
         Hide the associated window. That is, send it to the scratchpad group.
@@ -160,7 +179,7 @@ class DropDownToggler(WindowVisibilityToggler):
     each time it is shown at desired location.
     For example this can be used to create a quake-like terminal.
     """
-    def __init__(self, window, scratchpad_name, ddconfig):
+    def __init__(self, window, scratchpad_name, ddconfig, show=True):
         self.name = ddconfig.name
         self.x = ddconfig.x
         self.y = ddconfig.y
@@ -168,7 +187,8 @@ class DropDownToggler(WindowVisibilityToggler):
         self.height = ddconfig.height
         window.set_opacity(ddconfig.opacity)
         WindowVisibilityToggler.__init__(
-            self, scratchpad_name, window, ddconfig.on_focus_lost_hide, ddconfig.warp_pointer
+            self, scratchpad_name, window, ddconfig.on_focus_lost_hide, ddconfig.warp_pointer,
+            show=show
         )
 
     def info(self):
@@ -216,56 +236,136 @@ class ScratchPad(group._Group):
         group._Group.__init__(self, name, label=label)
         self._dropdownconfig = {dd.name: dd for dd in dropdowns}
         self.dropdowns = {}
+        # pid and startup notification id -> name of DropDowns being started
         self._spawned = {}
+        self._startup_ids = {}
+        # window id -> name of DropDowns of the previous qtile, see restore()
+        self._restored = {}
+        # DropDowns toggled while they were starting
+        self._toggled = set()
+        self._watching = False
+        self._startup_counter = itertools.count()
 
     def _check_unsubscribe(self):
         if not self.dropdowns:
             hook.unsubscribe.client_killed(self.on_client_killed)
             hook.unsubscribe.float_change(self.on_float_change)
 
+    def _watch_new_clients(self):
+        waiting = self._spawned or self._startup_ids or self._restored
+        if waiting and not self._watching:
+            hook.subscribe.client_new(self.on_client_new)
+            self._watching = True
+        elif not waiting and self._watching:
+            hook.unsubscribe.client_new(self.on_client_new)
+            self._watching = False
+
+    def _starting(self):
+        """Names of the DropDowns whose window is awaited"""
+        return set(self._spawned.values()) | set(self._startup_ids.values())
+
     def _spawn(self, ddconfig):
         """
         Spawn a process by defined command.
         Method is only called if no window is associated. This is either on the
-        first call to show or if the window was killed.
-        The process id of spawned process is saved and compared to new windows.
-        In case of a match the window gets associated to this DropDown object.
+        first call to show, if the window was killed, or for prespawned
+        DropDowns when qtile starts.
+        The process id of spawned process and the startup notification id it
+        is given are saved and compared to new windows. In case of a match the
+        window gets associated to this DropDown object.
         """
         name = ddconfig.name
-        if name not in self._spawned.values():
-            if not self._spawned:
-                hook.subscribe.client_new(self.on_client_new)
-            cmd = self._dropdownconfig[name].command
-            pid = self.qtile.cmd_spawn(cmd)
-            self._spawned[pid] = name
+        if name in self._starting():
+            return
+        cmd = ddconfig.command
+        args = shlex.split(cmd) if isinstance(cmd, str) else list(cmd)
+        startup_id = "qtile-{}-{}-{}".format(
+            self.name, name, next(self._startup_counter)
+        )
+        env = dict(os.environ, DESKTOP_STARTUP_ID=startup_id)
+        pid = self.qtile.process.spawn(args, env=env)
+        if pid is None:
+            return
+        self._spawned[pid] = name
+        self._startup_ids[startup_id] = name
+        self._watch_new_clients()
+
+    def prespawn(self):
+        """
+        Start the DropDowns configured with prespawn, unless their window
+        already exists, e.g. from before a restart.
+        """
+        # windows of the previous qtile which were not found are gone
+        self._restored = {}
+        self._watch_new_clients()
+        for name, ddconfig in self._dropdownconfig.items():
+            if ddconfig.prespawn and name not in self.dropdowns:
+                self._spawn(ddconfig)
+
+    def restore(self, name, wid):
+        """
+        Associate the window wid to the named DropDown when it is managed, to
+        keep DropDowns across restarts.
+        """
+        if name in self._dropdownconfig:
+            self._restored[wid] = name
+            self._watch_new_clients()
+
+    def _match_new_client(self, client):
+        name = self._restored.pop(client.window.wid, None)
+        if name is not None:
+            return name
+        pid = client.window.get_net_wm_pid()
+        if pid in self._spawned:
+            return self._spawned[pid]
+        if self._startup_ids:
+            startup_id = client.window.get_net_startup_id()
+            if startup_id in self._startup_ids:
+                return self._startup_ids[startup_id]
+        for name in self._starting():
+            match = self._dropdownconfig[name].match
+            if match is not None and match.compare(client):
+                return name
+        return None
 
     def on_client_new(self, client, *args, **kwargs):
         """
         hook method which is called on new windows.
-        This method is subscribed if the given command is spawned
-        and unsubscribed immediately if the associated window is detected.
-        """
-        client_pid = client.window.get_net_wm_pid()
-        if client_pid in self._spawned:
-            name = self._spawned.pop(client_pid)
-            if not self._spawned:
-                hook.unsubscribe.client_new(self.on_client_new)
-            self.dropdowns[name] = DropDownToggler(client, self.name,
-                                                   self._dropdownconfig[name])
-            if len(self.dropdowns) == 1:
-                hook.subscribe.client_killed(self.on_client_killed)
-                hook.subscribe.float_change(self.on_float_change)
+        This method is subscribed while DropDown commands are spawned or
+        windows restored, and unsubscribed when all their windows are detected.
+        """
+        restored = client.window.wid in self._restored
+        name = self._match_new_client(client)
+        if name is None or name in self.dropdowns:
+            return
+        for pending in (self._spawned, self._startup_ids):
+            for key in [k for k, v in pending.items() if v == name]:
+                del pending[key]
+        self._watch_new_clients()
+
+        ddconfig = self._dropdownconfig[name]
+        if restored:
+            # keep the window where it was before the restart
+            show = client.group is not None and client.group is not self
+        else:
+            show = name in self._toggled or not ddconfig.prespawn
+        self._toggled.discard(name)
+        self.dropdowns[name] = DropDownToggler(client, self.name, ddconfig,
+                                               show=show)
+        if len(self.dropdowns) == 1:
+            hook.subscribe.client_killed(self.on_client_killed)
+            hook.subscribe.float_change(self.on_float_change)
 
     def on_client_killed(self, client, *args, **kwargs):
         """
         hook method which is called if a client is killed.
         If the associated window is killed, reset internal state.
         """
-        name = None
         for name, dd in self.dropdowns.items():
             if dd.window is client:
                 dd.unsubscribe()
                 del self.dropdowns[name]
+                self._respawn(name)
                 break
         self._check_unsubscribe()
 
@@ -276,24 +376,30 @@ class ScratchPad(group._Group):
         and process is detached from DRopDown, thus the next call to Show
         will spawn a new process.
         """
-        name = None
         for name, dd in self.dropdowns.items():
             if not dd.window.floating:
                 if dd.window.group is not self:
                     dd.unsubscribe()
                     del self.dropdowns[name]
+                    self._respawn(name)
                     break
         self._check_unsubscribe()
 
+    def _respawn(self, name):
+        ddconfig = self._dropdownconfig[name]
+        if ddconfig.prespawn:
+            self._spawn(ddconfig)
+
     def cmd_dropdown_toggle(self, name):
         """
         Toggle visibility of named DropDown.
         """
         if name in self.dropdowns:
             self.dropdowns[name].toggle()
-        else:
-            if name in self._dropdownconfig:
-                self._spawn(self._dropdownconfig[name])
+        elif name in self._dropdownconfig:
+            # show the window as soon as it appears
+            self._toggled.add(name)
+            self._spawn(self._dropdownconfig[name])
 
     def cmd_dropdown_reconfigure(self, name, **kwargs):
         """
@@ -23,19 +23,37 @@
 # whose defaults depend on a reasonable locale sees something reasonable.
 import locale
 import logging
+import time
+from argparse import Action
 from os import path, getenv
 
-from libqtile.log_utils import init_log, logger
-from libqtile import confreader
-from libqtile.core import xcore
+_start = time.monotonic()
+
+from libqtile.log_utils import init_log, logger  # noqa: E402
+from libqtile import confreader  # noqa: E402
+from libqtile import utils  # noqa: E402
+from libqtile.core import xcore  # noqa: E402
 
 locale.setlocale(locale.LC_ALL, locale.getdefaultlocale())  # type: ignore
 
-try:
-    import pkg_resources
-    VERSION = pkg_resources.require("qtile")[0].version
-except (pkg_resources.DistributionNotFound, ImportError):
-    VERSION = 'dev'
+
+def get_version():
+    # pkg_resources is slow to import, only do it when the version is asked for
+    try:
+        import pkg_resources
+        return pkg_resources.require("qtile")[0].version
+    except ImportError:
+        return 'dev'
+    except pkg_resources.DistributionNotFound:
+        return 'dev'
+
+
+class VersionAction(Action):
+    def __init__(self, option_strings, dest, **kwargs):
+        super().__init__(option_strings, dest, nargs=0, **kwargs)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=get_version() + "\n")
 
 
 def rename_process():
@@ -62,8 +80,8 @@ def make_qtile():
     )
     parser.add_argument(
         '--version',
-        action='version',
-        version=VERSION,
+        action=VersionAction,
+        help="show program's version number and exit",
     )
     parser.add_argument(
         "-c", "--config",
@@ -100,13 +118,22 @@ def make_qtile():
         dest='state',
         help='Pickled QtileState object (typically used only internally)',
     )
+    parser.add_argument(
+        '--profile-startup',
+        action='store_true',
+        default=False,
+        dest='profile_startup',
+        help='Report the time spent in each phase of startup',
+    )
     options = parser.parse_args()
     log_level = getattr(logging, options.log_level)
     init_log(log_level=log_level)
 
+    timings = {"imports": time.monotonic() - _start}
     kore = xcore.XCore()
     try:
-        config = confreader.Config.from_file(kore, options.configfile)
+        with utils.timed(timings, "config"):
+            config = confreader.Config.from_file(kore, options.configfile)
     except Exception as e:
         logger.exception('Error while reading config file (%s)', e)
         config = confreader.Config()
@@ -115,14 +142,33 @@ def make_qtile():
         widgets.insert(0, TextBox('Config Err!'))
     # XXX: the import is here because we need to call init_log
     # before start importing stuff
-    from libqtile.core import manager
-    return manager.Qtile(
-        kore,
-        config,
-        fname=options.socket,
-        no_spawn=options.no_spawn,
-        state=options.state,
-    )
+    with utils.timed(timings, "imports"):
+        from libqtile.core import manager
+    with utils.timed(timings, "X setup"):
+        qtile = manager.Qtile(
+            kore,
+            config,
+            fname=options.socket,
+            no_spawn=options.no_spawn,
+            state=options.state,
+        )
+    # the phases timed by qtile itself are part of its setup
+    for name, seconds in qtile.startup_timings.items():
+        timings["X setup"] -= seconds
+        timings[name] = seconds
+    if options.profile_startup:
+        report_startup(timings)
+    return qtile
+
+
+def report_startup(timings):
+    lines = ["Startup profile:"]
+    for name, seconds in timings.items():
+        lines.append("  %-20s %8.1f ms" % (name, seconds * 1000))
+    lines.append("  %-20s %8.1f ms" % ("total", sum(timings.values()) * 1000))
+    report = "\n".join(lines)
+    print(report)
+    logger.info(report)
 
 
 def main():
@@ -55,6 +55,12 @@ def parse_args():
                         help='Force start tracemalloc on qtile')
     parser.add_argument('-s', '--socket', type=str, dest="socket",
                         help='Use specified communication socket.')
+    parser.add_argument('--hooks', dest="hooks", action="store_true",
+                        default=False,
+                        help='Show time spent in hooks instead of memory')
+    parser.add_argument('--latency', dest="latency", action="store_true",
+                        default=False,
+                        help='Show p50/p99 latencies instead of memory')
 
     opts = parser.parse_args()
     return opts
@@ -149,6 +155,70 @@ def raw_stats(client, group_by='lineno', limit=10, force_start=False):
     print("Total allocated size: {0:.1f} KiB".format(total / 1024.0))
 
 
+def get_hook_lines(client, limit=10):
+    """Format hook statistics, slowest subscribers first"""
+    rows = []
+    for event, info in client.hook_stats().items():
+        for name, (calls, seconds) in info["subscribers"].items():
+            rows.append((seconds, calls, event, name))
+    rows.sort(reverse=True)
+
+    lines = []
+    for index, (seconds, calls, event, name) in enumerate(rows[:limit], 1):
+        lines.append('{:<3} {:<24} {:>8} {:>10.1f} ms  {}'.format(
+            index, event, calls, seconds * 1000, name))
+    total = sum(row[0] for row in rows)
+    lines.append("Total time in hooks: {:.1f} ms".format(total * 1000))
+    return lines
+
+
+def get_hook_stats(scr, client, limit=10, seconds=1.5):
+    while True:
+        scr.addstr(0, 0, "Qtile - Top {} hook subscribers".format(limit))
+        scr.addstr(1, 0, '{:<3} {:<24} {:>8} {:>13}  {}'.format(
+            '#', 'Event', 'Calls', 'Time', 'Subscriber'),
+            curses.A_BOLD | curses.A_REVERSE)
+        for cnt, line in enumerate(get_hook_lines(client, limit), 2):
+            scr.addstr(cnt, 0, line)
+        scr.refresh()
+        time.sleep(seconds)
+        scr.erase()
+
+
+def raw_hook_stats(client, limit=10):
+    print("Qtile - Top {} hook subscribers".format(limit))
+    for line in get_hook_lines(client, limit):
+        print(line)
+
+
+def get_latency_lines(client):
+    lines = []
+    for category, info in sorted(client.latency_stats().items()):
+        lines.append('{:<14} {:>8} {:>10.2f} ms {:>10.2f} ms {:>10.2f} ms'.format(
+            category, info["count"], info["p50"] * 1000, info["p99"] * 1000,
+            info["max"] * 1000))
+    return lines
+
+
+def get_latency_stats(scr, client, seconds=1.5):
+    while True:
+        scr.addstr(0, 0, "Qtile - Latency")
+        scr.addstr(1, 0, '{:<14} {:>8} {:>13} {:>13} {:>13}'.format(
+            'Category', 'Samples', 'p50', 'p99', 'max'),
+            curses.A_BOLD | curses.A_REVERSE)
+        for cnt, line in enumerate(get_latency_lines(client), 2):
+            scr.addstr(cnt, 0, line)
+        scr.refresh()
+        time.sleep(seconds)
+        scr.erase()
+
+
+def raw_latency_stats(client):
+    print("Qtile - Latency")
+    for line in get_latency_lines(client):
+        print(line)
+
+
 def main():
     opts = parse_args()
     lines = opts.lines
@@ -157,7 +227,18 @@ def main():
     client = command.Client(opts.socket)
 
     try:
-        if not opts.raw:
+        if opts.latency:
+            if not opts.raw:
+                curses.wrapper(get_latency_stats, client, seconds=seconds)
+            else:
+                raw_latency_stats(client)
+        elif opts.hooks:
+            if not opts.raw:
+                curses.wrapper(get_hook_stats, client, limit=lines,
+                               seconds=seconds)
+            else:
+                raw_hook_stats(client, limit=lines)
+        elif not opts.raw:
             curses.wrapper(get_stats, client, limit=lines, seconds=seconds,
                            force_start=force_start)
         else:
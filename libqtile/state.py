@@ -32,9 +32,18 @@ class QtileState:
         self.groups = []
         self.screens = {}
         self.current_screen = 0
+        # children spawned by qtile, which the new process must reap
+        self.children = list(qtile.process.children)
+        # scratchpad name -> {dropdown name: window id}
+        self.dropdowns = {}
 
         for group in qtile.groups:
             self.groups.append((group.name, group.layout.name, group.label))
+            dropdowns = getattr(group, "dropdowns", None)
+            if dropdowns:
+                self.dropdowns[group.name] = {
+                    name: dd.window.window.wid for name, dd in dropdowns.items()
+                }
         for index, screen in enumerate(qtile.screens):
             self.screens[index] = screen.group.name
             if screen == qtile.current_screen:
@@ -59,3 +68,14 @@ class QtileState:
                 pass  # group or screen missing
 
         qtile.focus_screen(self.current_screen)
+
+        # states saved by older versions have no dropdowns
+        for group, dropdowns in getattr(self, "dropdowns", {}).items():
+            scratchpad = qtile.groups_map.get(group)
+            if scratchpad is not None and hasattr(scratchpad, "restore"):
+                for name, wid in dropdowns.items():
+                    scratchpad.restore(name, wid)
+
+        # states saved by older versions have no children
+        for pid in getattr(self, "children", ()):
+            qtile.process.adopt(pid)
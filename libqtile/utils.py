@@ -18,8 +18,10 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import contextlib
 import functools
 import os
+import time
 import warnings
 import traceback
 import importlib
@@ -62,6 +64,8 @@ def rgb(x):
             with alpha: ff0000.5
             (255, 0, 0)
             (255, 0, 0, 0.5)
+
+        Strings are parsed once, the tuples are cached.
     """
     if isinstance(x, (tuple, list)):
         if len(x) == 4:
@@ -70,21 +74,26 @@ def rgb(x):
             alpha = 1
         return (x[0] / 255.0, x[1] / 255.0, x[2] / 255.0, alpha)
     elif isinstance(x, str):
-        if x.startswith("#"):
-            x = x[1:]
-        if "." in x:
-            x, alpha = x.split(".")
-            alpha = float("0." + alpha)
-        else:
-            alpha = 1
-        if len(x) != 6:
-            raise ValueError("RGB specifier must be 6 characters long.")
-        vals = [int(i, 16) for i in (x[0:2], x[2:4], x[4:6])]
-        vals.append(alpha)
-        return rgb(vals)
+        return _parse_rgb(x)
     raise ValueError("Invalid RGB specifier.")
 
 
+@functools.lru_cache(maxsize=256)
+def _parse_rgb(x):
+    if x.startswith("#"):
+        x = x[1:]
+    if "." in x:
+        x, alpha = x.split(".")
+        alpha = float("0." + alpha)
+    else:
+        alpha = 1
+    if len(x) != 6:
+        raise ValueError("RGB specifier must be 6 characters long.")
+    vals = [int(i, 16) for i in (x[0:2], x[2:4], x[4:6])]
+    vals.append(alpha)
+    return rgb(vals)
+
+
 def hex(x):
     r, g, b, _ = rgb(x)
     return '#%02x%02x%02x' % (int(r * 255), int(g * 255), int(b * 255))
@@ -193,3 +202,13 @@ def safe_import(module_names, class_name, globals_, fallback=None):
         logger.debug("%s", traceback.format_exc())
         if fallback:
             globals_[class_name] = fallback(module_path, class_name, error)
+
+
+@contextlib.contextmanager
+def timed(timings, name):
+    """Add the time spent in the with block to timings[name], in seconds"""
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0) + time.monotonic() - start
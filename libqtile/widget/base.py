@@ -30,7 +30,7 @@
 # SOFTWARE.
 
 from libqtile.log_utils import logger
-from .. import command, bar, configurable, drawer, confreader
+from .. import command, bar, configurable, drawer, confreader, latency
 import subprocess
 import threading
 import warnings
@@ -117,6 +117,13 @@ class _Widget(command.CommandObject, configurable.Configurable):
             self.length_type = bar.STATIC
             self.length = length
         self.configured = False
+        self.finalized = False
+        # what was on screen after the last draw, see skip_draw()
+        self._drawn = None
+        self.draws_performed = 0
+        self.draws_skipped = 0
+        # Mirror widgets showing this widget in other bars
+        self.mirrors = []  # type: List[Mirror]
 
     @property
     def length(self):
@@ -179,15 +186,40 @@ class _Widget(command.CommandObject, configurable.Configurable):
             self.bar.width,
             self.bar.height
         )
+        self._drawn = None
+        if self.mirrors:
+            self.drawer.on_draw = self.draw_mirrors
         if not self.configured:
             self.configured = True
             self.qtile.call_soon(self.timer_setup)
 
     def finalize(self):
+        self.finalized = True
         if hasattr(self, 'layout') and self.layout:
             self.layout.finalize()
         self.drawer.finalize()
 
+    def create_mirror(self):
+        """
+            Return a widget showing this one in another bar, see Mirror.
+        """
+        return Mirror(self)
+
+    def add_mirror(self, mirror):
+        if mirror not in self.mirrors:
+            self.mirrors.append(mirror)
+        self.drawer.on_draw = self.draw_mirrors
+
+    def remove_mirror(self, mirror):
+        if mirror in self.mirrors:
+            self.mirrors.remove(mirror)
+        if not self.mirrors:
+            self.drawer.on_draw = None
+
+    def draw_mirrors(self):
+        for mirror in self.mirrors:
+            mirror.reflection_drawn()
+
     def clear(self):
         self.drawer.set_source_rgb(self.bar.background)
         self.drawer.fillrect(self.offsetx, self.offsety, self.width,
@@ -231,6 +263,14 @@ class _Widget(command.CommandObject, configurable.Configurable):
         """
         return self.info()
 
+    def cmd_draw_stats(self):
+        """
+            Return the number of draws performed and skipped because nothing
+            visible changed. Only widgets which implement view_model skip
+            draws.
+        """
+        return dict(performed=self.draws_performed, skipped=self.draws_skipped)
+
     def draw(self):
         """
             Method that draws the widget. You may call this explicitly to
@@ -239,6 +279,49 @@ class _Widget(command.CommandObject, configurable.Configurable):
         """
         raise NotImplementedError
 
+    def view_model(self):
+        """
+            Return what the widget displays, as a value which can be compared
+            to a previous one, e.g. a tuple of labels and state flags. Widgets
+            which implement it skip drawing when the view model and their
+            position did not change since the last draw, see skip_draw.
+            Returns None by default, to always draw.
+        """
+        return None
+
+    def view_changed(self):
+        """
+            Whether the view model changed since the last draw. Used by hook
+            handlers to avoid redrawing the bar for events which do not
+            concern the widget.
+        """
+        model = self.view_model()
+        return model is None or self._drawn is None or model != self._drawn[0]
+
+    def skip_draw(self):
+        """
+            Call at the start of draw(): returns True if the widget is already
+            drawn as it would be now, so that the pango/cairo drawing and the
+            copy to the bar window can be skipped.
+        """
+        model = self.view_model()
+        if model is None:
+            return False
+        drawn = (model, self.offsetx, self.offsety, self.length)
+        if drawn == self._drawn:
+            self.draws_skipped += 1
+            return True
+        self._drawn = drawn
+        self.draws_performed += 1
+        return False
+
+    def invalidate(self):
+        """
+            Forget what was drawn, so that the next draw is not skipped, e.g.
+            when the bar window was exposed.
+        """
+        self._drawn = None
+
     def calculate_length(self):
         """
             Must be implemented if the widget can take CALCULATED for length.
@@ -267,12 +350,91 @@ class _Widget(command.CommandObject, configurable.Configurable):
         return output
 
     def _wrapper(self, method, *method_args):
+        # timers of widgets removed by a config reload just run out
+        if self.finalized:
+            return
         try:
             method(*method_args)
         except:  # noqa: E722
             logger.exception('got exception from widget timer')
 
 
+class Mirror(_Widget):
+    """
+        Shows a widget which is in the bar of another screen.
+
+        A bar creates a Mirror when it is given a widget instance which is
+        already in another bar, so that a widget which shows the same thing on
+        every screen, like a clock or a graph, can be put in the bar of each
+        screen and still only poll and draw once. Its mirrors copy the pixels
+        it drew into their own bar, in the X server. Mouse clicks on a mirror
+        are passed on to the widget.
+    """
+    def __init__(self, reflection, **config):
+        if reflection.length_type == bar.STATIC:
+            length = reflection.length
+        else:
+            length = reflection.length_type
+        config.setdefault("name", reflection.name)
+        _Widget.__init__(self, length, **config)
+        self.reflects = reflection
+        self.orientations = reflection.orientations
+        self._drawn_length = None
+
+    @property
+    def length(self):
+        if self.length_type == bar.CALCULATED:
+            return self.reflects.length
+        return self._length
+
+    @length.setter
+    def length(self, value):
+        self._length = value
+
+    def _configure(self, qtile, bar):
+        if bar.horizontal != self.reflects.bar.horizontal:
+            raise confreader.ConfigError(
+                "%s can't be shown in bars of different orientations." %
+                self.reflects.__class__.__name__
+            )
+        _Widget._configure(self, qtile, bar)
+        self.reflects.add_mirror(self)
+
+    def finalize(self):
+        self.reflects.remove_mirror(self)
+        _Widget.finalize(self)
+
+    def reflection_drawn(self):
+        if self.length != self._drawn_length:
+            self.bar.draw()
+        else:
+            self.draw()
+
+    def draw(self):
+        self._drawn_length = self.length
+        reflection = self.reflects
+        width = min(self.width, reflection.width)
+        height = min(self.height, reflection.height)
+        if reflection.finalized or (width, height) != (self.width, self.height):
+            self.drawer.clear(self.background or self.bar.background)
+            self.drawer.draw(offsetx=self.offsetx, offsety=self.offsety,
+                             width=self.width, height=self.height)
+        if not reflection.finalized:
+            reflection.drawer.copy_to(self.win.wid, self.offsetx, self.offsety,
+                                      width, height)
+
+    def info(self):
+        info = _Widget.info(self)
+        info["mirrors"] = self.reflects.name
+        return info
+
+    def button_press(self, x, y, button):
+        self.reflects.button_press(x, y, button)
+
+    def button_release(self, x, y, button):
+        self.reflects.button_release(x, y, button)
+
+
 UNSPECIFIED = bar.Obj("UNSPECIFIED")
 
 
@@ -293,6 +455,9 @@ class _TextBox(_Widget):
         ),
         ("markup", False, "Whether or not to use pango markup"),
     ]  # type: List[Tuple[str, Any, str]]
+    # whether the widget only shows its text, so that draws can be skipped
+    # when the text and its style did not change
+    memoize_draws = False
 
     def __init__(self, text=" ", width=bar.CALCULATED, **config):
         self.layout = None
@@ -370,10 +535,18 @@ class _TextBox(_Widget):
         else:
             return 0
 
+    def view_model(self):
+        if not self.memoize_draws:
+            return None
+        return (self.text, self.foreground, self.background or self.bar.background,
+                self.font, self.fontsize, self.fontshadow, self.markup)
+
     def draw(self):
         # if the bar hasn't placed us yet
         if self.offsetx is None:
             return
+        if self.skip_draw():
+            return
         self.drawer.clear(self.background or self.bar.background)
         self.layout.draw(
             self.actual_padding or 0,
@@ -420,7 +593,8 @@ class InLoopPollText(_TextBox):
         self.add_defaults(InLoopPollText.defaults)
 
     def timer_setup(self):
-        update_interval = self.tick()
+        with latency.tracer.trace(latency.WIDGET_POLLS):
+            update_interval = self.tick()
         # If self.update_interval is defined and .tick() returns None, re-call
         # after self.update_interval
         if update_interval is None and self.update_interval is not None:
@@ -499,6 +673,8 @@ class ThreadPoolText(_TextBox):
 
     def timer_setup(self):
         def on_done(future):
+            if self.finalized:
+                return
             try:
                 result = future.result()
             except Exception:
@@ -519,9 +695,13 @@ class ThreadPoolText(_TextBox):
             else:
                 logger.warning('poll() returned None, not rescheduling')
 
-        future = self.qtile.run_in_executor(self.poll)
+        future = self.qtile.run_in_executor(self._traced_poll)
         future.add_done_callback(on_done)
 
+    def _traced_poll(self):
+        with latency.tracer.trace(latency.WIDGET_POLLS):
+            return self.poll()
+
     def update(self, text):
         old_width = self.layout.width
         if self.text == text:
@@ -433,6 +433,7 @@ class BatteryIcon(base._TextBox):
         if self.theme_path:
             self.length_type = bar.STATIC
             self.length = 0
+            images.icon_index.prefetch(self.theme_path)
         self.surfaces = {}  # type: Dict[str, Img]
         self.current_icon = 'battery-missing'
 
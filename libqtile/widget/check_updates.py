@@ -21,7 +21,7 @@
 import os
 from . import base
 from libqtile.log_utils import logger
-from subprocess import CalledProcessError, Popen
+from subprocess import CalledProcessError
 
 
 class CheckUpdates(base.ThreadedPollText):
@@ -98,4 +98,4 @@ class CheckUpdates(base.ThreadedPollText):
         # type: (int, int, int) -> None
         base.ThreadedPollText.button_press(self, x, y, button)
         if button == 1 and self.execute is not None:
-            Popen(self.execute, shell=True)
+            self.qtile.process.spawn(self.execute, shell=True)
@@ -41,6 +41,7 @@ class CurrentLayout(base._TextBox):
     the bar containing the widget, is on.
     """
     orientations = base.ORIENTATION_HORIZONTAL
+    memoize_draws = True
 
     def __init__(self, width=bar.CALCULATED, **config):
         base._TextBox.__init__(self, "", width, **config)
@@ -54,7 +55,8 @@ class CurrentLayout(base._TextBox):
         def hook_response(layout, group):
             if group.screen is not None and group.screen == self.bar.screen:
                 self.text = layout.name
-                self.bar.draw()
+                if self.view_changed():
+                    self.bar.draw()
         hook.subscribe.layout_change(hook_response)
 
     def button_press(self, x, y, button):
@@ -33,6 +33,7 @@ class CurrentScreen(base._TextBox):
         ('inactive_color', 'ff0000', 'Color when screen is inactive')
     ]
     orientations = base.ORIENTATION_HORIZONTAL
+    memoize_draws = True
 
     def __init__(self, width=bar.CALCULATED, **config):
         base._TextBox.__init__(self, "", width, **config)
@@ -46,7 +47,8 @@ class CurrentScreen(base._TextBox):
     def setup_hooks(self):
         def hook_response():
             self.update_text()
-            self.bar.draw()
+            if self.view_changed():
+                self.bar.draw()
 
         hook.subscribe.current_screen_change(hook_response)
 
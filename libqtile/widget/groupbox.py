@@ -76,6 +76,8 @@ class _GroupBase(base._TextBox, base.PaddingMixin, base.MarginMixin):
         self.setup_hooks()
 
     def setup_hooks(self):
+        # some of these hooks fire before the change is made, so the view
+        # model is only compared when the bar draws
         def hook_response(*args, **kwargs):
             self.bar.draw()
         hook.subscribe.client_managed(hook_response)
@@ -137,7 +139,12 @@ class AGroupBox(_GroupBase):
     def calculate_length(self):
         return self.box_width(self.qtile.groups) + self.margin_x * 2
 
+    def view_model(self):
+        return (self.bar.screen.group.name, self.background or self.bar.background)
+
     def draw(self):
+        if self.skip_draw():
+            return
         self.drawer.clear(self.background or self.bar.background)
         e = next(
             i for i in self.qtile.groups
@@ -308,7 +315,27 @@ class GroupBox(_GroupBase):
     def group_has_urgent(self, group):
         return len([w for w in group.windows if w.urgent]) > 0
 
+    def view_model(self):
+        current_screen = self.qtile.current_screen
+        groups = tuple(
+            (
+                g.label,
+                bool(g.windows),
+                self.group_has_urgent(g),
+                g.screen is self.bar.screen,
+                g.screen is not None and g.screen is current_screen,
+            )
+            for g in self.groups
+        )
+        return (
+            groups,
+            current_screen is self.bar.screen,
+            self.background or self.bar.background,
+        )
+
     def draw(self):
+        if self.skip_draw():
+            return
         self.drawer.clear(self.background or self.bar.background)
 
         offset = self.margin_x
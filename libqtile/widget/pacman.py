@@ -17,8 +17,6 @@
 
 from . import base
 
-import subprocess
-
 
 class Pacman(base.ThreadedPollText):
     """Shows number of available updates
@@ -52,4 +50,4 @@ class Pacman(base.ThreadedPollText):
     def button_press(self, x, y, button):
         base.ThreadedPollText.button_press(self, x, y, button)
         if button == 1 and self.execute is not None:
-            subprocess.Popen([self.execute], shell=True)
+            self.qtile.process.spawn(self.execute, shell=True)
@@ -31,10 +31,15 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import bisect
+import ctypes
+import ctypes.util
+import functools
 import glob
 import os
 import pickle
 import string
+import struct
 from collections import OrderedDict, deque
 
 from libqtile.log_utils import logger
@@ -45,6 +50,276 @@ from .. import bar, command, hook, pangocffi, utils, xkeysyms
 from ..core import xcbq
 
 
+DEFAULTPATH = "/bin:/usr/bin:/usr/local/bin"
+
+
+@functools.lru_cache(maxsize=64)
+def _list_dir(path, mtime):
+    """Sorted (name, is directory) entries of a directory
+
+    Cached by modification time, so a listing is only read again when the
+    directory changed.
+    """
+    entries = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            entries.append((entry.name, is_dir))
+    entries.sort()
+    return entries
+
+
+def list_matches(txt):
+    """Return (display, path, is directory) for the files matching txt
+
+    txt is an existing directory, whose entries are returned, or a directory
+    and the beginning of a file name. Hidden files are only returned if the
+    beginning of the name starts with a dot, like with glob.
+    """
+    path = os.path.expanduser(txt)
+    if os.path.isdir(path):
+        directory, start, prefix = path, "", txt
+    else:
+        directory, start = os.path.split(path)
+        prefix = os.path.dirname(txt)
+    prefix = prefix.rstrip("/") or "/"
+    try:
+        entries = _list_dir(directory or ".", os.stat(directory or ".").st_mtime_ns)
+    except OSError:
+        return []
+    matches = []
+    for name, is_dir in entries:
+        if not name.startswith(start) or \
+                (name.startswith(".") and not start.startswith(".")):
+            continue
+        display = os.path.join(prefix, name)
+        if is_dir:
+            display += "/"
+        matches.append((display, os.path.join(directory, name), is_dir))
+    return matches
+
+
+class _Inotify:
+    """Minimal inotify binding, used to watch directories for changes"""
+    IN_ATTRIB = 0x00000004
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_IGNORED = 0x00008000
+    IN_NONBLOCK = os.O_NONBLOCK
+    IN_CLOEXEC = os.O_CLOEXEC
+
+    DIRECTORY_CHANGES = IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | \
+        IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+
+    _event = struct.Struct("iIII")
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        # raises AttributeError where inotify is not available
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask=DIRECTORY_CHANGES):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_add_watch failed", path)
+        return wd
+
+    def read(self):
+        """Return (watch descriptor, mask) of the pending events"""
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 4096)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = self._event.unpack_from(data, offset)
+                events.append((wd, mask))
+                offset += self._event.size + length
+
+    def close(self):
+        os.close(self.fd)
+
+
+def _scan_executables(dirs, mtimes, force):
+    """Find the executables of dirs, run in the executor
+
+    Directories whose modification time is in mtimes are skipped, unless they
+    are in force. Returns a dict of directory -> (mtime, sorted (name, path)).
+    """
+    result = {}
+    for d in dirs:
+        try:
+            mtime = os.stat(d).st_mtime_ns
+        except OSError:
+            result[d] = (None, [])
+            continue
+        if d not in force and mtimes.get(d) == mtime:
+            continue
+        found = []
+        try:
+            with os.scandir(d) as it:
+                for entry in it:
+                    if os.access(entry.path, os.X_OK):
+                        found.append((entry.name, entry.path))
+        except OSError:
+            pass
+        found.sort()
+        result[d] = (mtime, found)
+    return result
+
+
+class ExecutableIndex:
+    """Sorted index of the executables in $PATH, for prefix lookups
+
+    The index is built in the executor and updated from there. Directories
+    are watched with inotify where available; elsewhere their modification
+    time is checked in the background on every lookup. Lookups return None
+    until the index is built, or while it is rebuilt after $PATH changed.
+    """
+    def __init__(self):
+        self.qtile = None
+        self.path = None
+        # directory -> (mtime, sorted (name, path)) of its executables
+        self.dirs = {}
+        self.entries = []
+        self.ready = False
+        self._inotify = None
+        self._watches = {}
+        self._pending = set()
+        self._rescan = None
+        # number of prompts using the index
+        self._users = 0
+
+    def start(self, qtile):
+        """Build the index in the background, once for all the prompts"""
+        self._users += 1
+        if self.qtile is not None:
+            return
+        self.qtile = qtile
+        try:
+            self._inotify = _Inotify()
+        except (AttributeError, OSError):
+            logger.debug("inotify is not available, polling $PATH for changes")
+        else:
+            qtile._eventloop.add_reader(self._inotify.fd, self._on_inotify)
+        self.refresh()
+
+    def stop(self):
+        """Stop watching $PATH when the last prompt is finalized
+
+        The executables found are kept, so that starting the index again,
+        e.g. after a config reload, only scans the directories which changed.
+        """
+        if not self._users:
+            return
+        self._users -= 1
+        if self._users or self.qtile is None:
+            return
+        if self._inotify is not None:
+            self.qtile._eventloop.remove_reader(self._inotify.fd)
+            self._inotify.close()
+            self._inotify = None
+        if self._rescan is not None:
+            self._rescan.cancel()
+            self._rescan = None
+        self._watches = {}
+        self._pending = set()
+        self.qtile = None
+
+    def _path_dirs(self):
+        dirs = []
+        for d in self.path.split(":"):
+            d = os.path.expanduser(d)
+            if d and d not in dirs:
+                dirs.append(d)
+        return dirs
+
+    def refresh(self, force=()):
+        """Scan the directories of $PATH which changed, in the executor"""
+        path = os.environ.get("PATH", DEFAULTPATH)
+        if path != self.path:
+            self.path = path
+            self.ready = False
+        mtimes = {d: v[0] for d, v in self.dirs.items()}
+        future = self.qtile.run_in_executor(
+            _scan_executables, self._path_dirs(), mtimes, set(force))
+        future.add_done_callback(functools.partial(self._scanned, path))
+
+    def _scanned(self, path, future):
+        if path != self.path:
+            # $PATH changed during the scan, a new one is running
+            return
+        try:
+            result = future.result()
+        except Exception:
+            logger.exception("failed to index $PATH")
+            return
+        if result or not self.ready:
+            dirs = self._path_dirs()
+            self.dirs.update(result)
+            self.entries = sorted(
+                entry for d in dirs if d in self.dirs for entry in self.dirs[d][1]
+            )
+            self.ready = True
+        if self._inotify is not None:
+            watched = set(self._watches.values())
+            for d in result:
+                if d in watched or result[d][0] is None:
+                    continue
+                try:
+                    self._watches[self._inotify.add_watch(d)] = d
+                except OSError:
+                    logger.debug("can't watch %s", d)
+
+    def _on_inotify(self):
+        for wd, mask in self._inotify.read():
+            d = self._watches.get(wd)
+            if d is None:
+                continue
+            self._pending.add(d)
+            if mask & _Inotify.IN_IGNORED:
+                # the directory was removed
+                del self._watches[wd]
+        # coalesce the events of e.g. a package upgrade into one scan
+        if self._pending and self._rescan is None:
+            self._rescan = self.qtile.call_later(0.5, self._rescan_pending)
+
+    def _rescan_pending(self):
+        pending, self._pending = self._pending, set()
+        self._rescan = None
+        self.refresh(force=pending)
+
+    def lookup(self, prefix):
+        """Sorted (name, path) of the executables starting with prefix"""
+        if self.qtile is None:
+            return None
+        if self._inotify is None or os.environ.get("PATH", DEFAULTPATH) != self.path:
+            self.refresh()
+        if not self.ready:
+            return None
+        entries = self.entries
+        i = bisect.bisect_left(entries, (prefix,))
+        found = []
+        while i < len(entries) and entries[i][0].startswith(prefix):
+            found.append(entries[i])
+            i += 1
+        return found
+
+
+executables = ExecutableIndex()
+
+
 class NullCompleter:
     def __init__(self, qtile):
         self.qtile = qtile
@@ -79,20 +354,8 @@ class FileCompleter:
             self.lookup = []
             if txt == "" or txt[0] not in "~/":
                 txt = "~/" + txt
-            path = os.path.expanduser(txt)
-            if os.path.isdir(path):
-                files = glob.glob(os.path.join(path, "*"))
-                prefix = txt
-            else:
-                files = glob.glob(path + "*")
-                prefix = os.path.dirname(txt)
-                prefix = prefix.rstrip("/") or "/"
-            for f in files:
-                display = os.path.join(prefix, os.path.basename(f))
-                if os.path.isdir(f):
-                    display += "/"
+            for display, f, _ in list_matches(txt):
                 self.lookup.append((display, f))
-                self.lookup.sort()
             self.offset = -1
             self.lookup.append((txt, txt))
         self.offset += 1
@@ -236,7 +499,7 @@ class CommandCompleter:
         disables reloading of the lookup table to make testing possible.
     """
 
-    DEFAULTPATH = "/bin:/usr/bin:/usr/local/bin"
+    DEFAULTPATH = DEFAULTPATH
 
     def __init__(self, qtile, _testing=False):
         self.lookup = None
@@ -255,6 +518,19 @@ class CommandCompleter:
         self.lookup = None
         self.offset = -1
 
+    def _search_path(self, txt):
+        found = []
+        dirs = os.environ.get("PATH", self.DEFAULTPATH).split(":")
+        for d in dirs:
+            try:
+                d = os.path.expanduser(d)
+                for cmd in glob.iglob(os.path.join(d, "%s*" % txt)):
+                    if self.executable(cmd):
+                        found.append((os.path.basename(cmd), cmd))
+            except OSError:
+                pass
+        return found
+
     def complete(self, txt):
         """Returns the next completion for txt, or None if there is no completion"""
         if not self.lookup:
@@ -262,35 +538,14 @@ class CommandCompleter:
                 # Lookup is a set of (display value, actual value) tuples.
                 self.lookup = []
                 if txt and txt[0] in "~/":
-                    path = os.path.expanduser(txt)
-                    if os.path.isdir(path):
-                        files = glob.glob(os.path.join(path, "*"))
-                        prefix = txt
-                    else:
-                        files = glob.glob(path + "*")
-                        prefix = os.path.dirname(txt)
-                    prefix = prefix.rstrip("/") or "/"
-                    for f in files:
+                    for display, f, _ in list_matches(txt):
                         if self.executable(f):
-                            display = os.path.join(prefix, os.path.basename(f))
-                            if os.path.isdir(f):
-                                display += "/"
                             self.lookup.append((display, f))
                 else:
-                    dirs = os.environ.get("PATH", self.DEFAULTPATH).split(":")
-                    for d in dirs:
-                        try:
-                            d = os.path.expanduser(d)
-                            for cmd in glob.iglob(os.path.join(d, "%s*" % txt)):
-                                if self.executable(cmd):
-                                    self.lookup.append(
-                                        (
-                                            os.path.basename(cmd),
-                                            cmd
-                                        ),
-                                    )
-                        except OSError:
-                            pass
+                    self.lookup = executables.lookup(txt)
+                    if self.lookup is None:
+                        # the index is not built yet
+                        self.lookup = self._search_path(txt)
             self.lookup.sort()
             self.offset = -1
             self.lookup.append((txt, txt))
@@ -398,6 +653,8 @@ class Prompt(base._TextBox):
     def _configure(self, qtile, bar):
         self.markup = True
         base._TextBox._configure(self, qtile, bar)
+        # so that the first completion of a command does not scan $PATH
+        executables.start(qtile)
 
         def f(win):
             if self.active and not win == self.bar.window:
@@ -405,6 +662,10 @@ class Prompt(base._TextBox):
 
         hook.subscribe.client_focus(f)
 
+    def finalize(self):
+        executables.stop()
+        base._TextBox.finalize(self)
+
     def start_input(self, prompt, callback,
                     complete=None, strict_completer=False):
         """Run the prompt
@@ -45,11 +45,19 @@ class Icon(window._Window):
     def __init__(self, win, qtile, systray):
         window._Window.__init__(self, win, qtile)
         self.systray = systray
+        # where the icon was last placed, and the background pixmap it was
+        # given, so that unchanged icons are not configured again
+        self.geometry = None
+        self.backpixmap = None
+        self.update_hints()
         self.update_size()
 
     def update_size(self):
+        """Compute the size of the icon from its cached size hints
+
+        Returns True if the width, and so the length of the tray, changed.
+        """
         icon_size = self.systray.icon_size
-        self.update_hints()
 
         try:
             width = self.hints["min_width"]
@@ -65,15 +73,20 @@ class Icon(window._Window):
             width = icon_size
             height = icon_size
 
+        changed = width != self.width
         self.width = width
         self.height = height
-        return False
+        return changed
 
     def handle_PropertyNotify(self, e):  # noqa: N802
         name = self.qtile.conn.atoms.get_name(e.atom)
         if name == "_XEMBED_INFO":
             info = self.window.get_property('_XEMBED_INFO', unpack=int)
-            if info and info[1]:
+            if info and info[1] and self.hidden:
+                self.systray.bar.draw()
+        elif name == "WM_NORMAL_HINTS":
+            self.update_hints()
+            if self.update_size():
                 self.systray.bar.draw()
 
         return False
@@ -125,6 +138,13 @@ class Systray(window._Window, base._Widget):
             self.screen = qtile.current_screen.index
         self.bar = bar
         atoms = qtile.conn.atoms
+        atoms.preload([
+            '_NET_SYSTEM_TRAY_S{:d}'.format(self.screen),
+            '_NET_SYSTEM_TRAY_OPCODE',
+            'MANAGER',
+            '_XEMBED',
+            '_XEMBED_EMBEDDED_NOTIFY',
+        ])
 
         qtile.conn.conn.core.SetSelectionOwner(
             win.wid,
@@ -177,19 +197,30 @@ class Systray(window._Window, base._Widget):
 
         return False
 
+    def view_model(self):
+        return (
+            self.background or self.bar.background,
+            tuple(
+                (wid, icon.width, icon.hidden)
+                for wid, icon in self.icons.items()
+            ),
+        )
+
     def draw(self):
+        if self.skip_draw():
+            return
         xoffset = self.padding
         self.drawer.clear(self.background or self.bar.background)
         self.drawer.draw(offsetx=self.offset, width=self.length)
-        for pos, icon in enumerate(self.icons.values()):
-            icon.window.set_attribute(backpixmap=self.drawer.pixmap)
-            icon.place(
-                self.offset + xoffset,
-                self.bar.height // 2 - self.icon_size // 2,
-                icon.width, self.icon_size,
-                0,
-                None
-            )
+        y = self.bar.height // 2 - self.icon_size // 2
+        for icon in self.icons.values():
+            if icon.backpixmap != self.drawer.pixmap:
+                icon.window.set_attribute(backpixmap=self.drawer.pixmap)
+                icon.backpixmap = self.drawer.pixmap
+            geometry = (self.offset + xoffset, y, icon.width, self.icon_size)
+            if geometry != icon.geometry:
+                icon.place(*geometry, 0, None)
+                icon.geometry = geometry
             if icon.hidden:
                 icon.unhide()
                 data = [
@@ -28,6 +28,7 @@ import re
 import cairocffi
 from .. import pangocffi
 from .. import bar, hook
+from ..core import icons
 from . import base
 
 
@@ -150,6 +151,7 @@ class TaskList(base._Widget, base.PaddingMixin, base.MarginMixin):
         self.add_defaults(TaskList.defaults)
         self.add_defaults(base.PaddingMixin.defaults)
         self.add_defaults(base.MarginMixin.defaults)
+        # wid -> (size, surface), dropped with the icon from icons.cache
         self._icons_cache = {}
         self._box_end_positions = []
         self.markup = False
@@ -296,6 +298,18 @@ class TaskList(base._Widget, base.PaddingMixin, base.MarginMixin):
             wrap=False
         )
         self.setup_hooks()
+        icons.cache.callbacks.append(self._icon_dropped)
+
+    def finalize(self):
+        icons.cache.callbacks.remove(self._icon_dropped)
+        base._Widget.finalize(self)
+
+    def _icon_dropped(self, key):
+        # the surface keeps the pixels alive, which the cache no longer counts
+        wid, size = key
+        cached = self._icons_cache.get(wid)
+        if cached is not None and cached[0] == size:
+            del self._icons_cache[wid]
 
     def update(self, window=None):
         if not window or window in self.windows:
@@ -381,19 +395,22 @@ class TaskList(base._Widget, base.PaddingMixin, base.MarginMixin):
         if not window.icons:
             return None
 
-        cache = self._icons_cache.get(window.window.wid)
-        if cache:
-            return cache
+        cached = self._icons_cache.get(window.window.wid)
+        if cached:
+            return cached[1]
 
-        icons = sorted(
-            iter(window.icons.items()),
-            key=lambda x: abs(self.icon_size - int(x[0].split("x")[0]))
+        # only the size which is drawn is decoded
+        size = min(
+            window.icons,
+            key=lambda x: abs(self.icon_size - int(x.split("x")[0]))
         )
-        icon = icons[0]
-        width, height = map(int, icon[0].split("x"))
+        data = window.icons.get(size)
+        if data is None:
+            return None
+        width, height = map(int, size.split("x"))
 
         img = cairocffi.ImageSurface.create_for_data(
-            icon[1],
+            data,
             cairocffi.FORMAT_ARGB32,
             width,
             height
@@ -409,7 +426,9 @@ class TaskList(base._Widget, base.PaddingMixin, base.MarginMixin):
             width /= sp
             scaler.scale(sp, sp)
         surface.set_matrix(scaler)
-        self._icons_cache[window.window.wid] = surface
+        # icons too large for the cache are decoded again on each draw
+        if (window.window.wid, size) in icons.cache:
+            self._icons_cache[window.window.wid] = (size, surface)
         return surface
 
     def draw_icon(self, surface, offset):
@@ -425,7 +444,22 @@ class TaskList(base._Widget, base.PaddingMixin, base.MarginMixin):
         self.drawer.ctx.paint()
         self.drawer.ctx.restore()
 
+    def view_model(self):
+        tasks = tuple(
+            (
+                w.window.wid,
+                self.get_taskname(w),
+                w.urgent,
+                w is w.group.current_window,
+                None if self.icon_size == 0 else self.get_window_icon(w),
+            )
+            for w in self.windows
+        )
+        return (tasks, self.background or self.bar.background)
+
     def draw(self):
+        if self.skip_draw():
+            return
         self.drawer.clear(self.background or self.bar.background)
         offset = self.margin_x
 
@@ -77,6 +77,8 @@ class Volume(base._TextBox):
         if self.theme_path:
             self.length_type = bar.STATIC
             self.length = 0
+            from .. import images
+            images.icon_index.prefetch(self.theme_path)
         self.surfaces = {}
         self.volume = None
 
@@ -100,31 +102,31 @@ class Volume(base._TextBox):
     def button_press(self, x, y, button):
         if button == BUTTON_DOWN:
             if self.volume_down_command is not None:
-                subprocess.call(self.volume_down_command)
+                self.qtile.process.spawn(self.volume_down_command)
             else:
-                subprocess.call(self.create_amixer_command('-q',
-                                                           'sset',
-                                                           self.channel,
-                                                           '%d%%-' % self.step))
+                self.qtile.process.spawn(self.create_amixer_command('-q',
+                                                                    'sset',
+                                                                    self.channel,
+                                                                    '%d%%-' % self.step))
         elif button == BUTTON_UP:
             if self.volume_up_command is not None:
-                subprocess.call(self.volume_up_command)
+                self.qtile.process.spawn(self.volume_up_command)
             else:
-                subprocess.call(self.create_amixer_command('-q',
-                                                           'sset',
-                                                           self.channel,
-                                                           '%d%%+' % self.step))
+                self.qtile.process.spawn(self.create_amixer_command('-q',
+                                                                    'sset',
+                                                                    self.channel,
+                                                                    '%d%%+' % self.step))
         elif button == BUTTON_MUTE:
             if self.mute_command is not None:
-                subprocess.call(self.mute_command)
+                self.qtile.process.spawn(self.mute_command)
             else:
-                subprocess.call(self.create_amixer_command('-q',
-                                                           'sset',
-                                                           self.channel,
-                                                           'toggle'))
+                self.qtile.process.spawn(self.create_amixer_command('-q',
+                                                                    'sset',
+                                                                    self.channel,
+                                                                    'toggle'))
         elif button == BUTTON_RIGHT:
             if self.volume_app is not None:
-                subprocess.Popen(self.volume_app)
+                self.qtile.process.spawn(self.volume_app)
 
         self.draw()
 
@@ -35,6 +35,7 @@ class WindowName(base._TextBox):
         ('show_state', True, 'show window status before window name'),
         ('for_current_screen', False, 'instead of this bars screen use currently active screen')
     ]
+    memoize_draws = True
 
     def __init__(self, width=bar.STRETCH, **config):
         base._TextBox.__init__(self, width=width, **config)
@@ -65,4 +66,5 @@ class WindowName(base._TextBox):
             elif w.floating:
                 state = 'V '
         self.text = "%s%s" % (state, w.name if w and w.name else " ")
-        self.bar.draw()
+        if self.view_changed():
+            self.bar.draw()
@@ -37,6 +37,7 @@ class WindowTabs(base._TextBox):
         ("separator", " | ", "Task separator text."),
         ("selected", ("<", ">"), "Selected task indicator"),
     ]
+    memoize_draws = True
 
     def __init__(self, **config):
         base._TextBox.__init__(self, width=bar.STRETCH, **config)
@@ -70,4 +71,5 @@ class WindowTabs(base._TextBox):
                 task = task.join(self.selected)
             names.append(task)
         self.text = self.separator.join(names)
-        self.bar.draw()
+        if self.view_changed():
+            self.bar.draw()
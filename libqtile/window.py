@@ -17,8 +17,6 @@
 # LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
-import array
-import contextlib
 import inspect
 import traceback
 import warnings
@@ -28,6 +26,7 @@ import xcffib.xproto
 from . import command
 from . import utils
 from . import hook
+from .core import icons
 from .log_utils import logger
 
 
@@ -106,6 +105,21 @@ _NET_WM_STATE_REMOVE = 0
 _NET_WM_STATE_ADD = 1
 _NET_WM_STATE_TOGGLE = 2
 
+# atoms looked up while managing windows, interned together at startup
+ATOMS = (
+    "WM_PROTOCOLS",
+    "WM_DELETE_WINDOW",
+    "WM_TAKE_FOCUS",
+    "WM_WINDOW_ROLE",
+    "WM_CLIENT_MACHINE",
+    "_NET_WM_ICON",
+    "_NET_WM_ICON_NAME",
+    "_NET_WM_VISIBLE_NAME",
+    "_NET_WM_PID",
+    "_NET_WM_WINDOW_OPACITY",
+    "QTILE_INTERNAL",
+)
+
 
 def _geometry_getter(attr):
     def get_attr(self):
@@ -158,7 +172,7 @@ class _Window(command.CommandObject):
         self.window, self.qtile = window, qtile
         self.hidden = True
         self.group = None
-        self.icons = {}
+        self.icons = icons.WindowIcons(window)
         window.set_attribute(eventmask=self._window_mask)
 
         self._float_info = {
@@ -417,9 +431,9 @@ class _Window(command.CommandObject):
         self.qtile.conn.flush()
 
     def hide(self):
+        self.window.unmap()
         # We don't want to get the UnmapNotify for this unmap
-        with self.disable_mask(xcffib.xproto.EventMask.StructureNotify):
-            self.window.unmap()
+        self.qtile.conn.ignored.unmap(self.window.wid)
         self.hidden = True
 
     def unhide(self):
@@ -427,22 +441,6 @@ class _Window(command.CommandObject):
         self.state = NormalState
         self.hidden = False
 
-    @contextlib.contextmanager
-    def disable_mask(self, mask):
-        self._disable_mask(mask)
-        yield
-        self._reset_mask()
-
-    def _disable_mask(self, mask):
-        self.window.set_attribute(
-            eventmask=self._window_mask & (~mask)
-        )
-
-    def _reset_mask(self):
-        self.window.set_attribute(
-            eventmask=self._window_mask
-        )
-
     def place(self, x, y, width, height, borderwidth, bordercolor,
               above=False, force=False, margin=None):
         """Places the window at the specified location with the given size.
@@ -494,6 +492,8 @@ class _Window(command.CommandObject):
             kwarg['stackmode'] = StackMode.Above
 
         self.window.configure(**kwarg)
+        if above:
+            self.qtile.ewmh.raise_client(self.window.wid)
 
         if send_notify:
             self.send_configure_notify(x, y, width, height)
@@ -584,7 +584,7 @@ class _Window(command.CommandObject):
                 state.remove(atom)
                 self.window.set_property('_NET_WM_STATE', state)
 
-        self.qtile.root.set_property("_NET_ACTIVE_WINDOW", self.window.wid)
+        self.qtile.ewmh.set_active_window(self.window.wid)
         hook.fire("client_focus", self)
 
     def _items(self, name):
@@ -778,7 +778,6 @@ class Window(_Window):
 
         # add window to the save-set, so it gets mapped when qtile dies
         qtile.conn.conn.core.ChangeSaveSet(SetMode.Insert, self.window.wid)
-        self.update_wm_net_icon()
 
     @property
     def group(self):
@@ -1126,38 +1125,8 @@ class Window(_Window):
         return False
 
     def update_wm_net_icon(self):
-        """Set a dict with the icons of the window"""
-
-        icon = self.window.get_property('_NET_WM_ICON', 'CARDINAL')
-        if not icon:
-            return
-        icon = list(map(ord, icon.value))
-
-        icons = {}
-        while True:
-            if not icon:
-                break
-            size = icon[:8]
-            if len(size) != 8 or not size[0] or not size[4]:
-                break
-
-            icon = icon[8:]
-
-            width = size[0]
-            height = size[4]
-
-            next_pix = width * height * 4
-            data = icon[:next_pix]
-
-            arr = array.array("B", data)
-            for i in range(0, len(arr), 4):
-                mult = arr[i + 3] / 255.
-                arr[i + 0] = int(arr[i + 0] * mult)
-                arr[i + 1] = int(arr[i + 1] * mult)
-                arr[i + 2] = int(arr[i + 2] * mult)
-            icon = icon[next_pix:]
-            icons["%sx%s" % (width, height)] = arr
-        self.icons = icons
+        """Forget the icons of the window, they are read again when used"""
+        self.icons.invalidate()
         hook.fire("net_wm_icon_change", self)
 
     def handle_ClientMessage(self, event):  # noqa: N802
@@ -1385,6 +1354,7 @@ class Window(_Window):
     def cmd_bring_to_front(self):
         if self.floating:
             self.window.configure(stackmode=StackMode.Above)
+            self.qtile.ewmh.raise_client(self.window.wid)
         else:
             self._reconfigure_floating()  # atomatically above
 
@@ -0,0 +1,263 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Benchmark dynamic groups when many windows appear at once
+
+Drives DGroups against a fake qtile, without an X server. Run from the root of
+the repository:
+
+    python -m test.bench_dgroups --output before.json
+    git checkout my-branch
+    python -m test.bench_dgroups --compare before.json
+
+A burst of windows, like a session being restored, is sent to the rules of a
+config with app rules and spawned groups; then all the windows are killed.
+This measures the time per window, the window properties fetched per window
+and the timers scheduled to delete the emptied groups.
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import libqtile.hook
+from libqtile.config import Group, Match, Rule
+from libqtile.dgroups import DGroups
+
+from .layouts.bench_layouts import describe
+
+
+class FakeWindow:
+    """Counts the properties fetched from the X server"""
+    def __init__(self, wm_class, pid):
+        self.wm_class = wm_class
+        self.pid = pid
+        self.fetches = 0
+
+    def get_wm_class(self):
+        self.fetches += 1
+        return self.wm_class
+
+    def get_net_wm_pid(self):
+        self.fetches += 1
+        return self.pid
+
+    def get_wm_type(self):
+        self.fetches += 1
+        return "normal"
+
+    def get_wm_window_role(self):
+        self.fetches += 1
+        return None
+
+
+class FakeClient:
+    def __init__(self, qtile, name, wm_class, pid):
+        self.qtile = qtile
+        self.name = name
+        self.window = FakeWindow(wm_class, pid)
+        self.group = None
+        self.defunct = False
+        self.floating = False
+
+    def togroup(self, name):
+        if self.group is not None:
+            self.group.windows.remove(self)
+        self.group = self.qtile.groups_map[name]
+        self.group.windows.append(self)
+
+    def enablefloating(self):
+        self.floating = True
+
+
+class FakeGroup:
+    def __init__(self, name):
+        self.name = name
+        self.windows = []
+        self.screen = None
+        self.layout = None
+
+
+class FakeTimer:
+    def __init__(self, func):
+        self.func = func
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeConfig:
+    def __init__(self, groups, rules):
+        self.groups = groups
+        self.dgroups_app_rules = rules
+
+
+class FakeQtile:
+    """The parts of the window manager which DGroups uses"""
+    def __init__(self, groups, rules=(), pids=()):
+        self.config = FakeConfig(groups, list(rules))
+        self.groups = []
+        self.groups_map = {}
+        self.screens = [None]
+        self.no_spawn = False
+        self.timers = []
+        self._pids = list(pids)
+        # number of groups added and deleted
+        self.added = self.deleted = 0
+        libqtile.hook.clear()
+        self.dgroups = DGroups(self, groups, delay=0)
+
+    @property
+    def current_group(self):
+        return self.groups[0]
+
+    def cmd_spawn(self, cmd):
+        return self._pids.pop(0)
+
+    def add_group(self, name, layout=None, layouts=None, label=None):
+        if name in self.groups_map:
+            return False
+        group = FakeGroup(name)
+        self.groups.append(group)
+        self.groups_map[name] = group
+        self.added += 1
+        libqtile.hook.fire("addgroup", self, name)
+        libqtile.hook.fire("changegroup")
+        return True
+
+    def delete_group(self, name):
+        if name not in self.groups_map:
+            return
+        group = self.groups_map.pop(name)
+        self.groups.remove(group)
+        self.deleted += 1
+        libqtile.hook.fire("delgroup", self, name)
+        libqtile.hook.fire("changegroup")
+
+    def call_later(self, delay, func, *args):
+        timer = FakeTimer(lambda: func(*args))
+        self.timers.append(timer)
+        return timer
+
+    def run_timers(self):
+        while self.timers:
+            timer = self.timers.pop(0)
+            if not timer.cancelled:
+                timer.func()
+
+    def new_client(self, name, wm_class=None, pid=None):
+        client = FakeClient(self, name, wm_class, pid)
+        libqtile.hook.fire("client_new", client)
+        return client
+
+    def kill_client(self, client):
+        libqtile.hook.fire("client_killed", client)
+        client.group.windows.remove(client)
+
+
+def make_qtile(rules, spawns):
+    """A config with rules app rules and spawns groups starting a program"""
+    groups = [Group("main", position=0)]
+    groups += [
+        Group("spawn%d" % i, spawn="program%d" % i, persist=False, position=i + 1)
+        for i in range(spawns)
+    ]
+    app_rules = [
+        Rule(Match(wm_class=["app%d" % i]), group="app%d" % i)
+        for i in range(rules)
+    ]
+    return FakeQtile(groups, app_rules, pids=range(1000, 1000 + spawns))
+
+
+def bench(windows, rules, spawns):
+    qtile = make_qtile(rules, spawns)
+    clients = []
+    start = time.perf_counter()
+    for i in range(windows):
+        # windows of the spawned programs and of apps with a rule, mixed
+        if i % 2:
+            client = qtile.new_client("w%d" % i, pid=1000 + i % spawns)
+        else:
+            name = "app%d" % (i % rules)
+            client = qtile.new_client("w%d" % i, wm_class=[name, name], pid=i)
+        clients.append(client)
+    spawn_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for client in clients:
+        qtile.kill_client(client)
+    timers = len(qtile.timers)
+    qtile.run_timers()
+    kill_time = time.perf_counter() - start
+
+    return dict(
+        spawn=spawn_time / windows,
+        fetches=sum(c.window.fetches for c in clients) / windows,
+        kill=kill_time / windows,
+        timers=timers,
+        groups_added=qtile.added,
+        groups_deleted=qtile.deleted,
+    )
+
+
+def report(results, baseline=None):
+    print("{:<10} {:>10} {:>8} {:>10} {:>7} {:>7} {:>7}".format(
+        "windows", "spawn", "fetches", "kill", "timers", "added", "deleted"))
+    for key, r in results.items():
+        line = "{:<10} {:>8.3f}ms {:>8.1f} {:>8.3f}ms {:>7} {:>7} {:>7}".format(
+            key, r["spawn"] * 1000, r["fetches"], r["kill"] * 1000,
+            r["timers"], r["groups_added"], r["groups_deleted"])
+        if baseline and key in baseline:
+            line += "  spawn x{:.2f}".format(r["spawn"] / baseline[key]["spawn"])
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark dynamic groups without X")
+    parser.add_argument("-n", "--windows", type=int, action="append",
+                        help="Windows in the burst (default: 200)")
+    parser.add_argument("--rules", type=int, default=50,
+                        help="Number of app rules")
+    parser.add_argument("--spawns", type=int, default=20,
+                        help="Number of groups spawning a program")
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("-c", "--compare", help="JSON results to compare against")
+    opts = parser.parse_args()
+
+    results = {}
+    for windows in opts.windows or [200]:
+        results[str(windows)] = bench(windows, opts.rules, opts.spawns)
+    libqtile.hook.clear()
+
+    baseline = None
+    if opts.compare:
+        with open(opts.compare) as f:
+            baseline = json.load(f)["results"]
+    report(results, baseline)
+    if opts.output:
+        with open(opts.output, "w") as f:
+            json.dump(dict(describe(), results=results), f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    End-to-end benchmark of the window manager
+
+Runs qtile on an Xvfb display, with the config in test/configs/bench.py, and
+drives it over IPC. Run from the root of the repository (needs Xvfb and
+xvfbwrapper, like the test suite):
+
+    python -m test.bench_wm --output before.json
+    git checkout my-branch
+    python -m test.bench_wm --compare before.json
+
+For every operation this measures the wall time, from sending the command to
+qtile having handled it and flushed its requests, and the X requests and round trips qtile
+made for it, as counted by the ``x_requests`` command. The resident memory of
+qtile is recorded after spawning the windows and at the end.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from xvfbwrapper import Xvfb
+
+import libqtile.command
+import libqtile.ipc
+
+from .conftest import HEIGHT, WIDTH, Qtile, Retry, can_connect_qtile, can_connect_x11
+from .layouts.bench_layouts import describe
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+CONFIG = os.path.join(HERE, "configs", "bench.py")
+QTILE = os.path.join(HERE, "..", "bin", "qtile")
+
+
+def rss(pid):
+    """Resident memory of a process, in bytes, or None if unknown"""
+    try:
+        with open("/proc/%d/status" % pid) as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+class BenchQtile(Qtile):
+    """Runs qtile as a separate program, so that it can restart itself"""
+    def start(self, config_file=CONFIG):
+        self.proc = subprocess.Popen(
+            [sys.executable, QTILE, "-c", config_file, "-s", self.sockfile, "-n"],
+            env=dict(os.environ, DISPLAY=self.display),
+        )
+        if not can_connect_qtile(self.sockfile):
+            raise AssertionError("Error launching Qtile")
+        self.c = libqtile.command.Client(self.sockfile)
+        # the first call starts counting
+        self.c.x_requests()
+
+    def terminate(self):
+        for proc in self.testwindows[:]:
+            proc.terminate()
+            proc.wait()
+            self.testwindows.remove(proc)
+        if self.proc is not None:
+            self.proc.terminate()
+            self.proc.wait()
+            self.proc = None
+
+    def measure(self, func, repeat=1):
+        """Mean wall time, requests and round trips of repeat calls of func"""
+        self.c.x_requests(reset=True)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+            self.c.sync()
+        elapsed = time.perf_counter() - start
+        counts = self.c.x_requests(reset=True)
+        return dict(
+            time=elapsed / repeat,
+            requests=counts["requests"] / repeat,
+            round_trips=counts["round_trips"] / repeat,
+        )
+
+    def restart(self):
+        """Restart qtile and wait until it manages the windows again"""
+        windows = len(self.c.windows())
+        start = time.perf_counter()
+        try:
+            self.c.restart()
+        except libqtile.ipc.IPCError:
+            pass
+
+        @Retry(ignore_exceptions=(libqtile.ipc.IPCError, OSError, ValueError),
+               tmax=30)
+        def restarted():
+            if len(self.c.windows()) < windows:
+                raise ValueError("windows are not managed yet")
+            return True
+
+        restarted()
+        elapsed = time.perf_counter() - start
+        self.c.x_requests()
+        # requests made during startup are not counted
+        return dict(time=elapsed, requests=None, round_trips=None)
+
+
+def run(qtile, windows, repeat):
+    c = qtile.c
+    results = {}
+
+    spawn = dict(time=0.0, requests=0, round_trips=0)
+    c.x_requests(reset=True)
+    start = time.perf_counter()
+    for i in range(windows):
+        qtile.test_window("bench%d" % i)
+    c.sync()
+    counts = c.x_requests(reset=True)
+    spawn["time"] = (time.perf_counter() - start) / windows
+    spawn["requests"] = counts["requests"] / windows
+    spawn["round_trips"] = counts["round_trips"] / windows
+    results["spawn"] = spawn
+    rss_spawned = rss(qtile.proc.pid)
+
+    results["focus"] = qtile.measure(c.group.next_window, repeat * windows)
+
+    def switch_group():
+        c.group["b"].toscreen()
+        c.group["a"].toscreen()
+    results["switch_group"] = qtile.measure(switch_group, repeat)
+
+    results["next_layout"] = qtile.measure(c.next_layout, repeat * 4)
+
+    c.window.toggle_floating()
+    results["drag_floating"] = qtile.measure(
+        lambda: c.window.move_floating(10, 10, 0, 0), repeat * windows)
+    c.window.toggle_floating()
+
+    results["restart"] = qtile.restart()
+    results["rss_spawned"] = rss_spawned
+    results["rss"] = rss(qtile.proc.pid)
+    return results
+
+
+def report(results, baseline=None):
+    print("{:<16} {:>10} {:>10} {:>12}".format(
+        "operation", "time", "requests", "round trips"))
+    for name, r in sorted(results.items()):
+        if not isinstance(r, dict):
+            continue
+        line = "{:<16} {:>8.3f}ms {:>10} {:>12}".format(
+            name, r["time"] * 1000,
+            "-" if r["requests"] is None else "%.1f" % r["requests"],
+            "-" if r["round_trips"] is None else "%.1f" % r["round_trips"])
+        if baseline and name in baseline:
+            line += "  time x{:.2f}".format(r["time"] / baseline[name]["time"])
+        print(line)
+    for name in ("rss_spawned", "rss"):
+        if results[name] is not None:
+            print("{:<16} {:>8.1f}M".format(name, results[name] / 1024 / 1024))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark qtile on an Xvfb display")
+    parser.add_argument("-n", "--windows", type=int, default=20,
+                        help="Number of windows to spawn")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="Repeat count of each operation, the mean is kept")
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("-c", "--compare", help="JSON results to compare against")
+    opts = parser.parse_args()
+
+    with Xvfb(width=WIDTH, height=HEIGHT):
+        display = os.environ["DISPLAY"]
+        if not can_connect_x11(display):
+            raise OSError("Xvfb did not come up")
+        with tempfile.NamedTemporaryFile() as f:
+            qtile = BenchQtile(f.name, display)
+            try:
+                qtile.start()
+                results = run(qtile, opts.windows, opts.repeat)
+            finally:
+                qtile.terminate()
+
+    baseline = None
+    if opts.compare:
+        with open(opts.compare) as f:
+            baseline = json.load(f)["results"]
+    report(results, baseline)
+    if opts.output:
+        with open(opts.output, "w") as f:
+            json.dump(dict(describe(), windows=opts.windows, results=results),
+                      f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
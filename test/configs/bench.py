@@ -0,0 +1,42 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Config for the end-to-end benchmark, see test/bench_wm.py. There is no bar,
+# so that bar draws do not add noise to the measurements.
+
+from libqtile import layout
+from libqtile.command import lazy
+from libqtile.config import Drag, Group, Screen
+
+keys = []
+mouse = [
+    Drag(["mod4"], "Button1", lazy.window.set_position_floating(),
+         start=lazy.window.get_position()),
+]
+groups = [Group(name) for name in "abcd"]
+layouts = [
+    layout.Stack(num_stacks=1),
+    layout.Max(),
+    layout.Tile(),
+    layout.MonadTall(),
+]
+floating_layout = layout.Floating()
+screens = [Screen()]
+follow_mouse_focus = False
@@ -21,6 +21,7 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 import libqtile
+import libqtile.images
 import libqtile.ipc
 from libqtile.core.manager import Qtile as QtileManager
 from libqtile.core import xcore
@@ -52,6 +53,15 @@ max_sleep = 5.0
 sleep_time = 0.1
 
 
+@pytest.fixture(autouse=True)
+def icon_index(monkeypatch, tmpdir_factory):
+    """Keep the icon index of the tests out of the user's cache directory"""
+    path = tmpdir_factory.mktemp("icon_index").join("icon_index.json")
+    index = libqtile.images.IconIndex(str(path))
+    monkeypatch.setattr(libqtile.images, "icon_index", index)
+    return index
+
+
 def pytest_addoption(parser):
     parser.addoption(
         "--debuglog", action="store_true", default=False, help="enable debug output"
@@ -0,0 +1,82 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from libqtile.core.ewmh import EWMHState
+
+
+class FakeRoot:
+    def __init__(self):
+        self.properties = {}
+        self.requests = []
+
+    def set_property(self, name, value, append=False):
+        self.requests.append((name, value, append))
+        if append:
+            self.properties[name] = self.properties.get(name, []) + list(value)
+        else:
+            self.properties[name] = value
+
+
+def test_ewmh_state():
+    root = FakeRoot()
+    scheduled = []
+    ewmh = EWMHState(root, scheduled.append)
+
+    # a batch of changes is written once, by a single scheduled flush
+    for wid in (1, 2, 3):
+        ewmh.add_client(wid)
+    ewmh.set_desktops(["a", "b"], 0)
+    ewmh.set_active_window(3)
+    assert len(scheduled) == 1
+    assert root.requests == []
+    scheduled.pop()()
+    assert root.properties["_NET_CLIENT_LIST"] == [1, 2, 3]
+    assert root.properties["_NET_CLIENT_LIST_STACKING"] == [1, 2, 3]
+    assert root.properties["_NET_DESKTOP_NAMES"] == "a\0b"
+    assert root.properties["_NET_ACTIVE_WINDOW"] == 3
+
+    # new clients are appended
+    root.requests = []
+    ewmh.add_client(4)
+    ewmh.set_desktops(["a", "b"], 1)
+    ewmh.set_active_window(3)
+    scheduled.pop()()
+    assert root.requests == [
+        ("_NET_CLIENT_LIST", [4], True),
+        ("_NET_CLIENT_LIST_STACKING", [4], True),
+        ("_NET_CURRENT_DESKTOP", 1, False),
+    ]
+
+    # stacking keeps the order windows were raised in
+    root.requests = []
+    ewmh.raise_client(2)
+    ewmh.remove_client(3)
+    scheduled.pop()()
+    assert root.properties["_NET_CLIENT_LIST"] == [1, 2, 4]
+    assert root.properties["_NET_CLIENT_LIST_STACKING"] == [1, 4, 2]
+    assert len(root.requests) == 2
+
+    # nothing changed, nothing is written
+    root.requests = []
+    ewmh.raise_client(2)
+    ewmh.set_active_window(3)
+    ewmh.set_clients([1, 2, 4])
+    assert scheduled == []
+    assert root.requests == []
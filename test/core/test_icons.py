@@ -0,0 +1,123 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+
+import array
+
+from libqtile.core.icons import IconCache, WindowIcons
+
+
+class FakeValue:
+    def __init__(self, values):
+        self.values = values
+
+    def to_atoms(self):
+        return tuple(self.values)
+
+    def buf(self):
+        return array.array("I", self.values).tobytes()
+
+
+class FakeReply:
+    def __init__(self, values):
+        self.value = FakeValue(values)
+        self.value_len = len(values)
+
+
+class FakeWindow:
+    """A window with a _NET_WM_ICON of the given sizes"""
+    def __init__(self, wid, *sizes):
+        self.wid = wid
+        self.values = []
+        for width, height in sizes:
+            self.values += [width, height]
+            # opaque red, then half transparent white
+            self.values += [0xffff0000] * (width * height - 1) + [0x80ffffff]
+        self.requests = []
+
+    def get_property(self, prop, type=None, offset=0, length=(2 ** 32) - 1):
+        self.requests.append((offset, length))
+        values = self.values[offset:offset + length]
+        return FakeReply(values) if values else None
+
+
+def test_window_icons():
+    cache = IconCache()
+    window = FakeWindow(1, (16, 16), (32, 32))
+    icons = WindowIcons(window, cache=cache)
+    assert window.requests == []
+
+    assert sorted(icons) == ["16x16", "32x32"]
+    assert len(window.requests) == 1
+    icon = icons["16x16"]
+    # only the pixels of that size are fetched, then premultiplied
+    assert window.requests[-1] == (2, 16 * 16)
+    assert len(icon) == 16 * 16 * 4
+    assert icon[:4].tolist() == [0, 0, 255, 255]
+    assert icon[-4:].tolist() == [128, 128, 128, 128]
+    assert icons["16x16"] is icon
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["bytes"] == len(icon)
+    assert "64x64" not in icons
+
+    icons.invalidate()
+    assert cache.stats()["entries"] == 0
+    window.values = []
+    assert len(icons) == 0
+    assert icons.get("16x16") is None
+
+
+def test_icon_cache_budget():
+    cache = IconCache(budget=3 * 16 * 16 * 4)
+    windows = [WindowIcons(FakeWindow(wid, (16, 16)), cache=cache) for wid in range(4)]
+    for icons in windows:
+        icons["16x16"]
+    stats = cache.stats()
+    assert stats["entries"] == 3
+    assert stats["bytes"] <= stats["budget"]
+    assert stats["evictions"] == 1
+
+    # the least recently used icon was evicted and is decoded again
+    requests = len(windows[0].window.requests)
+    windows[0]["16x16"]
+    assert len(windows[0].window.requests) == requests + 1
+    windows[3]["16x16"]
+    assert cache.stats()["hits"] == 1
+
+    # icons larger than the budget are decoded but not kept
+    large = WindowIcons(FakeWindow(5, (64, 64)), cache=cache)
+    assert len(large["64x64"]) == 64 * 64 * 4
+    assert cache.stats()["entries"] == 3
+
+
+def test_icon_cache_callbacks():
+    cache = IconCache(budget=2 * 16 * 16 * 4)
+    dropped = []
+    cache.callbacks.append(dropped.append)
+    windows = [WindowIcons(FakeWindow(wid, (16, 16)), cache=cache) for wid in range(3)]
+    for icons in windows:
+        icons["16x16"]
+    # users of an evicted icon are told to let go of it
+    assert dropped == [(0, "16x16")]
+    assert (0, "16x16") not in cache
+    assert (2, "16x16") in cache
+
+    windows[2].invalidate()
+    assert dropped == [(0, "16x16"), (2, "16x16")]
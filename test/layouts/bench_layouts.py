@@ -0,0 +1,176 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Benchmark the built-in layouts with the headless harness
+
+Run from the root of the repository:
+
+    python -m test.layouts.bench_layouts --output before.json
+    git checkout my-branch
+    python -m test.layouts.bench_layouts --compare before.json
+
+For every layout and window count this measures the time of a full relayout,
+of adding, focusing and removing a window, the number of place() calls each of
+those operations makes, and the memory allocated to build the layout.
+"""
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from libqtile import layout
+
+from .headless import HeadlessGroup
+
+LAYOUTS = {
+    "Tile": lambda: layout.Tile(),
+    "MonadTall": lambda: layout.MonadTall(),
+    "Columns": lambda: layout.Columns(),
+    "Bsp": lambda: layout.Bsp(),
+    "RatioTile": lambda: layout.RatioTile(),
+    "TreeTab": lambda: layout.TreeTab(),
+    "Matrix": lambda: layout.Matrix(),
+    "Zoomy": lambda: layout.Zoomy(),
+    "Slice": lambda: layout.Slice(wname="slice", fallback=layout.Tile()),
+    "Stack": lambda: layout.Stack(num_stacks=2),
+}
+
+WINDOWS = (10, 100, 1000)
+
+
+def timed(func, repeat):
+    """Best time of repeat runs of func, in seconds"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def placements(group, func):
+    before = group.placements
+    func()
+    return group.placements - before
+
+
+def bench(make_layout, windows, repeat):
+    tracemalloc.start()
+    group = HeadlessGroup(make_layout())
+    clients = [group.add_client() for _ in range(windows)]
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    def add_remove():
+        client = group.add_client("extra")
+        group.remove(client)
+
+    def focus_next():
+        current = group.current_window
+        group.focus(clients[(clients.index(current) + 1) % windows])
+
+    return dict(
+        relayout=timed(group.layout_all, repeat),
+        relayout_placements=placements(group, group.layout_all),
+        add_remove=timed(add_remove, repeat),
+        add_remove_placements=placements(group, add_remove),
+        focus=timed(focus_next, repeat),
+        focus_placements=placements(group, focus_next),
+        memory=memory,
+    )
+
+
+def run(names, counts, repeat):
+    results = {}
+    for name in names:
+        try:
+            make_layout = LAYOUTS[name]
+            make_layout()
+        except (ImportError, OSError) as e:
+            # e.g. TreeTab needs cairo
+            print("skipping %s: %s" % (name, e), file=sys.stderr)
+            continue
+        for count in counts:
+            # deep layouts like Bsp recurse once per window
+            sys.setrecursionlimit(max(sys.getrecursionlimit(), count * 10))
+            results["%s/%d" % (name, count)] = bench(make_layout, count, repeat)
+    return results
+
+
+def describe():
+    try:
+        commit = subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return dict(commit=commit, python=platform.python_version())
+
+
+def report(results, baseline=None):
+    header = "{:<16} {:>10} {:>8} {:>10} {:>8} {:>10} {:>8} {:>10}".format(
+        "layout/windows", "relayout", "places", "add+rm", "places",
+        "focus", "places", "memory")
+    print(header)
+    for key, r in results.items():
+        line = "{:<16} {:>8.3f}ms {:>8} {:>8.3f}ms {:>8} {:>8.3f}ms {:>8} {:>8.1f}K".format(
+            key, r["relayout"] * 1000, r["relayout_placements"],
+            r["add_remove"] * 1000, r["add_remove_placements"],
+            r["focus"] * 1000, r["focus_placements"], r["memory"] / 1024)
+        if baseline and key in baseline:
+            old = baseline[key]
+            line += "  relayout x{:.2f}".format(r["relayout"] / old["relayout"])
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark qtile layouts without X")
+    parser.add_argument("-l", "--layout", action="append", dest="layouts",
+                        choices=sorted(LAYOUTS), help="Layouts to run (default: all)")
+    parser.add_argument("-n", "--windows", type=int, action="append",
+                        help="Window counts (default: 10, 100, 1000)")
+    parser.add_argument("-r", "--repeat", type=int, default=5,
+                        help="Runs of each operation, the best one is kept")
+    parser.add_argument("-o", "--output", help="Write the results as JSON")
+    parser.add_argument("-c", "--compare", help="JSON results to compare against")
+    opts = parser.parse_args()
+
+    results = run(opts.layouts or list(LAYOUTS), opts.windows or WINDOWS,
+                  opts.repeat)
+    baseline = None
+    if opts.compare:
+        with open(opts.compare) as f:
+            baseline = json.load(f)["results"]
+    report(results, baseline)
+    if opts.output:
+        with open(opts.output, "w") as f:
+            json.dump(dict(describe(), results=results), f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+    Headless layout harness
+
+Drives layouts against fake clients, groups and screens, without an X server
+or a running qtile. Placements are recorded on the fake clients instead of
+being sent to X, so layouts can be tested and benchmarked in isolation:
+
+    group = HeadlessGroup(layout.Tile())
+    one = group.add_client("one")
+    two = group.add_client("two")
+    group.cmd("shuffle_down")
+    assert one.geometry == (0, 0, 789, 1022)
+"""
+
+from libqtile.config import ScreenRect
+
+
+class FakeXWindow:
+    """Stands in for the xcbq.Window of a client"""
+    def __init__(self, wm_class=None, role=None):
+        self.wm_class = wm_class
+        self.role = role
+        self.properties = {}
+        self.wid = id(self)
+
+    def get_wm_class(self):
+        return self.wm_class
+
+    def get_wm_window_role(self):
+        return self.role
+
+    def get_wm_type(self):
+        return None
+
+    def get_wm_transient_for(self):
+        return None
+
+    def get_property(self, prop, type=None, unpack=None):
+        return self.properties.get(prop)
+
+    def set_property(self, name, value, type=None, format=None):
+        self.properties[name] = value
+
+
+class FakeClient:
+    """A managed window which records how the layout placed it"""
+    def __init__(self, name, wm_class=None, role=None):
+        self.name = name
+        self.window = FakeXWindow(wm_class, role)
+        self.group = None
+        self.x = self.y = self.width = self.height = 0
+        self.float_x = self.float_y = 0
+        self.borderwidth = 0
+        self.bordercolor = None
+        self.hidden = True
+        self.floating = False
+        self.minimized = False
+        self.maximized = False
+        self.fullscreen = False
+        # number of place() calls on this client
+        self.placements = 0
+
+    def __repr__(self):
+        return "FakeClient(%r)" % self.name
+
+    @property
+    def has_focus(self):
+        return self.group is not None and self.group.current_window is self
+
+    @property
+    def geometry(self):
+        return (self.x, self.y, self.width, self.height)
+
+    def place(self, x, y, width, height, borderwidth, bordercolor,
+              above=False, force=False, margin=None):
+        if margin is not None:
+            x += margin
+            y += margin
+            width -= margin * 2
+            height -= margin * 2
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.borderwidth = borderwidth
+        self.bordercolor = bordercolor
+        self.placements += 1
+        if self.group is not None:
+            self.group.placements += 1
+
+    def hide(self):
+        self.hidden = True
+
+    def unhide(self):
+        self.hidden = False
+
+    def match(self, wname=None, wmclass=None, role=None):
+        if wname and wname == self.name:
+            return True
+        if wmclass and self.window.wm_class and wmclass in self.window.wm_class:
+            return True
+        return bool(role and role == self.window.role)
+
+    def info(self):
+        return dict(
+            name=self.name,
+            x=self.x,
+            y=self.y,
+            width=self.width,
+            height=self.height,
+        )
+
+
+class FakeScreen(ScreenRect):
+    """A screen without bars"""
+    def __init__(self, x=0, y=0, width=1280, height=1024):
+        ScreenRect.__init__(self, x, y, width, height)
+        self.index = 0
+
+    dx = property(lambda self: self.x)
+    dy = property(lambda self: self.y)
+    dwidth = property(lambda self: self.width)
+    dheight = property(lambda self: self.height)
+
+    def get_rect(self):
+        return ScreenRect(self.x, self.y, self.width, self.height)
+
+
+class FakeQtile:
+    def __init__(self, screen):
+        self.current_screen = screen
+        self.windows_map = {}
+        self.colors = {}
+
+    def color_pixel(self, name):
+        return self.colors.setdefault(name, len(self.colors))
+
+
+class HeadlessGroup:
+    """The parts of _Group which layouts use, driving a single layout"""
+    def __init__(self, layout, width=1280, height=1024, name="a"):
+        self.name = name
+        self.screen = FakeScreen(width=width, height=height)
+        self.qtile = FakeQtile(self.screen)
+        self.windows = []
+        self.current_window = None
+        # number of layout passes and of place() calls over all clients
+        self.layouts_done = 0
+        self.placements = 0
+        self.layout = layout.clone(self)
+
+    def add_client(self, name=None, **kwargs):
+        client = FakeClient(name or "client%d" % len(self.windows), **kwargs)
+        self.add(client)
+        return client
+
+    def add(self, client):
+        client.group = self
+        self.windows.append(client)
+        self.layout.add(client)
+        self.focus(client)
+
+    def remove(self, client):
+        self.windows.remove(client)
+        nxt = self.layout.remove(client)
+        client.group = None
+        if self.current_window is client:
+            self.current_window = None
+            self.focus(nxt or self.layout.focus_first())
+        else:
+            self.layout_all()
+
+    def focus(self, win, warp=True, force=False):
+        if win is None or win not in self.windows:
+            return
+        self.current_window = win
+        self.layout.focus(win)
+        self.layout_all(warp)
+
+    def layout_all(self, warp=False):
+        if self.windows:
+            self.layouts_done += 1
+            self.layout.layout(self.windows, self.screen.get_rect())
+
+    def cmd(self, name, *args, **kwargs):
+        """Run a layout command, e.g. group.cmd("next")"""
+        return getattr(self.layout, "cmd_" + name)(*args, **kwargs)
+
+    def visible(self):
+        """Clients which are shown, with their geometry"""
+        return {c.name: c.geometry for c in self.windows if not c.hidden}
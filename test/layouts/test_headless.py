@@ -0,0 +1,155 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from libqtile import layout
+from libqtile.layout.base import _ClientList
+
+from .headless import HeadlessGroup
+
+LAYOUTS = [
+    layout.Tile(),
+    layout.MonadTall(),
+    layout.MonadWide(),
+    layout.Columns(),
+    layout.Bsp(),
+    layout.RatioTile(),
+    layout.Matrix(),
+    layout.Zoomy(),
+    layout.Stack(num_stacks=2),
+    layout.VerticalTile(),
+    layout.Max(),
+    # these two override layout() instead of going through plan()/configure()
+    layout.Slice(name="slice", wname="client0", fallback=layout.Tile()),
+    # its panel is only created when the layout is shown on a screen, which
+    # the harness does not do, see test_treetab.py
+    layout.TreeTab(),
+]
+
+
+def test_tile_headless():
+    group = HeadlessGroup(layout.Tile(), width=800, height=600)
+    one = group.add_client("one")
+    two = group.add_client("two")
+    assert group.visible() == {
+        "one": (494, 0, 304, 598),
+        "two": (0, 0, 492, 598),
+    }
+    group.cmd("shuffle_down")
+    assert two.geometry == (494, 0, 304, 598)
+    assert one.geometry == (0, 0, 492, 598)
+
+
+@pytest.mark.parametrize("lay", LAYOUTS, ids=lambda lay: lay.name)
+def test_relayout_places_each_window_once(lay):
+    group = HeadlessGroup(lay)
+    clients = [group.add_client() for _ in range(6)]
+    before = group.placements
+    group.layout_all()
+    visible = [c for c in clients if not c.hidden]
+    assert visible
+    assert group.placements - before == len(visible)
+
+
+@pytest.mark.parametrize("lay", LAYOUTS, ids=lambda lay: lay.name)
+def test_add_remove_focus(lay):
+    group = HeadlessGroup(lay)
+    clients = [group.add_client() for _ in range(4)]
+    for _ in range(5):
+        group.focus(group.layout.focus_next(group.current_window) or
+                    group.layout.focus_first())
+    group.remove(clients[1])
+    group.remove(group.current_window)
+    assert group.current_window in group.windows
+    assert len(group.windows) == 2
+
+
+def test_bsp_incremental_geometry():
+    group = HeadlessGroup(layout.Bsp())
+    clients = [group.add_client() for _ in range(20)]
+    for command in ("grow_left", "shuffle_up", "flip_right", "toggle_split",
+                    "grow_down", "shuffle_right", "normalize", "next", "left"):
+        group.cmd(command)
+    for client in clients[3:12]:
+        group.remove(client)
+    group.add_client()
+    group.cmd("shuffle_down")
+    placed = group.visible()
+
+    # the same as computing the whole tree again
+    lay = group.layout
+    for node in lay.root:
+        node.dirty = True
+    group.layout_all()
+    assert group.visible() == placed
+    for client in group.windows:
+        assert lay.get_node(client).client is client
+
+    def depth(node):
+        return 0 if node.parent is None else depth(node.parent) + 1
+
+    leaves = [node for node in lay.root if not node.children]
+    assert lay.root.get_shortest() is min(leaves, key=depth)
+
+
+def test_client_list_index():
+    clients = _ClientList()
+    names = ["c%d" % i for i in range(6)]
+    for name in names:
+        clients.add(name, 1)
+    clients.append_head("head")
+    clients.remove("c2")
+    clients.rotate_up()
+    clients.swap("c0", "c5")
+    clients.shuffle_down()
+    clients.remove(clients.clients[-1])
+    clients.append("tail")
+    for i, client in enumerate(clients.clients):
+        assert clients.index(client) == i
+        assert client in clients
+    assert "c2" not in clients
+    with pytest.raises(ValueError):
+        clients.index("c2")
+    clients.current_client = "tail"
+    assert clients.current_index == len(clients) - 1
+
+
+@pytest.mark.parametrize("lay", [layout.Columns(), layout.Stack(num_stacks=3)],
+                         ids=lambda lay: lay.name)
+def test_client_containers(lay):
+    group = HeadlessGroup(lay)
+    clients = [group.add_client() for _ in range(9)]
+    commands = ["shuffle_left", "down", "shuffle_right", "next", "left",
+                "toggle_split"] if lay.name == "columns" else \
+        ["client_to_next", "down", "next", "client_to_previous", "delete"]
+    for command in commands:
+        group.cmd(command)
+    for client in clients[::3]:
+        group.remove(client)
+
+    lay = group.layout
+    containers = lay.columns if lay.name == "columns" else lay.stacks
+    index = lay._client_column if lay.name == "columns" else lay._client_stack
+    assert sorted(index, key=id) == sorted(group.windows, key=id)
+    for client, container in index.items():
+        assert container in containers
+        assert client in container.clients
+    assert group.current_window in group.windows
@@ -0,0 +1,117 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+"""
+The placements of the layouts implementing plan() are compared with those
+their per-client configure() made before plan() was added, recorded in
+test/data/layouts/plan_geometry.json by running the same scenarios.
+"""
+
+import json
+import os
+
+import pytest
+
+from libqtile import layout
+
+from .headless import HeadlessGroup
+
+DATA = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "data", "layouts", "plan_geometry.json",
+)
+
+# layout, and the commands run on it after adding the windows; "focus:N"
+# focuses the Nth window, or the last one if there are fewer
+SCENARIOS = [
+    ("Tile", layout.Tile(), [
+        "increase_ratio", "increase_nmaster", "focus:1", "increase_nmaster",
+        "decrease_ratio", "decrease_nmaster",
+    ]),
+    ("Tile-options", layout.Tile(
+        expand=False, add_after_last=True, shift_windows=True,
+        master_length=2, margin=4, ratio_increment=0.1,
+    ), ["increase_ratio", "focus:1", "decrease_nmaster"]),
+    ("RatioTile", layout.RatioTile(), [
+        "increase_ratio", "increase_ratio", "focus:1", "decrease_ratio",
+    ]),
+    ("RatioTile-fancy", layout.RatioTile(fancy=True, margin=2), [
+        "decrease_ratio", "focus:1",
+    ]),
+    ("Matrix", layout.Matrix(), [
+        "add", "down", "focus:1", "delete", "delete", "right",
+    ]),
+    ("MonadTall", layout.MonadTall(), [
+        "grow_main", "focus:1", "grow", "grow", "shrink", "focus:0",
+        "shrink_main", "flip", "focus:1", "maximize", "normalize",
+        "shuffle_down",
+    ]),
+    ("MonadWide", layout.MonadWide(margin=3), [
+        "grow_main", "focus:1", "grow", "shrink", "flip", "maximize", "reset",
+    ]),
+    ("Zoomy", layout.Zoomy(), ["focus:1", "next", "previous", "focus:0"]),
+]
+COUNTS = (1, 2, 3, 5)
+
+
+@pytest.fixture(scope="module")
+def expected():
+    with open(DATA) as f:
+        return json.load(f)
+
+
+def snapshot(group):
+    """The geometry and border width of each window, or only its name if it
+    is hidden"""
+    return [
+        [c.name] if c.hidden else
+        [c.name, c.x, c.y, c.width, c.height, c.borderwidth]
+        for c in group.windows
+    ]
+
+
+def configured(group):
+    """Like snapshot(), but placing each window with configure()"""
+    rect = group.screen.get_rect()
+    for client in group.windows:
+        group.layout.configure(client, rect)
+    return snapshot(group)
+
+
+@pytest.mark.parametrize("name,lay,commands", SCENARIOS,
+                         ids=[name for name, _, _ in SCENARIOS])
+def test_plan_geometry(expected, name, lay, commands):
+    results = []
+    for n in COUNTS:
+        group = HeadlessGroup(lay)
+        clients = [group.add_client("c%d" % i) for i in range(n)]
+        results.append(snapshot(group))
+        assert configured(group) == results[-1]
+        for cmd in commands:
+            if cmd.startswith("focus:"):
+                group.focus(clients[min(int(cmd[6:]), n - 1)])
+            else:
+                group.cmd(cmd)
+                group.layout_all()
+            results.append(snapshot(group))
+            assert configured(group) == results[-1]
+    assert len(results) == len(expected[name])
+    for step, (got, want) in enumerate(zip(results, expected[name])):
+        assert got == want, "step %d" % step
@@ -0,0 +1,195 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pytest
+
+from libqtile import hook, layout
+from libqtile.layout import tree
+
+from .headless import HeadlessGroup
+
+
+class FakePanel:
+    """Stands in for the window.Internal of the TreeTab panel"""
+    def __init__(self):
+        self.window = type("FakeXWindow", (), {"wid": id(self)})()
+        self.places = []
+
+    def place(self, x, y, width, height, borderwidth, bordercolor):
+        self.places.append((x, y, width, height))
+
+    def hide(self):
+        pass
+
+    def unhide(self):
+        pass
+
+
+class FakeFramed:
+    def __init__(self, layout):
+        self.layout = layout
+        self.height = layout.height
+
+    def draw_fill(self, x, y):
+        self.layout.drawer.rows.append((self.layout.text, y))
+
+
+class FakeTextLayout:
+    height = 20
+
+    def __init__(self, drawer, text):
+        self.drawer = drawer
+        self.text = text
+        self.colour = None
+        self.font_size = None
+        self._width = None
+
+    @property
+    def width(self):
+        return self._width
+
+    @width.setter
+    def width(self, value):
+        self._width = value
+
+    @width.deleter
+    def width(self):
+        self._width = None
+
+    def framed(self, border_width, border_color, pad_x, pad_y):
+        return FakeFramed(self)
+
+    def draw(self, x, y):
+        pass
+
+    def finalize(self):
+        pass
+
+
+class FakeDrawer:
+    """Counts what the TreeTab draws, instead of drawing it"""
+    def __init__(self, qtile, wid, width, height):
+        self.textlayouts = 0
+        self.clears = 0
+        self.draws = 0
+        # the titles of the rows drawn, with their top
+        self.rows = []
+
+    def textlayout(self, text, colour, font, fontsize, fontshadow, wrap=True):
+        self.textlayouts += 1
+        return FakeTextLayout(self, text)
+
+    def clear(self, colour):
+        self.clears += 1
+        self.rows = []
+
+    def draw(self, offsetx=0, width=None):
+        self.draws += 1
+
+    def set_source_rgb(self, colour):
+        pass
+
+    def fillrect(self, x, y, width, height, linewidth):
+        pass
+
+    def draw_hbar(self, color, x1, x2, y, linewidth=1):
+        pass
+
+    def finalize(self):
+        pass
+
+
+@pytest.fixture
+def treetab(monkeypatch):
+    monkeypatch.setattr(
+        tree.window.Internal, "create",
+        classmethod(lambda cls, qtile, x, y, width, height: FakePanel())
+    )
+    monkeypatch.setattr(tree.drawer, "Drawer", FakeDrawer)
+    group = HeadlessGroup(layout.TreeTab(sections=["a"]))
+    group.layout.show(group.screen.get_rect())
+    yield group
+    hook.unsubscribe.client_name_updated(group.layout._handle_name_updated)
+    hook.unsubscribe.focus_change(group.layout._update_panel)
+    group.layout.finalize()
+
+
+def test_treetab_panel_redraws(treetab):
+    group = treetab
+    tab = group.layout
+    panel = tab._panel
+    one = group.add_client("one")
+    two = group.add_client("two")
+    drawer = tab._drawer
+    assert panel.places == [(0, 0, 150, 1024)]
+    assert [title for title, _ in drawer.rows] == ["one", "two"]
+    # one for each row, and the one shared by the section titles
+    assert drawer.textlayouts == 3
+
+    # nothing changed, the panel is neither moved nor redrawn
+    clears, draws = drawer.clears, drawer.draws
+    group.layout_all()
+    group.focus(one)
+    assert len(panel.places) == 1
+    assert drawer.clears == clears
+
+    # focus changes only repaint the rows whose focus changed
+    tab._update_panel()
+    assert drawer.clears == clears
+    assert drawer.draws == draws + 1
+    assert [title for title, _ in drawer.rows[-2:]] == ["one", "two"]
+
+    # a new title repaints its row, reusing its text layout
+    rows = len(drawer.rows)
+    two.name = "deux"
+    tab._handle_name_updated(two)
+    assert drawer.clears == clears
+    assert drawer.rows[rows:] == [("deux", drawer.rows[1][1])]
+    assert drawer.textlayouts == 3
+
+    # a new window, added after the focused one, changes the rows: the panel
+    # is redrawn on the next layout
+    group.add_client("three")
+    assert drawer.clears == clears + 1
+    assert [title for title, _ in drawer.rows] == ["one", "three", "deux"]
+    assert drawer.textlayouts == 4
+    assert len(panel.places) == 1
+
+    # so does removing one, and its text layout is dropped
+    clears = drawer.clears
+    group.remove(one)
+    assert drawer.clears == clears + 1
+    assert [title for title, _ in drawer.rows] == ["three", "deux"]
+    assert len(tab._row_layouts) == 2
+    assert len(panel.places) == 1
+
+    # a new rect moves the panel, the drawer is kept while its size is
+    group.screen.x = 10
+    group.layout_all()
+    assert panel.places[-1] == (10, 0, 150, 1024)
+    assert tab._drawer is drawer
+    assert drawer.clears == clears + 2
+
+    # and replaced when it changes size
+    group.screen.height = 768
+    group.layout_all()
+    assert panel.places[-1] == (10, 0, 150, 768)
+    assert tab._drawer is not drawer
+    assert [title for title, _ in tab._drawer.rows] == ["three", "deux"]
@@ -422,3 +422,36 @@ def test_nospacer(qtile_nospawn):
     assert i["widgets"][0]["offset"] == 0
     assert i["widgets"][1]["offset"] == 10
     libqtile.hook.clear()
+
+
+def test_mirrored_widget(qtile_nospawn):
+    textbox = libqtile.widget.TextBox("shared", name="shared")
+
+    class MirrorConf(GeomConf):
+        screens = []
+        fake_screens = [
+            libqtile.config.Screen(
+                bottom=libqtile.bar.Bar([ExampleWidget(), textbox], 10),
+                x=0, y=0, width=400, height=600,
+            ),
+            libqtile.config.Screen(
+                bottom=libqtile.bar.Bar([textbox], 10),
+                x=400, y=0, width=400, height=600,
+            ),
+        ]
+
+    qtile_nospawn.start(MirrorConf)
+
+    first = qtile_nospawn.c.screen[0].bar["bottom"].info()["widgets"]
+    second = qtile_nospawn.c.screen[1].bar["bottom"].info()["widgets"]
+    assert "mirrors" not in first[1]
+    assert second[0]["mirrors"] == "shared"
+    assert second[0]["length"] == first[1]["length"]
+    assert second[0]["offset"] == 0
+
+    # commands go to the widget itself, and its mirror follows its length
+    qtile_nospawn.c.widget["shared"].update("a longer text")
+    first = qtile_nospawn.c.screen[0].bar["bottom"].info()["widgets"]
+    second = qtile_nospawn.c.screen[1].bar["bottom"].info()["widgets"]
+    assert second[0]["length"] == first[1]["length"]
+    libqtile.hook.clear()
@@ -0,0 +1,89 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import libqtile.hook
+from libqtile.config import Group, Match, Rule
+
+from .bench_dgroups import FakeQtile
+
+
+def teardown_function(function):
+    libqtile.hook.clear()
+
+
+def test_rules_order():
+    rules = [Rule(Match(wm_class=["editor"]), group="code")]
+    qtile = FakeQtile([Group("a"), Group("b", spawn="xterm")], rules, pids=[42])
+    dgroups = qtile.dgroups
+    # rules added in front are compared before the ones of the config
+    dgroups.add_rule(Rule(Match(net_wm_pid=[42]), group="a"), last=False)
+
+    # the pid rule matches first, nothing else is fetched
+    client = qtile.new_client("one", wm_class=["editor", "editor"], pid=42)
+    assert client.group.name == "a"
+    assert client.window.fetches == 1
+
+    client = qtile.new_client("two", wm_class=["editor", "editor"], pid=7)
+    assert client.group.name == "code"
+
+    client = qtile.new_client("three", wm_class=["term", "term"], pid=42)
+    assert client.group.name == "a"
+
+    rule_id = dgroups.add_rule(Rule(Match(net_wm_pid=[43]), group="c"))
+    client = qtile.new_client("four", pid=43)
+    assert client.group.name == "c"
+    dgroups.remove_rule(rule_id)
+    client = qtile.new_client("five", pid=43)
+    assert client.group is None
+
+
+def test_group_position():
+    qtile = FakeQtile([
+        Group("a", position=1),
+        Group("b", position=3),
+        Group("c", position=2),
+        Group("d", position=2, init=False),
+    ])
+    assert [g.name for g in qtile.groups] == ["a", "c", "b"]
+    qtile.add_group("d")
+    assert [g.name for g in qtile.groups] == ["a", "c", "d", "b"]
+    qtile.add_group("e")
+    assert [g.name for g in qtile.groups] == ["a", "c", "d", "b", "e"]
+
+
+def test_delete_groups():
+    rules = [Rule(Match(wm_class=[name]), group=name) for name in ("x", "y")]
+    qtile = FakeQtile([Group("a")], rules)
+    clients = [
+        qtile.new_client("w%d" % i, wm_class=[name, name])
+        for i, name in enumerate("xxyy")
+    ]
+    assert [g.name for g in qtile.groups] == ["a", "x", "y"]
+
+    for client in clients[:3]:
+        qtile.kill_client(client)
+    # a single timer for all groups
+    assert len(qtile.timers) == 1
+    qtile.run_timers()
+    assert [g.name for g in qtile.groups] == ["a", "y"]
+
+    qtile.kill_client(clients[3])
+    qtile.run_timers()
+    assert [g.name for g in qtile.groups] == ["a"]
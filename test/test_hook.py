@@ -140,3 +140,107 @@ def test_can_call_by_selection_notify(qtile):
     libqtile.core.manager.hook.subscribe.selection_notify(test)
     libqtile.core.manager.hook.fire('selection_notify', 'hello')
     assert test.val == 'hello'
+
+
+@pytest.mark.usefixtures('hook_fixture')
+def test_remove_subscribers_owned_by():
+    class Owner:
+        def __init__(self):
+            self.val = 0
+            libqtile.hook.subscribe.group_window_add(self.method)
+
+            def closure(val):
+                self.val = val
+            libqtile.hook.subscribe.client_new(closure)
+
+        def method(self, val):
+            self.val = val
+
+    owner = Owner()
+    other = Call(0)
+    libqtile.hook.subscribe.group_window_add(other)
+    libqtile.hook.remove_subscribers(libqtile.hook.owned_by(owner))
+    assert libqtile.hook.subscriptions["group_window_add"] == [other]
+    assert libqtile.hook.subscriptions["client_new"] == []
+
+
+@pytest.mark.usefixtures('hook_fixture')
+def test_hook_stats():
+    test = Call(0)
+    libqtile.hook.subscribe.group_window_add(test)
+    libqtile.hook.fire("group_window_add", 1)
+    libqtile.hook.fire("group_window_add", 2)
+    stats = libqtile.hook.get_stats()["group_window_add"]
+    assert stats["fires"] == 2
+    assert [calls for calls, _ in stats["subscribers"].values()] == [2]
+
+
+class Loop:
+    """Keeps the calls hooks schedule on the event loop, to run them later"""
+    _eventloop = True
+
+    def __init__(self):
+        self.calls = []
+
+    def call_soon(self, func, *args):
+        self.calls.append((func, args))
+
+    def run(self):
+        calls, self.calls = self.calls, []
+        for func, args in calls:
+            func(*args)
+
+
+@pytest.mark.usefixtures('hook_fixture')
+def test_hook_stats_reset_while_pending():
+    loop = Loop()
+    libqtile.hook.init(loop)
+    calls = []
+    libqtile.hook.subscribe.focus_change(lambda: calls.append(1))
+    libqtile.hook.subscribe.focus_change(lambda: calls.append(2))
+    libqtile.hook.fire("focus_change")
+    libqtile.hook.fire("focus_change")
+    assert calls == []
+
+    # as hook_stats(reset=True) does before the delivery
+    libqtile.hook.stats.clear()
+    loop.run()
+    assert calls == [1, 2]
+    stats = libqtile.hook.get_stats()["focus_change"]
+    assert stats["fires"] == 0
+    assert sum(calls for calls, _ in stats["subscribers"].values()) == 2
+
+
+@pytest.mark.usefixtures('hook_fixture')
+def test_deferred_subscriber():
+    test = Call(0)
+    libqtile.hook.subscribe_deferred.group_window_add(test)
+    assert test in libqtile.hook.deferred
+    libqtile.hook.unsubscribe.group_window_add(test)
+    assert test not in libqtile.hook.deferred
+
+
+@pytest.mark.usefixtures('hook_fixture')
+def test_held_hooks():
+    calls = []
+    libqtile.hook.subscribe.client_focus(lambda win: calls.append(win))
+    libqtile.hook.subscribe.focus_change(lambda: calls.append("focus"))
+    with libqtile.hook.held():
+        libqtile.hook.fire("client_focus", 1)
+        libqtile.hook.fire("focus_change")
+        with libqtile.hook.held():
+            libqtile.hook.fire("client_focus", 2)
+            libqtile.hook.fire("focus_change")
+        assert calls == []
+    # in order, with coalesced events once
+    assert calls == [1, "focus", 2]
+    assert libqtile.hook.get_stats()["focus_change"]["fires"] == 2
+
+    # an error in the block does not keep the hooks held
+    with pytest.raises(ZeroDivisionError):
+        with libqtile.hook.held():
+            libqtile.hook.fire("client_focus", 3)
+            1 / 0
+    assert calls == [1, "focus", 2, 3]
+    libqtile.hook.fire("client_focus", 4)
+    assert calls[-1] == 4
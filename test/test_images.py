@@ -239,6 +239,44 @@ class TestGetMatchingFiles:
             assert len(dfiles[name]) == length
 
 
+def test_icon_index(tmpdir):
+    theme = tmpdir.mkdir('theme')
+    theme.mkdir('24x24').join('audio-volume-muted.png').write('')
+    theme.join('index.theme').write('')
+    cache = str(tmpdir.join('icon_index.json'))
+
+    index = images.IconIndex(cache)
+    index.prefetch(str(theme))
+    by_name, by_stem = index.lookup(str(theme))
+    png = path.join(str(theme), '24x24', 'audio-volume-muted.png')
+    assert by_stem['audio-volume-muted'] == [png]
+    assert by_name['index.theme'] == [path.join(str(theme), 'index.theme')]
+    assert path.exists(cache)
+
+    # a new index reads the listings back and only lists changed directories
+    theme.join('24x24', 'audio-volume-low.svg').write('')
+    by_name, by_stem = images.IconIndex(cache).lookup(str(theme))
+    assert by_stem['audio-volume-muted'] == [png]
+    assert 'audio-volume-low' in by_stem
+
+    # files found by a previous lookup are only used while unchanged
+    theme.join('24x24', 'audio-volume-high.svg').write('')
+    assert 'audio-volume-high' in index.lookup(str(theme))[1]
+
+
+def test_get_matching_files_index(tmpdir, icon_index):
+    theme = tmpdir.mkdir('theme')
+    theme.join('battery.png').write('')
+    index = images.IconIndex(str(tmpdir.join('icon_index.json')))
+    dfiles = images.get_matching_files(str(theme), False, 'battery', index=index)
+    assert dfiles['battery'] == [path.join(str(theme), 'battery.png')]
+    assert tmpdir.join('icon_index.json').check()
+    # the tests never use the index of the user's cache directory
+    assert images.icon_index is icon_index
+    images.get_matching_files(str(theme), False, 'battery')
+    assert path.exists(icon_index.path)
+
+
 class TestLoader:
     @pytest.fixture(scope='function')
     def loader(self):
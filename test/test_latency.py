@@ -0,0 +1,28 @@
+from libqtile import latency
+
+
+def test_percentile():
+    ordered = list(range(101))
+    assert latency.percentile(ordered, 0.5) == 50
+    assert latency.percentile(ordered, 0.99) == 99
+    assert latency.percentile([], 0.5) == 0.0
+
+
+def test_tracer_rolls_over():
+    tracer = latency.LatencyTracer(size=10)
+    for i in range(20):
+        tracer.record(latency.HOOKS, i)
+    stats = tracer.stats()
+    assert stats[latency.HOOKS]["count"] == 10
+    assert stats[latency.HOOKS]["max"] == 19
+    assert stats[latency.HOOKS]["p50"] == 14
+    assert stats[latency.IPC]["count"] == 0
+
+
+def test_tracer_trace():
+    tracer = latency.LatencyTracer()
+    with tracer.trace(latency.BAR_DRAWS):
+        pass
+    assert tracer.stats()[latency.BAR_DRAWS]["count"] == 1
+    tracer.reset()
+    assert tracer.stats()[latency.BAR_DRAWS]["count"] == 0
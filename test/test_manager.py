@@ -1085,3 +1085,114 @@ def test_change_loglevel(qtile):
     qtile.c.critical()
     assert qtile.c.loglevel() == logging.CRITICAL
     assert qtile.c.loglevelname() == 'CRITICAL'
+
+
+@manager_config
+def test_switch_stats(qtile):
+    qtile.test_window("one")
+    qtile.test_window("two")
+    qtile.c.group["b"].toscreen()
+    assert qtile.c.switch_stats()["requests"] is None
+
+    qtile.c.x_requests()
+    qtile.c.group["a"].toscreen()
+    a = qtile.c.switch_stats()
+    qtile.c.group["b"].toscreen()
+    b = qtile.c.switch_stats()
+    assert a["requests"] > 0
+    assert b["requests"] > 0
+    assert qtile.c.group["b"].info()["screen"] == 0
+
+
+@manager_config
+def test_hide_requests(qtile):
+    # core opcodes
+    change_window_attributes = 2
+    unmap_window = 10
+    for name in ("one", "two", "three"):
+        qtile.test_window(name)
+    qtile.c.x_requests()
+
+    qtile.c.group["b"].toscreen()
+    core = qtile.c.x_requests(reset=True)["core"]
+    # the windows are unmapped without changing their event masks
+    assert core.get(unmap_window) == 3
+    assert change_window_attributes not in core
+    # and our own unmaps did not unmanage them
+    assert len(qtile.c.windows()) == 3
+
+    qtile.c.group["a"].toscreen()
+    core = qtile.c.x_requests(reset=True)["core"]
+    # at most the borders are changed
+    assert core.get(change_window_attributes, 0) <= 3
+    assert len(qtile.c.windows()) == 3
+
+
+@manager_config
+def test_icon_stats(qtile):
+    qtile.test_window("one")
+    # no widget shows icons, so none were decoded
+    stats = qtile.c.icon_stats()
+    assert stats["entries"] == 0
+    assert stats["bytes"] == 0
+
+
+colors_config = """
+from libqtile import layout
+from libqtile.config import Group
+
+groups = [Group("a"), Group("b")]
+layouts = [layout.Stack(border_focus="red", border_normal="blue")]
+screens = []
+"""
+
+
+@manager_config
+def test_reload_config_colors(qtile, tmpdir):
+    # core opcodes
+    alloc_named_color = 85
+    free_colors = 88
+    path = tmpdir.join("colors_config.py")
+    path.write(colors_config)
+    qtile.c.reload_config(str(path))
+
+    qtile.c.x_requests()
+    qtile.c.reload_config(str(path))
+    core = qtile.c.x_requests(reset=True)["core"]
+    # the colours of the old config are freed, then allocated again
+    assert core.get(free_colors) == 1
+    assert core.get(alloc_named_color) == 2
+
+
+reload_config = """
+from libqtile import layout
+from libqtile.command import lazy
+from libqtile.config import Group, Key
+
+keys = [
+    Key(["control"], "k", lazy.layout.down()),
+{keys}]
+groups = [Group(name) for name in "{groups}"]
+layouts = [{layouts}]
+floating_layout = layout.Floating()
+screens = []
+"""
+
+
+@manager_config
+def test_reload_config(qtile, tmpdir):
+    path = tmpdir.join("reload_config.py")
+    path.write(reload_config.format(keys="", groups="abcd", layouts="layout.Stack(num_stacks=1)"))
+    assert "keys" in qtile.c.reload_config(str(path))
+    # reading the same config again, lazy calls included, changes nothing
+    assert qtile.c.reload_config(str(path)) == []
+    assert qtile.c.reload_config() == []
+
+    path.write(reload_config.format(
+        keys='    Key(["control"], "j", lazy.layout.up()),\n',
+        groups="abcde",
+        layouts="layout.Max()",
+    ))
+    assert sorted(qtile.c.reload_config()) == ["groups", "keys", "layouts"]
+    assert "e" in qtile.c.groups()
+    assert qtile.c.layout.info()["name"] == "max"
@@ -0,0 +1,87 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+
+from libqtile.extension.dmenu import Dmenu
+from libqtile.process import ProcessManager
+
+
+def test_spawn_reaps_children():
+    loop = asyncio.new_event_loop()
+    manager = ProcessManager(loop)
+    try:
+        pid = manager.spawn(["true"])
+        assert pid in manager.children
+
+        async def wait():
+            while manager.children:
+                await asyncio.sleep(0.01)
+
+        loop.run_until_complete(asyncio.wait_for(wait(), 5))
+        assert manager.stats()["spawned"] == 1
+        assert manager.spawn(["/nonexistent/command"]) is None
+    finally:
+        manager.finalize()
+        loop.close()
+
+
+def test_run_output():
+    loop = asyncio.new_event_loop()
+    manager = ProcessManager(loop)
+    try:
+        result = loop.run_until_complete(manager.run(["cat"], input="one\ntwo"))
+        assert result == (0, "one\ntwo")
+        result = loop.run_until_complete(manager.run("exit 3", shell=True))
+        assert result == (3, "")
+        assert manager.running == 0
+    finally:
+        manager.finalize()
+        loop.close()
+
+
+def test_dmenu_run():
+    class FakeQtile:
+        pass
+
+    loop = asyncio.new_event_loop()
+    qtile = FakeQtile()
+    qtile.process = ProcessManager(loop)
+    try:
+        # true ignores the dmenu options
+        dmenu = Dmenu(dmenu_command="true")
+        dmenu._configure(qtile)
+        pid = loop.run_until_complete(dmenu.run())
+        assert pid in qtile.process.children
+
+        async def wait():
+            while qtile.process.children:
+                await asyncio.sleep(0.01)
+
+        # launched processes are reaped, not left as zombies
+        loop.run_until_complete(asyncio.wait_for(wait(), 5))
+
+        dmenu.configured_command = ["head", "-n", "1"]
+        out = loop.run_until_complete(dmenu.run(["one", "two"]))
+        assert out == "one\n"
+        assert qtile.process.running == 0
+    finally:
+        qtile.process.finalize()
+        loop.close()
@@ -230,3 +230,31 @@ def test_floating_toggle(qtile):
     qtile.c.group["SCRATCHPAD"].dropdown_toggle('dd-a')
     is_spawned(qtile, 'dd-a')
     assert sorted(qtile.c.group["a"].info()['windows']) == ['dd-a', 'dd-a', 'one']
+
+
+@scratchpad_config
+def test_prespawn(qtile):
+    qtile.c.group["SCRATCHPAD"].dropdown_reconfigure(
+        'dd-a', command='xterm -T dd-a -display %s sh' % qtile.display, prespawn=True)
+    assert qtile.c.group["SCRATCHPAD"].dropdown_info('dd-a')['prespawn'] is True
+
+    qtile.test_window("one")
+    assert_focused(qtile, 'one')
+
+    # started without toggling and kept hidden in the scratchpad
+    qtile.c.group["SCRATCHPAD"].eval('self.prespawn()')
+    is_spawned(qtile, 'dd-a')
+    assert_focused(qtile, 'one')
+    assert qtile.c.group["SCRATCHPAD"].info()['windows'] == ['dd-a']
+
+    # toggling shows the existing window right away
+    qtile.c.group["SCRATCHPAD"].dropdown_toggle('dd-a')
+    assert_focused(qtile, 'dd-a')
+    assert sorted(qtile.c.group["a"].info()['windows']) == ['dd-a', 'one']
+
+    # a killed prespawned DropDown is started again in the background
+    qtile.c.window.kill()
+    is_killed(qtile, 'dd-a')
+    is_spawned(qtile, 'dd-a')
+    assert_focused(qtile, 'one')
+    assert qtile.c.group["SCRATCHPAD"].info()['windows'] == ['dd-a']
@@ -0,0 +1,126 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import subprocess
+import sys
+import tempfile
+
+import pytest
+
+import libqtile.layout
+import libqtile.widget
+import libqtile.widget.base
+
+from .conftest import can_connect_qtile
+
+HERE = os.path.dirname(os.path.realpath(__file__))
+QTILE = os.path.join(HERE, "..", "bin", "qtile")
+CONFIG = os.path.join(HERE, "configs", "bench.py")
+
+lazy = pytest.mark.skipif(
+    sys.version_info < (3, 7),
+    reason="module __getattr__ needs Python 3.7, everything is imported up front"
+)
+
+LAZY_IMPORTS = """
+import sys
+import libqtile.layout
+import libqtile.widget
+modules = ["libqtile.widget.textbox", "libqtile.layout.max"]
+assert not any(m in sys.modules for m in modules), "imported up front"
+assert libqtile.widget.TextBox.__module__ == "libqtile.widget.textbox"
+assert libqtile.layout.Max.__module__ == "libqtile.layout.max"
+assert all(m in sys.modules for m in modules), "not imported on access"
+assert "libqtile.widget.clock" not in sys.modules, "imported other widgets"
+"""
+
+
+@lazy
+def test_lazy_imports():
+    # in a new interpreter, as the tests import widgets and layouts
+    subprocess.check_call(
+        [sys.executable, "-c", LAZY_IMPORTS],
+        cwd=os.path.join(HERE, ".."),
+    )
+
+
+@lazy
+def test_widget_import_error(monkeypatch):
+    monkeypatch.setitem(libqtile.widget.widgets, "Broken", "no_such_module")
+    try:
+        broken = libqtile.widget.Broken
+    finally:
+        vars(libqtile.widget).pop("Broken", None)
+    assert broken.__name__ == "ImportErrorWidget"
+    assert broken().text == "Import Error: Broken"
+
+
+def test_star_import():
+    namespace = {}
+    exec("from libqtile.widget import *", namespace)
+    assert set(libqtile.widget.widgets) <= set(namespace)
+    assert set(libqtile.widget.widgets) <= set(dir(libqtile.widget))
+
+    namespace = {}
+    exec("from libqtile.layout import *", namespace)
+    assert set(libqtile.layout.layouts) <= set(namespace)
+    assert set(libqtile.layout.layouts) <= set(dir(libqtile.layout))
+
+
+def test_submodules():
+    assert libqtile.widget.base._Widget
+    assert libqtile.widget.base is sys.modules["libqtile.widget.base"]
+    assert libqtile.layout.base.Layout
+    with pytest.raises(AttributeError):
+        libqtile.widget.NoSuchWidget
+    with pytest.raises(AttributeError):
+        libqtile.layout.NoSuchLayout
+
+
+def test_profile_startup(xephyr):
+    with tempfile.NamedTemporaryFile() as f:
+        sockfile = f.name
+    proc = subprocess.Popen(
+        [sys.executable, "-u", QTILE, "-c", CONFIG, "-s", sockfile, "-n",
+         "--profile-startup"],
+        env=dict(os.environ, DISPLAY=xephyr.display),
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    try:
+        # the profile is printed before qtile starts serving commands
+        assert can_connect_qtile(sockfile)
+    finally:
+        proc.terminate()
+        out, _ = proc.communicate()
+
+    lines = out[out.index("Startup profile:"):].splitlines()[1:]
+    phases = {}
+    for line in lines:
+        name, ms, unit = line.rsplit(None, 2)
+        assert unit == "ms"
+        phases[name.strip()] = float(ms)
+        if name.strip() == "total":
+            break
+    assert set(phases) == {
+        "imports", "config", "X setup", "screens and bars", "scan", "total",
+    }
+    assert all(ms >= 0 for ms in phases.values())
@@ -20,6 +20,8 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import pytest
+
 import libqtile.utils as utils
 
 
@@ -47,6 +49,12 @@ def test_rgb_from_base10_tuple_with_alpha():
     assert utils.rgb([255, 255, 0, 0.5]) == (1, 1, 0, 0.5)
 
 
+def test_rgb_is_parsed_once():
+    assert utils.rgb("#123456") is utils.rgb("#123456")
+    with pytest.raises(ValueError):
+        utils.rgb("#12345")
+
+
 def test_scrub_to_utf8():
     assert utils.scrub_to_utf8(b"foo") == "foo"
 
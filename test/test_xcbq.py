@@ -1,6 +1,7 @@
 import pytest
 from xvfbwrapper import Xvfb
 import xcffib
+import xcffib.xproto
 from libqtile.core import xcbq
 
 
@@ -53,6 +54,72 @@ def test_net_wm_states(xdisplay):
         assert val is False
 
 
+def test_atom_preload(xdisplay):
+    conn = xcbq.Connection(xdisplay)
+    for name in xcbq.SUPPORTED_ATOMS:
+        assert name in conn.atoms.atoms
+
+    conn.atoms.preload(["_QTILE_TEST_A", "_QTILE_TEST_B", "_QTILE_TEST_A"])
+    atom = conn.atoms.atoms["_QTILE_TEST_A"]
+    assert conn.atoms.get_name(atom) == "_QTILE_TEST_A"
+    reply = conn.conn.core.InternAtom(True, len("_QTILE_TEST_B"), "_QTILE_TEST_B").reply()
+    assert conn.atoms["_QTILE_TEST_B"] == reply.atom
+
+
+def test_request_counter(xdisplay):
+    conn = xcbq.Connection(xdisplay)
+    counter = conn.count_requests()
+    assert conn.count_requests() is counter
+
+    conn.conn.core.NoOperation()
+    conn.xsync()
+    # NoOperation and GetInputFocus
+    assert counter.stats() == dict(requests=2, round_trips=1, core={127: 1, 43: 1})
+
+    counter.reset()
+    assert counter.stats() == dict(requests=0, round_trips=0, core={})
+
+
+def test_ignored_events(xdisplay):
+    conn = xcbq.Connection(xdisplay)
+    win = conn.create_window(1, 1, 640, 480)
+    win.map()
+    conn.xsync()
+    while conn.conn.poll_for_event():
+        pass
+
+    win.unmap()
+    conn.ignored.unmap(win.wid)
+    win.map()
+    win.unmap()
+    conn.xsync()
+    unmaps = []
+    while True:
+        e = conn.conn.poll_for_event()
+        if not e:
+            break
+        if isinstance(e, xcffib.xproto.UnmapNotifyEvent):
+            unmaps.append(e)
+    assert [conn.ignored.match(e) for e in unmaps] == [True, False]
+    assert conn.ignored.dropped == 1
+
+
+def test_colormap(xdisplay):
+    conn = xcbq.Connection(xdisplay)
+    colormap = conn.default_screen.default_colormap
+    # resolving a colour locally gives the pixel the server would allocate
+    for color in ("#ff0000", "00ff00", "#123456"):
+        assert colormap.pixel(color) == colormap.alloc_color(color).pixel
+    counter = conn.count_requests()
+    colormap.pixel("#ff0000")
+    colormap.pixel("white")
+    colormap.pixel("white")
+    assert counter.requests == 1
+    assert colormap.allocated
+    colormap.free()
+    assert not colormap.pixels and not colormap.allocated
+
+
 def test_masks():
     cfgmasks = xcbq.ConfigureMasks
     d = {'x': 1, 'y': 2, 'width': 640, 'height': 480}
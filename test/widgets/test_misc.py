@@ -24,7 +24,7 @@
 import pytest
 from libqtile.config import Screen
 from libqtile.bar import Bar
-from libqtile.widget import TextBox, ThermalSensor
+from libqtile.widget import CurrentLayout, GroupBox, TextBox, ThermalSensor
 from ..conftest import BareConfig
 
 
@@ -56,6 +56,24 @@ def test_textbox_color_change(qtile):
     assert qtile.c.widget["colorchanger"].info()["foreground"] == "ff0000"
 
 
+class DrawStatsConf(BareConfig):
+    screens = [Screen(bottom=Bar([GroupBox(), CurrentLayout()], 20))]
+
+
+@pytest.mark.parametrize("qtile", [DrawStatsConf], indirect=True)
+def test_unchanged_widgets_skip_draws(qtile):
+    before = qtile.c.widget["groupbox"].draw_stats()
+    assert before["performed"] > 0
+
+    # only the current layout widget changes
+    qtile.c.next_layout()
+    layout = qtile.c.widget["currentlayout"].draw_stats()
+    after = qtile.c.widget["groupbox"].draw_stats()
+    assert layout["performed"] >= 2
+    assert after["performed"] == before["performed"]
+    assert after["skipped"] > before["skipped"]
+
+
 def test_thermalsensor_regex_compatibility():
     sensors = ThermalSensor()
     test_sensors_output = """
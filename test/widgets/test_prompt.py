@@ -0,0 +1,113 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import os
+
+import libqtile.widget.prompt
+
+
+class IndexQtile:
+    """The parts of qtile ExecutableIndex uses, telling when it scans $PATH"""
+    def __init__(self, loop):
+        self._eventloop = loop
+        self._scan = loop.create_future()
+
+    def run_in_executor(self, func, *args):
+        future = self._eventloop.run_in_executor(None, func, *args)
+        if not self._scan.done():
+            self._scan.set_result(future)
+        return future
+
+    def call_later(self, delay, func, *args):
+        return self._eventloop.call_later(delay, func, *args)
+
+    def wait_for_scan(self):
+        """Wait until the next scan of $PATH is started, then done"""
+        loop = self._eventloop
+        scan = loop.run_until_complete(asyncio.wait_for(self._scan, 5))
+        self._scan = loop.create_future()
+        loop.run_until_complete(asyncio.wait_for(scan, 5))
+        # let the index take the result
+        loop.run_until_complete(asyncio.sleep(0))
+
+
+def test_executable_index(tmpdir, monkeypatch):
+    def make(name, mode=0o755):
+        path = tmpdir.join(name)
+        path.write("")
+        path.chmod(mode)
+
+    make("foo")
+    make("foobar")
+    make("fnot", 0o644)
+    monkeypatch.setenv("PATH", str(tmpdir))
+
+    loop = asyncio.new_event_loop()
+    qtile = IndexQtile(loop)
+    index = libqtile.widget.prompt.ExecutableIndex()
+    try:
+        index.start(qtile)
+        # not built yet
+        assert index.lookup("f") is None
+        qtile.wait_for_scan()
+        assert [n for n, _ in index.lookup("f")] == ["foo", "foobar"]
+        assert index.lookup("foob") == [("foobar", os.path.join(str(tmpdir), "foobar"))]
+        assert index.lookup("x") == []
+
+        make("fab")
+        # rescanned on the inotify event, or on a lookup without inotify
+        index.lookup("f")
+        qtile.wait_for_scan()
+        assert [n for n, _ in index.lookup("f")] == ["fab", "foo", "foobar"]
+    finally:
+        index.stop()
+        loop.close()
+
+
+def test_executable_index_stop(tmpdir, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmpdir))
+    loop = asyncio.new_event_loop()
+    qtile = IndexQtile(loop)
+    index = libqtile.widget.prompt.ExecutableIndex()
+    try:
+        # shared by two prompts
+        index.start(qtile)
+        index.start(qtile)
+        qtile.wait_for_scan()
+        inotify = index._inotify
+
+        index.stop()
+        assert index.qtile is qtile
+        index.stop()
+        # the last prompt released the inotify fd and its reader
+        assert index.qtile is None
+        assert index.lookup("f") is None
+        if inotify is not None:
+            assert index._inotify is None
+            assert not loop.remove_reader(inotify.fd)
+
+        # started again, e.g. after a config reload
+        index.start(qtile)
+        qtile.wait_for_scan()
+        assert index.lookup("f") == []
+    finally:
+        index.stop()
+        loop.close()
@@ -0,0 +1,223 @@
+# Copyright (c) 2019 Qtile contributors
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in
+# all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import libqtile.widget.systray
+
+
+class FakeAtoms(dict):
+    def __missing__(self, name):
+        self[name] = len(self) + 1
+        return self[name]
+
+    def get_name(self, atom):
+        return {v: k for k, v in self.items()}[atom]
+
+
+class FakeConn:
+    def __init__(self):
+        self.atoms = FakeAtoms()
+
+
+class FakeQtile:
+    def __init__(self):
+        self.conn = FakeConn()
+        self.windows_map = {}
+
+
+class FakeGeometry:
+    x = y = 0
+    width = height = 1
+
+
+class FakeIconWindow:
+    """Stands in for the xcbq.Window of a tray icon, recording requests"""
+    def __init__(self, wid, min_width=0, min_height=0):
+        self.wid = wid
+        self.normal_hints = dict(
+            flags=set(),
+            min_width=min_width,
+            min_height=min_height,
+            base_width=0,
+            base_height=0,
+            width_inc=0,
+            height_inc=0,
+        )
+        self.xembed_info = [0, 1]
+        self.hints_read = 0
+        self.configures = []
+        self.backpixmaps = []
+        self.maps = 0
+
+    def get_wm_hints(self):
+        return None
+
+    def get_wm_normal_hints(self):
+        self.hints_read += 1
+        return dict(self.normal_hints)
+
+    def get_geometry(self):
+        return FakeGeometry()
+
+    def get_property(self, prop, type=None, unpack=None):
+        assert prop == "_XEMBED_INFO"
+        return self.xembed_info
+
+    def set_property(self, name, value, type=None, format=None):
+        pass
+
+    def set_attribute(self, **kwargs):
+        if "backpixmap" in kwargs:
+            self.backpixmaps.append(kwargs["backpixmap"])
+
+    def configure(self, **kwargs):
+        self.configures.append(
+            (kwargs["x"], kwargs["y"], kwargs["width"], kwargs["height"])
+        )
+
+    def map(self):
+        self.maps += 1
+
+    def send_event(self, event, mask=0):
+        pass
+
+
+class FakeDrawer:
+    def __init__(self):
+        self.pixmap = 100
+
+    def clear(self, colour):
+        pass
+
+    def draw(self, offsetx=0, width=None):
+        pass
+
+
+class FakeBar:
+    horizontal = True
+    size = height = 24
+    background = "000000"
+
+    def __init__(self):
+        self.window = FakeIconWindow(1)
+        self.window.window = self.window
+        self.draws = 0
+
+    def draw(self):
+        self.draws += 1
+
+
+class FakePropertyNotify:
+    def __init__(self, atom):
+        self.atom = atom
+
+
+def make_systray():
+    systray = libqtile.widget.systray.Systray()
+    systray.qtile = FakeQtile()
+    systray.bar = FakeBar()
+    systray.drawer = FakeDrawer()
+    systray.window = FakeIconWindow(2)
+    systray.offsetx = 50
+    systray.offsety = 0
+    return systray
+
+
+def add_icon(systray, wid, **kwargs):
+    icon = libqtile.widget.systray.Icon(
+        FakeIconWindow(wid, **kwargs), systray.qtile, systray
+    )
+    systray.icons[wid] = icon
+    return icon
+
+
+def test_systray_icon_geometry():
+    systray = make_systray()
+    one = add_icon(systray, 10)
+    two = add_icon(systray, 11, min_width=40, min_height=40)
+    assert (one.width, two.width) == (20, 20)
+
+    systray.draw()
+    assert one.window.configures == [(55, 2, 20, 20)]
+    assert two.window.configures == [(80, 2, 20, 20)]
+    assert one.window.backpixmaps == two.window.backpixmaps == [100]
+    assert one.window.maps == two.window.maps == 1
+
+    # the tray is drawn again, e.g. after the widgets before it were redrawn,
+    # unchanged icons are not configured again
+    systray.invalidate()
+    systray.draw()
+    assert len(one.window.configures) == 1
+    assert len(two.window.configures) == 1
+    assert len(one.window.backpixmaps) == 1
+    assert one.window.maps == 1
+
+    # a new drawer pixmap is given to each icon once
+    systray.drawer.pixmap = 101
+    systray.invalidate()
+    systray.draw()
+    assert one.window.backpixmaps == two.window.backpixmaps == [100, 101]
+    assert len(one.window.configures) == 1
+
+    # only the icons which moved are placed again
+    systray.offsetx = 60
+    systray.draw()
+    assert one.window.configures[-1] == (65, 2, 20, 20)
+    assert two.window.configures[-1] == (90, 2, 20, 20)
+    assert len(one.window.configures) == 2
+    del systray.icons[10]
+    systray.draw()
+    assert len(one.window.configures) == 2
+    assert two.window.configures[-1] == (65, 2, 20, 20)
+
+
+def test_systray_icon_hints():
+    systray = make_systray()
+    icon = add_icon(systray, 10, min_width=20, min_height=20)
+    systray.draw()
+    hints_read = icon.window.hints_read
+
+    # drawing the tray does not read the hints from X
+    systray.invalidate()
+    systray.draw()
+    assert icon.window.hints_read == hints_read
+
+    # new hints which do not change the width do not redraw the bar
+    atoms = systray.qtile.conn.atoms
+    icon.window.normal_hints["min_height"] = 10
+    icon.window.normal_hints["min_width"] = 20
+    icon.handle_PropertyNotify(FakePropertyNotify(atoms["WM_NORMAL_HINTS"]))
+    assert icon.window.hints_read == hints_read + 1
+    assert icon.width == 20
+    assert systray.bar.draws == 0
+
+    # a wider icon makes the tray longer
+    icon.window.normal_hints["min_width"] = 30
+    icon.handle_PropertyNotify(FakePropertyNotify(atoms["WM_NORMAL_HINTS"]))
+    assert icon.width == 30
+    assert systray.bar.draws == 1
+    systray.draw()
+    assert icon.window.configures[-1] == (55, 2, 30, 20)
+
+    # _XEMBED_INFO only matters for icons which are not mapped yet
+    icon.handle_PropertyNotify(FakePropertyNotify(atoms["_XEMBED_INFO"]))
+    assert systray.bar.draws == 1
+    icon.hidden = True
+    icon.handle_PropertyNotify(FakePropertyNotify(atoms["_XEMBED_INFO"]))
+    assert systray.bar.draws == 2